@@ -0,0 +1,360 @@
+import asyncio
+import logging
+import struct
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence
+from .config import settings
+from .metrics import record_cache
+
+try:
+    import redis
+    import redis.asyncio as aioredis
+except ImportError:  # redis is optional; caches stay process-local without it
+    redis = aioredis = None
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "football:cache:invalidate"
+CODEC_VERSION = 1
+
+
+def _generation_key(namespace: str) -> str:
+    return f"football:{namespace}:generation"
+
+
+def _note_key(namespace: str) -> str:
+    return f"football:{namespace}:note"
+
+
+class RecordCodec:
+    """Packs dicts of numeric fields as one little-endian float array.
+    
+    Field names live in the codec rather than the payload, so a cached
+    team features record is 1 + 11 * 4 bytes instead of a few hundred
+    bytes of JSON. The leading byte is a format version; payloads with
+    another version decode as misses.
+    """
+    
+    def __init__(self, fields: Sequence[str], fmt: str = 'd', int_fields: Sequence[str] = ()):
+        self.fields = list(fields)
+        self.int_fields = set(int_fields)
+        self.struct = struct.Struct(f"<B{len(self.fields)}{fmt}")
+    
+    def encode(self, record: Dict) -> bytes:
+        return self.struct.pack(CODEC_VERSION, *(float(record.get(k, 0)) for k in self.fields))
+    
+    def decode(self, data: bytes) -> Optional[Dict]:
+        if len(data) != self.struct.size or data[0] != CODEC_VERSION:
+            return None
+        values = self.struct.unpack(data)[1:]
+        return {
+            k: int(v) if k in self.int_fields else v
+            for k, v in zip(self.fields, values)
+        }
+
+
+class TwoLevelCache:
+    """In-process LRU (L1) in front of Redis (L2) shared by every replica.
+    
+    Keys are namespaced by a generation number kept in Redis: ``invalidate``
+    bumps it and announces the new value on a pub/sub channel, so every
+    replica drops its L1 and stops reading the old generation's L2 entries,
+    which then expire on their TTL. A replica that loses its subscription
+    resubscribes and catches up from the generation key. Redis errors are
+    treated as misses, so an unreachable Redis only costs the L2 hit rate.
+    Without a client this is a plain bounded in-process cache.
+    """
+    
+    def __init__(
+        self,
+        namespace: str,
+        codec: RecordCodec,
+        client=None,
+        max_local: int = 10000,
+        ttl_seconds: Optional[int] = None,
+        on_invalidate: Optional[Callable[[str], None]] = None
+    ):
+        self.namespace = namespace
+        self.codec = codec
+        self.client = client
+        self.max_local = max_local
+        self.ttl_seconds = ttl_seconds
+        self.on_invalidate = on_invalidate
+        self.local: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self.generation = 0
+        self._listener: Optional[asyncio.Task] = None
+    
+    def _remote_key(self, key: Hashable) -> str:
+        return f"football:{self.namespace}:{self.generation}:{key}"
+    
+    def get_local(self, key: Hashable) -> Optional[Dict]:
+        value = self.local.get(key)
+        if value is not None:
+            self.local.move_to_end(key)
+        return value
+    
+    def set_local(self, key: Hashable, value: Dict):
+        self.local[key] = value
+        self.local.move_to_end(key)
+        while len(self.local) > self.max_local:
+            self.local.popitem(last=False)
+    
+    def clear_local(self):
+        self.local.clear()
+    
+    async def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Dict]:
+        """Values found in L1, then in one MGET round trip to L2, by key"""
+        found = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self.get_local(key)
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+        record_cache(f'{self.namespace}_l1', hit=True, count=len(found))
+        record_cache(f'{self.namespace}_l1', hit=False, count=len(missing))
+        
+        if missing and self.client is not None:
+            try:
+                payloads = await self.client.mget([self._remote_key(k) for k in missing])
+            except Exception:
+                payloads = [None] * len(missing)
+            hits = 0
+            for key, payload in zip(missing, payloads):
+                value = self.codec.decode(payload) if payload is not None else None
+                if value is not None:
+                    self.set_local(key, value)
+                    found[key] = value
+                    hits += 1
+            record_cache(f'{self.namespace}_l2', hit=True, count=hits)
+            record_cache(f'{self.namespace}_l2', hit=False, count=len(missing) - hits)
+        
+        return found
+    
+    async def get(self, key: Hashable) -> Optional[Dict]:
+        return (await self.get_many([key])).get(key)
+    
+    async def set_many(self, items: Dict[Hashable, Dict]):
+        """Store in L1 and write through to L2 in a single pipeline"""
+        for key, value in items.items():
+            self.set_local(key, value)
+        if not items or self.client is None:
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(self._remote_key(key), self.codec.encode(value), ex=self.ttl_seconds)
+            await pipe.execute()
+        except Exception:
+            pass
+    
+    async def set(self, key: Hashable, value: Dict):
+        await self.set_many({key: value})
+    
+    async def invalidate(self, note: str = ""):
+        """Drop every entry on every replica, e.g. after a model swap.
+        
+        ``note`` is passed to the other replicas' ``on_invalidate``.
+        """
+        self.clear_local()
+        if self.client is None:
+            self.generation += 1
+            return
+        try:
+            self.generation = int(await self.client.incr(_generation_key(self.namespace)))
+            await self.client.set(_note_key(self.namespace), note)
+            await self.client.publish(
+                INVALIDATION_CHANNEL, f"{self.namespace}:{self.generation}:{note}"
+            )
+        except Exception:
+            self.generation += 1
+    
+    def _apply_invalidation(self, message: str, notify: bool = True):
+        namespace, generation, note = message.split(":", 2)
+        if namespace != self.namespace or int(generation) == self.generation:
+            return
+        self.generation = int(generation)
+        self.clear_local()
+        if notify and self.on_invalidate is not None:
+            self.on_invalidate(note)
+    
+    async def start(self):
+        """Pick up the shared generation and follow invalidations from other replicas"""
+        if self.client is None or self._listener is not None:
+            return
+        # Nothing to catch up on yet: the process has only just loaded
+        pubsub = await self._subscribe(notify=False)
+        self._listener = asyncio.create_task(self._listen(pubsub))
+    
+    async def _subscribe(self, notify: bool = True):
+        """Subscribe, then apply the latest generation in case invalidations
+        were missed while unsubscribed. None if Redis can't be reached."""
+        try:
+            pubsub = self.client.pubsub()
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            generation, note = await self.client.mget(
+                [_generation_key(self.namespace), _note_key(self.namespace)]
+            )
+        except Exception:
+            return None
+        note = note.decode() if isinstance(note, bytes) else note or ""
+        self._apply_invalidation(f"{self.namespace}:{int(generation or 0)}:{note}", notify)
+        return pubsub
+    
+    async def _listen(self, pubsub):
+        delay = settings.redis_reconnect_seconds
+        while True:
+            if pubsub is not None:
+                delay = settings.redis_reconnect_seconds
+                try:
+                    async for message in pubsub.listen():
+                        if message['type'] != 'message':
+                            continue
+                        data = message['data']
+                        self._apply_invalidation(data.decode() if isinstance(data, bytes) else data)
+                except Exception as e:
+                    logger.warning("Lost cache invalidation subscription: %s", e)
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.redis_reconnect_max_seconds)
+            pubsub = await self._subscribe()
+    
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+
+class InMemoryRedis:
+    """The subset of the redis.asyncio client the caches use, in memory.
+    
+    Stands in for Redis in tests; several caches sharing one instance
+    behave like replicas sharing one server, pub/sub included. TTLs are
+    accepted but not enforced.
+    """
+    
+    def __init__(self):
+        self.data: Dict[str, bytes] = {}
+        self.subscribers: List[asyncio.Queue] = []
+        self.round_trips = 0
+    
+    @staticmethod
+    def _encode(value) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode()
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        self.round_trips += 1
+        return self.data.get(key)
+    
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        self.round_trips += 1
+        return [self.data.get(k) for k in keys]
+    
+    async def set(self, key: str, value, ex: Optional[int] = None):
+        self.round_trips += 1
+        self.data[key] = self._encode(value)
+        return True
+    
+    async def incr(self, key: str) -> int:
+        self.round_trips += 1
+        value = int(self.data.get(key, b"0")) + 1
+        self.data[key] = self._encode(value)
+        return value
+    
+    async def publish(self, channel: str, message) -> int:
+        self.round_trips += 1
+        for queue in self.subscribers:
+            queue.put_nowait((channel, self._encode(message)))
+        return len(self.subscribers)
+    
+    def pipeline(self, transaction: bool = True) -> "_InMemoryPipeline":
+        return _InMemoryPipeline(self)
+    
+    def pubsub(self) -> "_InMemoryPubSub":
+        return _InMemoryPubSub(self)
+
+
+class _InMemoryPipeline:
+    def __init__(self, client: InMemoryRedis):
+        self.client = client
+        self.commands = []
+    
+    def set(self, key: str, value, ex: Optional[int] = None):
+        self.commands.append((key, value))
+        return self
+    
+    async def execute(self) -> List[bool]:
+        self.client.round_trips += 1
+        for key, value in self.commands:
+            self.client.data[key] = self.client._encode(value)
+        return [True] * len(self.commands)
+
+
+class _InMemoryPubSub:
+    def __init__(self, client: InMemoryRedis):
+        self.client = client
+        self.channels = set()
+        self.queue: asyncio.Queue = asyncio.Queue()
+    
+    async def subscribe(self, *channels: str):
+        self.channels.update(channels)
+        self.client.subscribers.append(self.queue)
+    
+    async def reset(self):
+        self.channels.clear()
+        if self.queue in self.client.subscribers:
+            self.client.subscribers.remove(self.queue)
+    
+    async def listen(self):
+        while True:
+            channel, data = await self.queue.get()
+            if channel in self.channels:
+                yield {'type': 'message', 'channel': channel.encode(), 'data': data}
+
+
+_redis_client = None
+
+def get_redis():
+    """Shared async Redis client for settings.redis_url, or None when unset
+    or the redis package isn't installed"""
+    global _redis_client
+    if _redis_client is None and settings.redis_url and aioredis is not None:
+        _redis_client = aioredis.from_url(settings.redis_url)
+    return _redis_client
+
+def publish_invalidation(namespace: str, note: str = "") -> bool:
+    """``TwoLevelCache.invalidate`` for processes that don't serve, e.g.
+    training jobs: bumps the namespace's generation and announces it to
+    every replica with a short-lived synchronous client. False if Redis
+    isn't configured or can't be reached."""
+    if not settings.redis_url or redis is None:
+        return False
+    # Short timeouts: a training job shouldn't hang on an unreachable Redis
+    client = redis.Redis.from_url(
+        settings.redis_url,
+        socket_connect_timeout=settings.redis_publish_timeout_seconds,
+        socket_timeout=settings.redis_publish_timeout_seconds
+    )
+    try:
+        generation = client.incr(_generation_key(namespace))
+        client.set(_note_key(namespace), note)
+        client.publish(INVALIDATION_CHANNEL, f"{namespace}:{generation}:{note}")
+        return True
+    except Exception as e:
+        logger.warning("Could not publish %s invalidation: %s", namespace, e)
+        return False
+    finally:
+        client.close()
+
+def reset_redis():
+    """Forget the shared client so the next get_redis() opens a new one.
+    
+    For forked workers: the inherited client's connections belong to the
+    parent's event loop and sockets, so it is dropped rather than closed.
+    """
+    global _redis_client
+    _redis_client = None
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 class Settings(BaseSettings):
     model_config = {
@@ -23,5 +23,96 @@ class Settings(BaseSettings):
     # ML Model settings
     model_path: str = "models/"
     retrain_interval_hours: int = 24
+    model_multi_strategy: str = "one_output_per_tree"  # or "multi_output_tree"
+    inference_backend: str = "xgboost"  # or "flat" for compiled NumPy tree traversal
+    flat_inference_max_batch: int = 64  # larger batches are faster through XGBoost
+    
+    # Scoreline probabilities
+    scoreline_max_goals: int = 10
+    dixon_coles_rho: Optional[float] = None  # e.g. -0.13 to enable the low-score correction
+    
+    # Incremental (warm-start) retraining
+    incremental_mode: str = "add"  # "add" new trees or "refresh" existing leaves
+    incremental_trees: int = 20
+    incremental_max_trees: int = 400
+    incremental_drift_ratio: float = 1.5
+    
+    # Walk-forward backtesting
+    backtest_workers: int = 2
+    backtest_refit_every: int = 1
+    backtest_min_train_matches: int = 50
+    
+    # Point-in-time training features
+    feature_window: int = 10
+    
+    # Elo team ratings
+    use_rating_features: bool = False
+    ratings_path: str = "models/ratings/"
+    elo_k_factor: float = 20.0
+    elo_home_advantage: float = 65.0
+    elo_initial_rating: float = 1500.0
+    # Preforked workers share ratings through snapshots
+    ratings_check_seconds: float = 1.0
+    ratings_snapshots_kept: int = 5
+    # How far back re-sent results are recognised (and older ones skipped)
+    ratings_dedupe_days: int = 60
+    
+    # Pre-scoring of upcoming fixtures
+    prescore_competitions: List[int] = []
+    prescore_days_ahead: int = 14
+    prescore_interval_hours: int = 24
+    matchup_matrix_competitions: List[int] = []
+    prescore_explanations: bool = True  # only for models explain() supports
+    explanation_cache_size: int = 10000
+    
+    # Monte Carlo season simulation
+    simulation_workers: int = 1
+    simulation_chunk_size: int = 10000
+    simulation_relegation_spots: int = 3
+    simulation_cache_size: int = 64
+    
+    # Latency-budgeted model compression
+    latency_budget_ms: float = 1.0
+    distill_tree_counts: List[int] = [25, 50]
+    distill_student_depths: List[int] = [3, 4]
+    
+    # Team name resolution (trigram Jaccard similarity for typos)
+    team_fuzzy_threshold: float = 0.5
+    team_fuzzy_cache_size: int = 10000
+    
+    # On-demand sampling profiler (/debug routes exist only when this or
+    # debug is on, and always require the X-Debug-Token header)
+    profiling_enabled: bool = False
+    profiling_token: Optional[str] = None
+    profiler_interval_ms: float = 5.0
+    profiler_max_seconds: float = 60.0
+    
+    # Startup warm-up before /ready succeeds; competitions default to the
+    # prescore and matchup matrix ones
+    warmup_competitions: List[int] = []
+    warmup_inferences: int = 3
+    
+    # Shared memory-mapped team features table (e.g. under /dev/shm),
+    # published by `python -m app.data.feature_store`; None disables it
+    feature_store_path: Optional[str] = None
+    feature_store_check_seconds: float = 1.0
+    
+    # Preforked server (python -m app.server)
+    server_workers: int = 2
+    worker_memory_report_seconds: float = 60.0
+    
+    # Two-level cache for team features and live predictions: in-process
+    # LRU, then Redis (shared by every replica) when redis_url is set
+    cache_local_max_entries: int = 10000
+    team_features_cache_ttl_seconds: int = 6 * 3600
+    prediction_cache_ttl_seconds: int = 3600
+    # Backoff between attempts to resubscribe to cache invalidations
+    redis_reconnect_seconds: float = 0.5
+    redis_reconnect_max_seconds: float = 30.0
+    # Connect and read timeout of publish_invalidation's one-off client
+    redis_publish_timeout_seconds: float = 1.0
+    
+    # Online evaluation of live predictions
+    online_eval_window: int = 100
 
 settings = Settings()
\ No newline at end of file
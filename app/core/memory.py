@@ -0,0 +1,51 @@
+import os
+import resource
+from typing import Dict, Optional
+
+
+def rss_mb(pid: Optional[int] = None) -> float:
+    """Current resident set size of a process in MB"""
+    status_path = f"/proc/{pid or 'self'}/status"
+    try:
+        with open(status_path) as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    
+    # Non-Linux fallback: only the peak is available for our own process
+    if pid is None or pid == os.getpid():
+        return peak_rss_mb()
+    return 0.0
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB"""
+    # ru_maxrss is reported in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def memory_breakdown_mb(pid: Optional[int] = None) -> Dict[str, float]:
+    """RSS split into shared and private pages, plus PSS, in MB.
+    
+    Forked workers share the parent's pages until they write to them, so
+    ``private`` is what each extra worker really costs and ``pss``
+    (shared pages divided among the processes using them) sums to the
+    true total across workers.
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid or 'self'}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    except OSError:
+        return {'rss': rss_mb(pid)}
+    return {
+        'rss': fields.get('Rss', 0.0),
+        'pss': fields.get('Pss', 0.0),
+        'shared': fields.get('Shared_Clean', 0.0) + fields.get('Shared_Dirty', 0.0),
+        'private': fields.get('Private_Clean', 0.0) + fields.get('Private_Dirty', 0.0),
+    }
\ No newline at end of file
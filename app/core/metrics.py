@@ -0,0 +1,247 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Seconds; spans sub-millisecond cache hits up to slow upstream API calls
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [
+        '{}="{}"'.format(n, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for n, v in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class _Metric:
+    kind = 'untyped'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+    
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+    
+    def render(self) -> List[str]:
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.kind}',
+            *self.samples()
+        ]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+    
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+    
+    def get(self, **labels) -> float:
+        return self.values.get(self._key(labels), 0)
+    
+    def samples(self):
+        return [
+            f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+            for key, value in sorted(self.values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """Gauge set directly or, with ``collect``, read from a callback at scrape time.
+    
+    The callback returns {label values tuple: value}.
+    """
+    kind = 'gauge'
+    
+    def __init__(
+        self,
+        name,
+        documentation,
+        labelnames=(),
+        collect: Optional[Callable[[], Dict]] = None
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self.collect = collect
+    
+    def set(self, value: float, **labels):
+        with self._lock:
+            self.values[self._key(labels)] = value
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+    
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+    
+    def get(self, **labels) -> float:
+        return self.values.get(self._key(labels), 0)
+    
+    @contextmanager
+    def track(self, **labels):
+        """Count the block as in progress while it runs"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+    
+    def samples(self):
+        values = self.values
+        if self.collect is not None:
+            values = {**values, **self.collect()}
+        return [
+            f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket latency histogram in seconds"""
+    kind = 'histogram'
+    
+    def __init__(
+        self,
+        name,
+        documentation,
+        labelnames=(),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self.series: Dict[Tuple[str, ...], list] = {}
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+    
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+    
+    def count(self, **labels) -> int:
+        series = self.series.get(self._key(labels))
+        return series[2] if series else 0
+    
+    def samples(self):
+        lines = []
+        for key, (counts, total, count) in sorted(self.series.items()):
+            labels = _format_labels(self.labelnames, key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = 'le="{}"'.format(_format_value(bound))
+                bucket_labels = _format_labels(self.labelnames, key, le)
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Registry:
+    """Metrics rendered together in the Prometheus text exposition format"""
+    
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+    
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+    
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+    
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route', ('method', 'route', 'status')
+))
+REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    'http_requests_in_flight', 'HTTP requests currently being served'
+))
+PREDICTION_STAGE_LATENCY = registry.register(Histogram(
+    'prediction_stage_duration_seconds', 'Time spent in each prediction stage',
+    ('stage', 'model_version')
+))
+API_CALL_LATENCY = registry.register(Histogram(
+    'football_api_request_duration_seconds', 'football-data.org API call latency', ('endpoint',)
+))
+CACHE_REQUESTS = registry.register(Counter(
+    'cache_requests_total', 'Cache lookups by cache and result (hit or miss)', ('cache', 'result')
+))
+EXECUTOR_PENDING = registry.register(Gauge(
+    'executor_pending_tasks', 'Tasks submitted to an executor and not yet finished', ('executor',)
+))
+
+BACKGROUND_JOB_FAILURES = registry.register(Counter(
+    'background_job_failures_total', 'Background job runs that raised, by job and exception type',
+    ('job', 'error')
+))
+
+
+def _process_memory() -> Dict[Tuple[str, str], float]:
+    from .memory import memory_breakdown_mb
+    pid = str(os.getpid())
+    return {(pid, kind): value for kind, value in memory_breakdown_mb().items()}
+
+PROCESS_MEMORY = registry.register(Gauge(
+    'process_memory_mb',
+    'Memory of the serving process (rss, pss, shared, private)',
+    ('pid', 'kind'),
+    collect=_process_memory
+))
+
+
+def record_cache(cache: str, hit: bool, count: int = 1):
+    """Count ``count`` lookups against a named cache"""
+    if count:
+        CACHE_REQUESTS.inc(count, cache=cache, result='hit' if hit else 'miss')
\ No newline at end of file
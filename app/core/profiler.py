@@ -0,0 +1,194 @@
+import asyncio
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get('__name__', code.co_filename)
+    return f"{module}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """Wall-clock sampler over every thread's Python stack.
+    
+    A daemon thread snapshots ``sys._current_frames()`` every ``interval``
+    seconds and counts identical stacks, so the cost is one stack walk per
+    thread per sample and nothing at all in the profiled code. Stacks are
+    kept root-first in the collapsed format flamegraph.pl and speedscope
+    read ("frame;frame;frame count").
+    """
+    
+    def __init__(self, interval: float = 0.005, trace_allocations: bool = False):
+        self.interval = interval
+        self.trace_allocations = trace_allocations
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[datetime] = None
+        self.duration_s = 0.0
+        self.allocations: List[Dict] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_tracemalloc = False
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start (or resume) sampling; samples accumulate across pauses"""
+        if self.running:
+            return
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.started_at = self.started_at or datetime.utcnow()
+        self._started = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Pause sampling; allocation tracing carries on until ``finish``"""
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join()
+        self.duration_s += time.perf_counter() - self._started
+    
+    def finish(self, top_allocations: int = 25):
+        """Stop sampling and record the top allocations since the start"""
+        self.stop()
+        if self.trace_allocations and tracemalloc.is_tracing():
+            self.allocations = self._top_allocations(tracemalloc.take_snapshot(), top_allocations)
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+    
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+    
+    @staticmethod
+    def _top_allocations(snapshot, limit: int) -> List[Dict]:
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        return [
+            {
+                'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                'size_kb': stat.size / 1024,
+                'count': stat.count
+            }
+            for stat in snapshot.statistics('lineno')[:limit]
+        ]
+    
+    def collapsed(self) -> str:
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+    
+    def summary(self, top_stacks: int = 10) -> Dict:
+        return {
+            'running': self.running,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'duration_s': self.duration_s,
+            'interval_s': self.interval,
+            'samples': self.samples,
+            'top_stacks': [
+                {'stack': stack, 'samples': count}
+                for stack, count in self.stacks.most_common(top_stacks)
+            ],
+            'allocations': self.allocations
+        }
+
+
+class ProfilerSessions:
+    """At most one profiling session at a time, for a duration or a number of requests"""
+    
+    def __init__(self):
+        self.profiler: Optional[SamplingProfiler] = None
+        self.route: Optional[str] = None
+        self.requests_remaining = 0
+        self.requests_in_flight = 0
+    
+    @property
+    def active(self) -> bool:
+        return self.profiler is not None and (self.profiler.running or self.requests_remaining > 0)
+    
+    def status(self) -> Dict:
+        if self.profiler is None:
+            return {'active': False}
+        return {
+            'active': self.active,
+            'route': self.route,
+            'requests_remaining': self.requests_remaining,
+            **self.profiler.summary()
+        }
+    
+    async def profile_for(
+        self,
+        seconds: float,
+        interval: float,
+        trace_allocations: bool
+    ) -> SamplingProfiler:
+        """Sample everything the process does for ``seconds``"""
+        self._ensure_idle()
+        self.profiler = SamplingProfiler(interval, trace_allocations)
+        self.profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self.profiler.finish()
+        return self.profiler
+    
+    def profile_requests(self, count: int, route: str, interval: float, trace_allocations: bool):
+        """Sample while the next ``count`` requests whose path starts with ``route`` run"""
+        self._ensure_idle()
+        self.profiler = SamplingProfiler(interval, trace_allocations)
+        self.route = route
+        self.requests_remaining = count
+        self.requests_in_flight = 0
+    
+    def _ensure_idle(self):
+        if self.active:
+            raise RuntimeError("A profiling session is already running")
+    
+    def claim(self, path: str) -> bool:
+        """Take one of the remaining request slots if ``path`` matches.
+        
+        Check and decrement happen without an await in between, so
+        concurrent requests can't claim more than ``count`` slots.
+        """
+        if self.requests_remaining <= 0 or not path.startswith(self.route):
+            return False
+        self.requests_remaining -= 1
+        return True
+    
+    def request_started(self):
+        if self.requests_in_flight == 0:
+            self.profiler.start()
+        self.requests_in_flight += 1
+    
+    def request_finished(self):
+        self.requests_in_flight -= 1
+        if self.requests_in_flight == 0:
+            if self.requests_remaining == 0:
+                self.profiler.finish()
+            else:
+                self.profiler.stop()
+
+
+profiler_sessions = ProfilerSessions()
\ No newline at end of file
@@ -0,0 +1,172 @@
+from typing import Optional
+import numpy as np
+import pandas as pd
+from ..core.config import settings
+
+# Multiplier separating group ids from day numbers in composite sort keys
+_DAY_SPAN = 1_000_000
+
+
+def _day_numbers(dates: pd.Series) -> np.ndarray:
+    """Whole (UTC) days since the epoch"""
+    dates = pd.to_datetime(dates, utc=True).dt.tz_localize(None)
+    return dates.to_numpy().astype('datetime64[D]').astype(np.int64)
+
+
+def _group_starts(keys: np.ndarray) -> np.ndarray:
+    """Position of each row's first group member, for rows sorted by key"""
+    positions = np.arange(len(keys))
+    is_start = np.ones(len(keys), dtype=bool)
+    is_start[1:] = keys[1:] != keys[:-1]
+    return np.maximum.accumulate(np.where(is_start, positions, 0))
+
+
+def _prior_mean(
+    values: np.ndarray,
+    groups: np.ndarray,
+    days: np.ndarray,
+    window: Optional[int] = None
+) -> np.ndarray:
+    """Mean of each group's previous ``window`` values, excluding the current day.
+    
+    Rows must be sorted by group then date. Everything comes from one
+    cumulative sum, so the whole history is a single vectorized pass.
+    Matches on the same day never see each other's results. ``window=None``
+    means all prior rows; rows without history get NaN.
+    """
+    group_start = _group_starts(groups)
+    # Evaluate every row at its group's first match of that day
+    day_start = _group_starts(groups * _DAY_SPAN + days)
+    
+    cumulative = np.concatenate([[0.0], np.cumsum(values, dtype=np.float64)])
+    if window is None:
+        start = group_start
+    else:
+        start = np.maximum(group_start, day_start - window)
+    
+    count = day_start - start
+    total = cumulative[day_start] - cumulative[start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def build_point_in_time_features(
+    matches: pd.DataFrame,
+    window: Optional[int] = None,
+    form_window: int = 5,
+    include_ratings: Optional[bool] = None
+) -> pd.DataFrame:
+    """Training frame with every team feature as it stood before each kickoff.
+    
+    The history is sorted once and reshaped to one row per team per match;
+    every rolling statistic is then a prior-window mean over that frame, so
+    a multi-season history is built in one pass instead of recomputing
+    features match by match.
+    
+    Adds the ``TRAINING_FEATURES`` columns the model manager reads (plus
+    conceded averages and, optionally, pre-match Elo ratings) to a copy of
+    ``matches``, keeping its index and columns.
+    """
+    window = window or settings.feature_window
+    if include_ratings is None:
+        include_ratings = settings.use_rating_features
+    
+    matches = matches.copy()
+    n_matches = len(matches)
+    days = _day_numbers(matches['date'])
+    
+    home_score = matches['home_score'].to_numpy(dtype=np.float64)
+    away_score = matches['away_score'].to_numpy(dtype=np.float64)
+    home_points = np.where(home_score > away_score, 3, np.where(home_score == away_score, 1, 0))
+    away_points = np.where(away_score > home_score, 3, np.where(home_score == away_score, 1, 0))
+    
+    # One row per team per match: home sides first, then away sides
+    codes, _ = pd.factorize(pd.concat([matches['home_team'], matches['away_team']]))
+    home_codes = codes[:n_matches]
+    away_codes = codes[n_matches:]
+    
+    long = pd.DataFrame({
+        'match': np.tile(np.arange(n_matches), 2),
+        'is_home': np.repeat([True, False], n_matches),
+        'team': codes.astype(np.int64),
+        'day': np.tile(days, 2),
+        'goals_for': np.concatenate([home_score, away_score]),
+        'goals_against': np.concatenate([away_score, home_score]),
+        'points': np.concatenate([home_points, away_points]),
+    }).sort_values(['team', 'day', 'match'], kind='stable').reset_index(drop=True)
+    
+    team = long['team'].to_numpy()
+    day = long['day'].to_numpy()
+    long['avg_goals'] = _prior_mean(long['goals_for'].to_numpy(), team, day, window)
+    long['avg_conceded'] = _prior_mean(long['goals_against'].to_numpy(), team, day, window)
+    long['form'] = _prior_mean(long['points'].to_numpy() / 3.0, team, day, form_window)
+    
+    previous_day = np.roll(day, 1).astype(np.float64)
+    previous_day[_group_starts(team) == np.arange(len(long))] = np.nan
+    long['days_since_last_match'] = day - previous_day
+    
+    # Home record only counts the team's earlier home matches
+    home_rows = long[long['is_home']]
+    home_win_rate = _prior_mean(
+        (home_rows['points'].to_numpy() == 3).astype(np.float64),
+        home_rows['team'].to_numpy(),
+        home_rows['day'].to_numpy(),
+        window
+    )
+    
+    home_side = home_rows.set_index('match').sort_index()
+    away_side = long[~long['is_home']].set_index('match').sort_index()
+    home_advantage = pd.Series(home_win_rate, index=home_rows['match'].to_numpy()).sort_index()
+    
+    matches['home_team_avg_goals'] = home_side['avg_goals'].to_numpy()
+    matches['away_team_avg_goals'] = away_side['avg_goals'].to_numpy()
+    matches['home_team_avg_conceded'] = home_side['avg_conceded'].to_numpy()
+    matches['away_team_avg_conceded'] = away_side['avg_conceded'].to_numpy()
+    matches['home_advantage'] = home_advantage.to_numpy()
+    matches['recent_form_home'] = home_side['form'].to_numpy()
+    matches['recent_form_away'] = away_side['form'].to_numpy()
+    matches['days_since_last_match'] = home_side['days_since_last_match'].to_numpy()
+    matches['head_to_head_home_wins'] = _head_to_head_home_wins(
+        home_codes, away_codes, days, home_points
+    )
+    
+    if 'matchday' in matches.columns and 'season' in matches.columns:
+        season_keys = [c for c in ('competition', 'season') if c in matches.columns]
+        season_length = matches.groupby(season_keys)['matchday'].transform('max')
+        matches['season_progress'] = matches['matchday'] / season_length
+    
+    if include_ratings:
+        from .ratings import EloRatings
+        ratings = EloRatings().replay(matches)
+        for column in ratings.columns:
+            matches[column] = ratings[column]
+    
+    return matches
+
+
+def _head_to_head_home_wins(
+    home_codes: np.ndarray,
+    away_codes: np.ndarray,
+    days: np.ndarray,
+    home_points: np.ndarray
+) -> np.ndarray:
+    """Share of earlier meetings (at either venue) won by today's home side"""
+    home_codes = home_codes.astype(np.int64)
+    away_codes = away_codes.astype(np.int64)
+    n_teams = int(max(home_codes.max(initial=0), away_codes.max(initial=0))) + 1
+    
+    low = np.minimum(home_codes, away_codes)
+    home_is_low = home_codes == low
+    pair = low * n_teams + np.maximum(home_codes, away_codes)
+    
+    # Wins from the lower-coded team's point of view, and from the other's
+    low_won = np.where(home_is_low, home_points == 3, home_points == 0).astype(np.float64)
+    high_won = np.where(home_is_low, home_points == 0, home_points == 3).astype(np.float64)
+    
+    order = np.lexsort((days, pair))
+    low_rate = np.empty(len(pair))
+    high_rate = np.empty(len(pair))
+    low_rate[order] = _prior_mean(low_won[order], pair[order], days[order])
+    high_rate[order] = _prior_mean(high_won[order], pair[order], days[order])
+    
+    return np.where(home_is_low, low_rate, high_rate)
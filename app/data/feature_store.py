@@ -0,0 +1,197 @@
+import json
+import os
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+import numpy as np
+from ..core.config import settings
+
+# Numeric team features in column order
+TEAM_FEATURE_KEYS = [
+    'avg_goals_scored', 'avg_goals_conceded', 'home_advantage', 'away_form', 'recent_form',
+    'scoring_consistency', 'defensive_stability', 'win_rate', 'draw_rate', 'loss_rate',
+    'goals_per_match_trend',
+]
+CURRENT_FILE = "CURRENT"
+
+
+def _version_paths(directory: str, version: int) -> Tuple[str, str]:
+    return (
+        os.path.join(directory, f"features_v{version:08d}.npy"),
+        os.path.join(directory, f"index_v{version:08d}.json"),
+    )
+
+
+def read_current_version(directory: str) -> Optional[int]:
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def publish_features(
+    directory: str,
+    features: Dict[Hashable, Dict],
+    aliases: Optional[Dict[Hashable, str]] = None
+) -> int:
+    """Write a new version of the team features table and make it current.
+    
+    The matrix and index are written under a new version number first;
+    the CURRENT pointer is then replaced atomically, so readers only ever
+    see a complete table. ``aliases`` (key -> team name) let readers
+    without a loaded team catalog find rows by name too. The previous
+    version is kept for readers still mapping it (double buffering);
+    anything older is removed.
+    """
+    os.makedirs(directory, exist_ok=True)
+    previous = read_current_version(directory)
+    version = (previous or 0) + 1
+    matrix_path, index_path = _version_paths(directory, version)
+    
+    keys = list(features)
+    matrix = np.lib.format.open_memmap(
+        matrix_path, mode='w+', dtype=np.float32, shape=(len(keys), len(TEAM_FEATURE_KEYS))
+    )
+    for row, key in enumerate(keys):
+        matrix[row] = [features[key].get(k, 0) for k in TEAM_FEATURE_KEYS]
+    matrix.flush()
+    del matrix
+    with open(index_path, 'w') as f:
+        json.dump({
+            'columns': TEAM_FEATURE_KEYS,
+            'keys': keys,
+            'aliases': [(aliases or {}).get(key) for key in keys]
+        }, f)
+    
+    pointer = os.path.join(directory, f".{CURRENT_FILE}.tmp")
+    with open(pointer, 'w') as f:
+        f.write(str(version))
+    os.replace(pointer, os.path.join(directory, CURRENT_FILE))
+    
+    for old in range(1, (previous or 0)):
+        for path in _version_paths(directory, old):
+            if os.path.exists(path):
+                os.remove(path)
+    return version
+
+
+class SharedFeatureTable:
+    """Read-only, zero-copy view of the published team features.
+    
+    The matrix is memory-mapped, so every worker on the host reads the same
+    page-cache pages and a lookup is an index hit plus a row read. The
+    CURRENT pointer is re-checked at most every ``check_seconds``; a new
+    version is mapped and swapped in with a single assignment.
+    """
+    
+    def __init__(self, directory: str, check_seconds: Optional[float] = None):
+        self.directory = directory
+        self.check_seconds = (
+            settings.feature_store_check_seconds if check_seconds is None else check_seconds
+        )
+        self.version = 0
+        self._table: Tuple[Dict[Hashable, int], np.ndarray] = (
+            {}, np.empty((0, len(TEAM_FEATURE_KEYS)), dtype=np.float32)
+        )
+        self._checked_at = float('-inf')
+    
+    def __len__(self) -> int:
+        return len(self._table[0])
+    
+    def refresh(self, force: bool = False) -> bool:
+        """Map a newer published version if there is one; True if swapped"""
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_seconds:
+            return False
+        self._checked_at = now
+        
+        version = read_current_version(self.directory)
+        if version is None or version == self.version:
+            return False
+        matrix_path, index_path = _version_paths(self.directory, version)
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+            matrix = np.load(matrix_path, mmap_mode='r')
+        except OSError:
+            # Pruned between reading CURRENT and opening; catch the next one
+            return False
+        if index['columns'] != TEAM_FEATURE_KEYS:
+            return False
+        
+        rows = {key: row for row, key in enumerate(index['keys'])}
+        for row, alias in enumerate(index.get('aliases', [])):
+            if alias is not None:
+                rows.setdefault(alias, row)
+        self._table = (rows, matrix)
+        self.version = version
+        return True
+    
+    def lookup(self, key: Hashable) -> Optional[np.ndarray]:
+        """The team's feature row (a view into the shared matrix), or None"""
+        self.refresh()
+        index, matrix = self._table
+        row = index.get(key)
+        return None if row is None else matrix[row]
+    
+    def lookup_rows(self, keys: List[Hashable]) -> Tuple[np.ndarray, np.ndarray]:
+        """(rows, found) for many teams with one fancy-indexing read"""
+        self.refresh()
+        index, matrix = self._table
+        positions = np.array([index.get(key, -1) for key in keys], dtype=np.int64)
+        found = positions >= 0
+        rows = np.zeros((len(keys), matrix.shape[1]), dtype=np.float32)
+        rows[found] = matrix[positions[found]]
+        return rows, found
+    
+    def get_features(self, key: Hashable) -> Optional[Dict]:
+        row = self.lookup(key)
+        if row is None:
+            return None
+        return dict(zip(TEAM_FEATURE_KEYS, row.tolist()))
+
+
+async def publish_team_features(
+    team_stats,
+    team_names: List[str],
+    directory: Optional[str] = None
+) -> int:
+    """Compute features for the given teams and publish them as a new version"""
+    features, aliases = {}, {}
+    for name in team_names:
+        key = team_stats.catalog.key(name)
+        recent_matches = await team_stats._get_recent_matches(name)
+        features[key] = team_stats.compute_features(recent_matches, name)
+        aliases[key] = name
+    return publish_features(directory or settings.feature_store_path, features, aliases)
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+    from .team_stats import TeamStatsService
+    
+    parser = argparse.ArgumentParser(description="Refresh the shared team features table")
+    parser.add_argument(
+        "competitions", type=int, nargs="+", help="football-data.org competition ids"
+    )
+    parser.add_argument("--path", default=settings.feature_store_path)
+    parser.add_argument(
+        "--interval-hours", type=float, default=None, help="keep refreshing on this interval"
+    )
+    args = parser.parse_args()
+    if not args.path:
+        parser.error("set FEATURE_STORE_PATH or pass --path")
+    
+    async def refresh_forever():
+        team_stats = TeamStatsService()
+        while True:
+            await team_stats.catalog.load(team_stats.api_client, args.competitions)
+            names = [team['name'] for team in team_stats.catalog.teams.values()]
+            version = await publish_team_features(team_stats, names, args.path)
+            print(f"Published {len(names)} teams as version {version} in {args.path}", flush=True)
+            if args.interval_hours is None:
+                return
+            await asyncio.sleep(args.interval_hours * 3600)
+    
+    asyncio.run(refresh_forever())
\ No newline at end of file
@@ -4,6 +4,10 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import pandas as pd
 from ..core.config import settings
+from ..core.metrics import API_CALL_LATENCY
+
+# Fixtures not yet played: v4 marks those with a confirmed kickoff TIMED
+UPCOMING_STATUSES = "SCHEDULED,TIMED"
 
 class FootballAPIClient:
     def __init__(self):
@@ -17,18 +21,20 @@ class FootballAPIClient:
     async def get_competitions(self) -> List[Dict]:
         """Fetch available competitions/leagues"""
         url = f"{self.base_url}/competitions"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers) as response:
-                data = await response.json()
-                return data.get('competitions', [])
+        with API_CALL_LATENCY.time(endpoint='competitions'):
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, headers=self.headers) as response:
+                    data = await response.json()
+                    return data.get('competitions', [])
     
     async def get_teams(self, competition_id: int) -> List[Dict]:
         """Fetch teams in a competition"""
         url = f"{self.base_url}/competitions/{competition_id}/teams"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers) as response:
-                data = await response.json()
-                return data.get('teams', [])
+        with API_CALL_LATENCY.time(endpoint='competition_teams'):
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, headers=self.headers) as response:
+                    data = await response.json()
+                    return data.get('teams', [])
     
     async def get_matches(
         self, 
@@ -46,10 +52,11 @@ class FootballAPIClient:
         if date_to:
             params['dateTo'] = date_to.strftime('%Y-%m-%d')
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers, params=params) as response:
-                data = await response.json()
-                return data.get('matches', [])
+        with API_CALL_LATENCY.time(endpoint='competition_matches'):
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, headers=self.headers, params=params) as response:
+                    data = await response.json()
+                    return data.get('matches', [])
     
     async def get_team_matches(
         self, 
@@ -67,18 +74,20 @@ class FootballAPIClient:
         if date_to:
             params['dateTo'] = date_to.strftime('%Y-%m-%d')
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers, params=params) as response:
-                data = await response.json()
-                return data.get('matches', [])
+        with API_CALL_LATENCY.time(endpoint='team_matches'):
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, headers=self.headers, params=params) as response:
+                    data = await response.json()
+                    return data.get('matches', [])
     
     async def get_standings(self, competition_id: int) -> Dict:
         """Fetch current standings for a competition"""
         url = f"{self.base_url}/competitions/{competition_id}/standings"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=self.headers) as response:
-                data = await response.json()
-                return data
+        with API_CALL_LATENCY.time(endpoint='competition_standings'):
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url, headers=self.headers) as response:
+                    data = await response.json()
+                    return data
     
     def normalize_match_data(self, raw_matches: List[Dict]) -> pd.DataFrame:
         """Convert raw API match data to normalized DataFrame"""
@@ -0,0 +1,321 @@
+import fcntl
+import glob
+import os
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Dict, Hashable, Optional
+import joblib
+import numpy as np
+import pandas as pd
+from ..core.config import settings
+
+
+def goal_difference_multiplier(goal_difference: np.ndarray) -> np.ndarray:
+    """World Football Elo scaling: bigger wins move ratings further"""
+    margin = np.abs(goal_difference)
+    return np.where(margin <= 1, 1.0, np.where(margin == 2, 1.5, (11 + margin) / 8))
+
+
+class EloRatings:
+    """Team ratings updated in O(1) per match.
+    
+    Standard Elo with a home-advantage offset and goal-difference scaling.
+    Teams are keyed by whatever the caller uses (names or ids) and start at
+    ``initial_rating`` the first time they are seen.
+    """
+    
+    def __init__(
+        self,
+        k_factor: Optional[float] = None,
+        home_advantage: Optional[float] = None,
+        initial_rating: Optional[float] = None
+    ):
+        if k_factor is None:
+            k_factor = settings.elo_k_factor
+        if home_advantage is None:
+            home_advantage = settings.elo_home_advantage
+        if initial_rating is None:
+            initial_rating = settings.elo_initial_rating
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self.initial_rating = initial_rating
+        self.ratings: Dict[Hashable, float] = {}
+        self.matches_processed = 0
+        # Match day of each result applied through update(), by id, so
+        # re-sent results are skipped; only the last ratings_dedupe_days
+        # (counted back from the latest match day) are kept
+        self.processed_ids: Dict[Hashable, date] = {}
+        self.updated_at: Optional[datetime] = None
+        self.saved_at: Optional[datetime] = None
+    
+    @property
+    def has_unsaved_updates(self) -> bool:
+        if self.updated_at is None:
+            return False
+        return self.saved_at is None or self.updated_at > self.saved_at
+    
+    def get_rating(self, team: Hashable) -> float:
+        return self.ratings.get(team, self.initial_rating)
+    
+    def expected_home_score(self, home_team: Hashable, away_team: Hashable) -> float:
+        """Elo win expectancy of the home side (draws count half)"""
+        diff = self.get_rating(home_team) + self.home_advantage - self.get_rating(away_team)
+        return 1 / (1 + 10 ** (-diff / 400))
+    
+    def update(
+        self,
+        home_team: Hashable,
+        away_team: Hashable,
+        home_score: int,
+        away_score: int,
+        match_id: Optional[Hashable] = None,
+        match_date: Optional[date] = None
+    ) -> bool:
+        """Apply one result; returns False if ``match_id`` was already applied.
+        
+        Results with an id that are older than the deduplication window
+        can't be told apart from re-sends, so they are skipped too.
+        """
+        if match_id is not None:
+            match_date = match_date or datetime.utcnow().date()
+            if match_id in self.processed_ids or match_date < self._dedupe_cutoff():
+                return False
+            self._remember(match_id, match_date)
+        
+        expected = self.expected_home_score(home_team, away_team)
+        actual = 1.0 if home_score > away_score else 0.5 if home_score == away_score else 0.0
+        multiplier = float(goal_difference_multiplier(np.array(home_score - away_score)))
+        delta = self.k_factor * multiplier * (actual - expected)
+        
+        self.ratings[home_team] = self.get_rating(home_team) + delta
+        self.ratings[away_team] = self.get_rating(away_team) - delta
+        self.matches_processed += 1
+        self.updated_at = datetime.utcnow()
+        return True
+    
+    def _dedupe_cutoff(self) -> date:
+        if not self.processed_ids:
+            return date.min
+        return max(self.processed_ids.values()) - timedelta(days=settings.ratings_dedupe_days)
+    
+    def _remember(self, match_id: Hashable, match_date: date):
+        latest = max(self.processed_ids.values(), default=date.min)
+        self.processed_ids[match_id] = match_date
+        if match_date > latest:
+            cutoff = self._dedupe_cutoff()
+            self.processed_ids = {
+                k: day for k, day in self.processed_ids.items() if day >= cutoff
+            }
+    
+    def replay(
+        self,
+        matches: pd.DataFrame,
+        home_col: str = 'home_team',
+        away_col: str = 'away_team'
+    ) -> pd.DataFrame:
+        """Apply a full match history in date order.
+        
+        Everything that doesn't depend on the running ratings (outcomes,
+        goal-difference multipliers, team codes) is computed vectorized up
+        front; the sequential part is a tight loop over plain Python lists.
+        Returns the pre-match ratings of each match (aligned with
+        ``matches``) so they can be used as leak-free training features.
+        """
+        dates = pd.to_datetime(matches['date'], utc=True).dt.tz_localize(None).to_numpy()
+        order = np.argsort(dates, kind='stable')
+        ordered = matches.iloc[order]
+        
+        codes, teams = pd.factorize(pd.concat([ordered[home_col], ordered[away_col]]), sort=False)
+        n_matches = len(ordered)
+        home_codes = codes[:n_matches].tolist()
+        away_codes = codes[n_matches:].tolist()
+        
+        home_score = ordered['home_score'].to_numpy()
+        away_score = ordered['away_score'].to_numpy()
+        actual = np.where(
+            home_score > away_score, 1.0, np.where(home_score == away_score, 0.5, 0.0)
+        )
+        step = (self.k_factor * goal_difference_multiplier(home_score - away_score)).tolist()
+        actual = actual.tolist()
+        
+        ratings = [self.ratings.get(team, self.initial_rating) for team in teams]
+        home_before = [0.0] * n_matches
+        away_before = [0.0] * n_matches
+        home_advantage = self.home_advantage
+        
+        for i in range(n_matches):
+            h = home_codes[i]
+            a = away_codes[i]
+            rh = ratings[h]
+            ra = ratings[a]
+            home_before[i] = rh
+            away_before[i] = ra
+            expected = 1 / (1 + 10 ** ((ra - rh - home_advantage) / 400))
+            delta = step[i] * (actual[i] - expected)
+            ratings[h] = rh + delta
+            ratings[a] = ra - delta
+        
+        self.ratings.update(zip(teams, ratings))
+        self.matches_processed += n_matches
+        self.updated_at = datetime.utcnow()
+        
+        before = pd.DataFrame({
+            'home_elo': home_before,
+            'away_elo': away_before
+        }, index=ordered.index)
+        before['elo_home_win_expectancy'] = 1 / (
+            1 + 10 ** ((before['away_elo'] - before['home_elo'] - self.home_advantage) / 400)
+        )
+        return before.loc[matches.index]
+    
+    def get_features(self, home_team: Hashable, away_team: Hashable) -> Dict:
+        return {
+            'home_elo': self.get_rating(home_team),
+            'away_elo': self.get_rating(away_team),
+            'elo_home_win_expectancy': self.expected_home_score(home_team, away_team)
+        }
+    
+    def save_snapshot(self, directory: Optional[str] = None) -> str:
+        """Persist the current ratings as a timestamped snapshot"""
+        directory = directory or settings.ratings_path
+        os.makedirs(directory, exist_ok=True)
+        filepath = os.path.join(
+            directory,
+            f"elo_ratings_{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}.joblib"
+        )
+        # Written aside and renamed, so readers never load a partial snapshot
+        partial = filepath + ".partial"
+        joblib.dump({
+            'ratings': self.ratings,
+            'k_factor': self.k_factor,
+            'home_advantage': self.home_advantage,
+            'initial_rating': self.initial_rating,
+            'matches_processed': self.matches_processed,
+            'processed_ids': self.processed_ids,
+            'updated_at': self.updated_at
+        }, partial)
+        os.replace(partial, filepath)
+        self.saved_at = datetime.utcnow()
+        return filepath
+    
+    def restore(self, filepath: str):
+        """Replace this instance's state with a snapshot's, in place"""
+        data = joblib.load(filepath)
+        self.k_factor = data['k_factor']
+        self.home_advantage = data['home_advantage']
+        self.initial_rating = data['initial_rating']
+        self.ratings = data['ratings']
+        self.matches_processed = data['matches_processed']
+        processed_ids = data.get('processed_ids', {})
+        if isinstance(processed_ids, set):
+            # Snapshots from before the window: date them by the snapshot
+            processed_ids = (
+                dict.fromkeys(processed_ids, data['updated_at'].date()) if processed_ids else {}
+            )
+        self.processed_ids = processed_ids
+        self.updated_at = data['updated_at']
+        self.saved_at = self.updated_at
+    
+    @classmethod
+    def load_snapshot(cls, filepath: str):
+        instance = cls()
+        instance.restore(filepath)
+        return instance
+    
+    @classmethod
+    def load_latest(cls, directory: Optional[str] = None):
+        """Latest snapshot in the directory, or None if there isn't one"""
+        filepath = latest_snapshot(directory)
+        return cls.load_snapshot(filepath) if filepath else None
+
+
+def latest_snapshot(directory: Optional[str] = None) -> Optional[str]:
+    pattern = os.path.join(directory or settings.ratings_path, "elo_ratings_*.joblib")
+    snapshots = sorted(glob.glob(pattern))
+    return snapshots[-1] if snapshots else None
+
+
+_team_ratings = None
+_loaded_snapshot: Optional[str] = None
+_checked_at = 0.0
+# Set in preforked workers: each has its own copy of the ratings, so they
+# are kept in step through snapshots instead of in memory
+shared_snapshots = False
+
+def get_team_ratings() -> EloRatings:
+    """Shared ratings, seeded from the latest snapshot on first use.
+    
+    With ``shared_snapshots`` on, a snapshot written by another process
+    is picked up (in place) within ratings_check_seconds.
+    """
+    global _team_ratings, _loaded_snapshot, _checked_at
+    if _team_ratings is None:
+        _team_ratings = EloRatings()
+        _loaded_snapshot = latest_snapshot()
+        if _loaded_snapshot:
+            _team_ratings.restore(_loaded_snapshot)
+        _checked_at = time.monotonic()
+    elif shared_snapshots and time.monotonic() - _checked_at >= settings.ratings_check_seconds:
+        _checked_at = time.monotonic()
+        _reload_if_newer()
+    return _team_ratings
+
+
+def _reload_if_newer():
+    global _loaded_snapshot
+    filepath = latest_snapshot()
+    if filepath and filepath != _loaded_snapshot:
+        _team_ratings.restore(filepath)
+        _loaded_snapshot = filepath
+
+
+@contextmanager
+def ratings_update():
+    """The shared ratings, for applying new results.
+    
+    With ``shared_snapshots`` on, updates are serialized across processes
+    with a file lock: the latest snapshot is loaded first, and a new one
+    is saved afterwards, so no process's results are lost.
+    """
+    global _loaded_snapshot
+    ratings = get_team_ratings()
+    if not shared_snapshots:
+        yield ratings
+        return
+    
+    os.makedirs(settings.ratings_path, exist_ok=True)
+    with open(os.path.join(settings.ratings_path, ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        _reload_if_newer()
+        yield ratings
+        if ratings.has_unsaved_updates:
+            _loaded_snapshot = ratings.save_snapshot()
+            _prune_snapshots(settings.ratings_snapshots_kept)
+
+
+def _prune_snapshots(keep: int):
+    pattern = os.path.join(settings.ratings_path, "elo_ratings_*.joblib")
+    for filepath in sorted(glob.glob(pattern))[:-keep]:
+        os.remove(filepath)
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Rebuild Elo ratings from a full match history")
+    parser.add_argument(
+        "matches", help="CSV or Parquet file with date, home_team, away_team and scores"
+    )
+    parser.add_argument("--key", choices=["name", "id"], default="name")
+    args = parser.parse_args()
+    
+    if args.matches.endswith(".parquet"):
+        history = pd.read_parquet(args.matches)
+    else:
+        history = pd.read_csv(args.matches)
+    
+    suffix = "_id" if args.key == "id" else ""
+    ratings = EloRatings()
+    ratings.replay(history, home_col=f"home_team{suffix}", away_col=f"away_team{suffix}")
+    print(f"Replayed {ratings.matches_processed} matches -> {ratings.save_snapshot()}")
@@ -0,0 +1,175 @@
+import math
+import zlib
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Seasons per league in synthetic_matches; more matches means more leagues,
+# which keeps every date inside pandas' Timestamp range
+MAX_SEASONS = 20
+
+
+def double_round_robin(n_teams: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(matchday, home_slot, away_slot) for a home-and-away season.
+    
+    Circle method: every slot plays once per matchday and meets every
+    other slot once at home and once away. Matchdays are 1-based.
+    """
+    if n_teams % 2:
+        raise ValueError("n_teams must be even")
+    rounds = n_teams - 1
+    half = n_teams // 2
+    
+    # Slot 0 stays put while the others rotate one place per round
+    rotating = (np.arange(rounds)[:, None] + np.arange(rounds)[None, :]) % rounds + 1
+    order = np.hstack([np.zeros((rounds, 1), dtype=int), rotating])
+    first = order[:, :half]
+    second = order[:, ::-1][:, :half]
+    
+    # Alternate who hosts the fixed slot so nobody gets long home runs
+    flip = (np.arange(rounds) % 2 == 1)[:, None] & (np.arange(half) == 0)[None, :]
+    home = np.where(flip, second, first)
+    away = np.where(flip, first, second)
+    
+    matchday = np.repeat(np.arange(1, rounds + 1), half)
+    return (
+        np.concatenate([matchday, matchday + rounds]),
+        np.concatenate([home.ravel(), away.ravel()]),
+        np.concatenate([away.ravel(), home.ravel()])
+    )
+
+
+def generate_matches(
+    n_leagues: int = 4,
+    n_seasons: int = 5,
+    teams_per_league: int = 20,
+    seed: int = 0,
+    start_year: int = 2000,
+    base_goals: float = 1.3,
+    home_advantage: float = 0.25,
+    strength_sd: float = 0.25,
+    season_persistence: float = 0.8
+) -> pd.DataFrame:
+    """Finished multi-league, multi-season fixtures with Poisson scorelines.
+    
+    Each team has latent attack and defence strengths that carry over
+    between seasons as an AR(1) process. Goals are Poisson with log-rate
+    ``log(base_goals) + attack - opposing defence`` (plus ``home_advantage``
+    for the hosts). Everything is generated with array operations from one
+    seeded generator, so the same arguments always give the same frame.
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = teams_per_league
+    matchday, home_slot, away_slot = double_round_robin(n_teams)
+    per_season = len(matchday)
+    n_blocks = n_leagues * n_seasons
+    
+    # Latent strengths per (league, season, team)
+    attack = np.empty((n_leagues, n_seasons, n_teams))
+    defence = np.empty((n_leagues, n_seasons, n_teams))
+    attack[:, 0] = rng.normal(0, strength_sd, (n_leagues, n_teams))
+    defence[:, 0] = rng.normal(0, strength_sd, (n_leagues, n_teams))
+    innovation_sd = strength_sd * math.sqrt(1 - season_persistence ** 2)
+    shape = (n_leagues, n_teams)
+    for season in range(1, n_seasons):
+        attack_shock = rng.normal(0, innovation_sd, shape)
+        defence_shock = rng.normal(0, innovation_sd, shape)
+        attack[:, season] = season_persistence * attack[:, season - 1] + attack_shock
+        defence[:, season] = season_persistence * defence[:, season - 1] + defence_shock
+    
+    # A fresh slot -> team assignment per league season varies the fixture order
+    slot_to_team = np.argsort(rng.random((n_blocks, n_teams)), axis=1)
+    block = np.repeat(np.arange(n_blocks), per_season)
+    league, season = np.divmod(block, n_seasons)
+    home_local = slot_to_team[block, np.tile(home_slot, n_blocks)]
+    away_local = slot_to_team[block, np.tile(away_slot, n_blocks)]
+    
+    log_base = math.log(base_goals)
+    home_attack = attack[league, season, home_local]
+    away_attack = attack[league, season, away_local]
+    home_defence = defence[league, season, home_local]
+    away_defence = defence[league, season, away_local]
+    home_rate = np.exp(log_base + home_advantage + home_attack - away_defence)
+    away_rate = np.exp(log_base + away_attack - home_defence)
+    
+    # Weekly matchdays from August, spread over Saturday and Sunday
+    matchdays = np.tile(matchday, n_blocks)
+    first_season = np.datetime64(f'{start_year}-08-05', 'D')
+    season_start = (first_season + (season * 365.25).astype(int)).astype('datetime64[D]')
+    kickoff = (
+        season_start
+        + (7 * (matchdays - 1) + rng.integers(0, 2, len(block))).astype('timedelta64[D]')
+        + np.timedelta64(15, 'h')
+    )
+    
+    team_ids = league * n_teams + 1
+    team_names = np.array(
+        [f'Team {l}-{t}' for l in range(n_leagues) for t in range(n_teams)], dtype=object
+    )
+    league_names = np.array([f'Synthetic League {l}' for l in range(n_leagues)], dtype=object)
+    
+    matches = pd.DataFrame({
+        'date': pd.to_datetime(kickoff).tz_localize('UTC'),
+        'competition': league_names[league],
+        'competition_id': 1000 + league,
+        'season': start_year + season,
+        'matchday': matchdays,
+        'home_team': team_names[league * n_teams + home_local],
+        'away_team': team_names[league * n_teams + away_local],
+        'home_team_id': team_ids + home_local,
+        'away_team_id': team_ids + away_local,
+        'home_score': rng.poisson(home_rate),
+        'away_score': rng.poisson(away_rate),
+        'status': 'FINISHED',
+    })
+    matches = matches.iloc[np.argsort(kickoff, kind='stable')].reset_index(drop=True)
+    matches.insert(0, 'id', np.arange(len(matches)))
+    return matches
+
+
+def synthetic_matches(n_matches: int, seed: int = 0, teams_per_league: int = 20) -> pd.DataFrame:
+    """About ``n_matches`` matches (exactly, after trimming the latest ones)"""
+    per_season = teams_per_league * (teams_per_league - 1)
+    n_seasons = min(MAX_SEASONS, max(1, math.ceil(n_matches / per_season)))
+    n_leagues = max(1, math.ceil(n_matches / (per_season * n_seasons)))
+    matches = generate_matches(n_leagues, n_seasons, teams_per_league, seed=seed)
+    return matches.iloc[:n_matches]
+
+
+def team_recent_matches(
+    team_name: str,
+    limit: int = 10,
+    as_of: Optional[datetime] = None
+) -> pd.DataFrame:
+    """Weekly recent results for one team, most recent first.
+    
+    Seeded from the team name, so a team always gets the same history.
+    """
+    rng = np.random.default_rng(zlib.crc32(team_name.encode()))
+    as_of = as_of or datetime.now()
+    is_home = np.arange(limit) % 2 == 0
+    opponents = np.array([f'Opponent_{i}' for i in range(limit)], dtype=object)
+    scores = rng.integers(0, 4, (limit, 2))
+    return pd.DataFrame({
+        'date': [as_of - timedelta(days=i * 7) for i in range(limit)],
+        'home_team': np.where(is_home, team_name, opponents),
+        'away_team': np.where(is_home, opponents, team_name),
+        'home_score': scores[:, 0],
+        'away_score': scores[:, 1],
+    })
+
+
+def training_arrays(
+    n_samples: int,
+    n_features: int,
+    seed: int = 42
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Uniform feature rows and (home, away) Poisson goals for a placeholder model"""
+    rng = np.random.default_rng(seed)
+    X = rng.random((n_samples, n_features))
+    y = np.column_stack([
+        rng.poisson(1.5, n_samples),  # home scores
+        rng.poisson(1.2, n_samples)   # away scores
+    ])
+    return X, y
\ No newline at end of file
@@ -0,0 +1,140 @@
+import re
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+from ..core.config import settings
+
+# Club-type tokens that vary between sources ("Arsenal FC" vs "Arsenal")
+_NOISE_TOKENS = {'fc', 'afc', 'cf'}
+_AMBIGUOUS = -1
+
+
+def normalize_name(name: str) -> str:
+    """Accent-, case- and punctuation-insensitive form of a team name"""
+    text = unicodedata.normalize('NFKD', name)
+    text = ''.join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = re.sub(r"[.'’]", '', text)
+    tokens = re.sub(r'[^0-9a-z]+', ' ', text).split()
+    return ' '.join(t for t in tokens if t not in _NOISE_TOKENS) or ' '.join(tokens)
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TeamCatalog:
+    """Team name -> id resolution.
+    
+    Built from football-data competition team lists. The normalized full
+    name, short name and TLA of every team go into one hash index, so exact
+    resolution is a dict lookup. Misspelt names fall back to a trigram
+    index over the same keys; fuzzy answers are memoized so a repeated typo
+    costs a dict lookup too. A key shared by two different teams resolves
+    to nothing rather than to the wrong one.
+    """
+    
+    def __init__(self, fuzzy_threshold: Optional[float] = None):
+        if fuzzy_threshold is None:
+            fuzzy_threshold = settings.team_fuzzy_threshold
+        self.fuzzy_threshold = fuzzy_threshold
+        self.teams: Dict[int, Dict] = {}
+        self.index: Dict[str, int] = {}
+        self.trigram_index: Dict[str, List[str]] = {}
+        self.key_trigram_counts: Dict[str, int] = {}
+        # LRU of fuzzy matches, capped at team_fuzzy_cache_size names
+        self.fuzzy_cache: "OrderedDict[str, Optional[int]]" = OrderedDict()
+        self.loaded_competitions: Set[int] = set()
+    
+    def __len__(self) -> int:
+        return len(self.teams)
+    
+    def add_teams(self, teams: Iterable[Dict]):
+        """Index teams given as API dicts with id, name, shortName and tla"""
+        for team in teams:
+            team_id = int(team['id'])
+            self.teams[team_id] = {
+                'id': team_id,
+                'name': team.get('name'),
+                'short_name': team.get('shortName'),
+                'tla': team.get('tla')
+            }
+            for alias in (team.get('name'), team.get('shortName'), team.get('tla')):
+                if alias:
+                    self._add_key(normalize_name(alias), team_id)
+        self.fuzzy_cache.clear()
+    
+    def add_alias(self, alias: str, team_id: int):
+        """Map an extra spelling (e.g. a local nickname) to a known team"""
+        self._add_key(normalize_name(alias), team_id)
+        self.fuzzy_cache.clear()
+    
+    def _add_key(self, key: str, team_id: int):
+        existing = self.index.get(key)
+        if existing is None:
+            self.index[key] = team_id
+            grams = trigrams(key)
+            self.key_trigram_counts[key] = len(grams)
+            for gram in grams:
+                self.trigram_index.setdefault(gram, []).append(key)
+        elif existing != team_id:
+            self.index[key] = _AMBIGUOUS
+    
+    async def load(self, api_client, competition_ids: Iterable[int]):
+        """Fetch and index the team lists of competitions not loaded yet"""
+        for competition_id in competition_ids:
+            if competition_id in self.loaded_competitions:
+                continue
+            self.add_teams(await api_client.get_teams(competition_id))
+            self.loaded_competitions.add(competition_id)
+    
+    def resolve(self, name: str) -> Optional[int]:
+        """Team id for a name, short name, TLA or close misspelling, else None"""
+        key = normalize_name(name)
+        team_id = self.index.get(key)
+        if team_id is None:
+            if key in self.fuzzy_cache:
+                self.fuzzy_cache.move_to_end(key)
+                team_id = self.fuzzy_cache[key]
+            else:
+                team_id = self._fuzzy_resolve(key)
+                self.fuzzy_cache[key] = team_id
+                if len(self.fuzzy_cache) > settings.team_fuzzy_cache_size:
+                    self.fuzzy_cache.popitem(last=False)
+        return None if team_id == _AMBIGUOUS else team_id
+    
+    def _fuzzy_resolve(self, key: str) -> Optional[int]:
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.trigram_index.get(gram, ()))
+        if not shared:
+            return None
+        
+        # Jaccard similarity between trigram sets
+        best_key, best_score = None, 0.0
+        for candidate, common in shared.items():
+            score = common / (len(grams) + self.key_trigram_counts[candidate] - common)
+            if score > best_score:
+                best_key, best_score = candidate, score
+        if best_score < self.fuzzy_threshold:
+            return None
+        return self.index[best_key]
+    
+    def key(self, name: str) -> Hashable:
+        """Stable cache key for a team: its id when known, otherwise the name"""
+        team_id = self.resolve(name) if self.teams else None
+        return name if team_id is None else team_id
+    
+    def get(self, team_id: int) -> Optional[Dict]:
+        return self.teams.get(team_id)
+
+
+_team_catalog = None
+
+def get_team_catalog() -> TeamCatalog:
+    """Shared catalog, filled as competitions are loaded"""
+    global _team_catalog
+    if _team_catalog is None:
+        _team_catalog = TeamCatalog()
+    return _team_catalog
\ No newline at end of file
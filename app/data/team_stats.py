@@ -1,24 +1,137 @@
-from typing import Dict, List, Optional
+from typing import Dict, Hashable, List, Tuple
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 from .football_api_client import FootballAPIClient
+from .team_catalog import get_team_catalog
+from .synthetic import team_recent_matches
+from .feature_store import TEAM_FEATURE_KEYS, SharedFeatureTable
+from ..core.cache import RecordCodec, TwoLevelCache, get_redis
+from ..core.config import settings
+from ..core.metrics import record_cache
+
+# float32, like the shared features table
+TEAM_FEATURES_CODEC = RecordCodec(TEAM_FEATURE_KEYS, fmt='f')
+
 
 class TeamStatsService:
     def __init__(self):
         self.api_client = FootballAPIClient()
-        self.cache = {}
+        self.catalog = get_team_catalog()
+        # Keyed by team id where the catalog knows the team, so spellings
+        # of the same club share one entry; backed by Redis when configured
+        # so replicas compute each team's features once between them
+        self.features_cache = TwoLevelCache(
+            'team_features',
+            TEAM_FEATURES_CODEC,
+            client=get_redis(),
+            max_local=settings.cache_local_max_entries,
+            ttl_seconds=settings.team_features_cache_ttl_seconds
+        )
+        # Published features shared by every worker on the host, when configured
+        self.shared_features = (
+            SharedFeatureTable(settings.feature_store_path) if settings.feature_store_path else None
+        )
+    
+    @property
+    def cache(self) -> Dict:
+        """In-process team features, by catalog key"""
+        return self.features_cache.local
+    
+    @property
+    def features_version(self) -> str:
+        """Changes whenever cached or published features change, so anything
+        derived from them (e.g. pre-scored fixtures) can tell it is stale.
+        
+        "<cache generation>.<published table version>"; kept as separate
+        components so a bump of one can't be cancelled out by the other.
+        Each publish thus starts one background re-score of the precomputed
+        predictions; requests meanwhile use live inference.
+        """
+        store_version = 0
+        if self.shared_features is not None:
+            self.shared_features.refresh()
+            store_version = self.shared_features.version
+        return f"{self.features_cache.generation}.{store_version}"
+    
+    async def clear_cache(self):
+        """Drop cached team features on every replica sharing the Redis cache,
+        so they are recomputed on next use"""
+        await self.features_cache.invalidate()
     
     async def get_team_features(self, team_name: str) -> Dict:
         """Generate comprehensive features for a team"""
-        if team_name in self.cache:
-            return self.cache[team_name]
+        return (await self.get_many_team_features([team_name]))[0]
+    
+    async def get_many_team_features(self, team_names: List[str]) -> List[Dict]:
+        """Features for several teams, fetching all cache misses from Redis in one round trip"""
+        keys = [self.catalog.key(name) for name in team_names]
+        rows, found = self._lookup_shared(keys)
+        features = [
+            {'team': name, **dict(zip(TEAM_FEATURE_KEYS, row.tolist()))} if hit else None
+            for name, row, hit in zip(team_names, rows, found)
+        ]
+        
+        pending = np.flatnonzero(~found)
+        computed = await self._get_cached_features(
+            [team_names[i] for i in pending], [keys[i] for i in pending]
+        )
+        for i, team_features in zip(pending, computed):
+            features[i] = team_features
+        return features
+    
+    async def get_many_team_feature_rows(self, team_names: List[str]) -> np.ndarray:
+        """(n_teams, len(TEAM_FEATURE_KEYS)) features for several teams.
         
-        # Get recent matches (last 10 games)
-        recent_matches = await self._get_recent_matches(team_name, limit=10)
+        Published features are read as array rows in one indexing call;
+        only teams missing from the shared table go through the caches.
+        """
+        keys = [self.catalog.key(name) for name in team_names]
+        rows, found = self._lookup_shared(keys)
+        rows = rows.astype(np.float64)
         
-        # Calculate various statistics
-        features = {
+        pending = np.flatnonzero(~found)
+        if pending.size:
+            computed = await self._get_cached_features(
+                [team_names[i] for i in pending], [keys[i] for i in pending]
+            )
+            rows[pending] = [[f.get(k, 0) for k in TEAM_FEATURE_KEYS] for f in computed]
+        return rows
+    
+    def _lookup_shared(self, keys: List[Hashable]) -> Tuple[np.ndarray, np.ndarray]:
+        """(rows, found) from the published features table, if there is one"""
+        if self.shared_features is None:
+            rows = np.zeros((len(keys), len(TEAM_FEATURE_KEYS)), dtype=np.float32)
+            return rows, np.zeros(len(keys), dtype=bool)
+        rows, found = self.shared_features.lookup_rows(keys)
+        hits = int(found.sum())
+        record_cache('shared_features', hit=True, count=hits)
+        record_cache('shared_features', hit=False, count=len(keys) - hits)
+        return rows, found
+    
+    async def _get_cached_features(self, team_names: List[str], keys: List[Hashable]) -> List[Dict]:
+        """Features from the two-level cache, computing and caching the misses"""
+        cached = await self.features_cache.get_many(keys)
+        computed = {}
+        features = []
+        for name, key in zip(team_names, keys):
+            if key in cached:
+                # Entries are shared by every spelling of the team (and those
+                # from Redis carry only the numeric features), so the name is
+                # always the caller's
+                features.append({**cached[key], 'team': name})
+                continue
+            if key not in computed:
+                # Get recent matches (last 10 games)
+                recent_matches = await self._get_recent_matches(name, limit=10)
+                computed[key] = self.compute_features(recent_matches, name)
+            features.append({**computed[key], 'team': name})
+        
+        await self.features_cache.set_many(computed)
+        return features
+    
+    def compute_features(self, recent_matches: pd.DataFrame, team_name: str) -> Dict:
+        """Calculate various statistics from a team's recent matches"""
+        return {
             'team': team_name,
             'avg_goals_scored': self._calculate_avg_goals_scored(recent_matches, team_name),
             'avg_goals_conceded': self._calculate_avg_goals_conceded(recent_matches, team_name),
@@ -32,26 +145,11 @@ class TeamStatsService:
             'loss_rate': self._calculate_loss_rate(recent_matches, team_name),
             'goals_per_match_trend': self._calculate_goals_trend(recent_matches, team_name),
         }
-        
-        self.cache[team_name] = features
-        return features
     
     async def _get_recent_matches(self, team_name: str, limit: int = 10) -> pd.DataFrame:
         """Mock function - in real implementation, query database or API"""
         # This is a placeholder - replace with actual data fetching
-        mock_data = []
-        for i in range(limit):
-            is_home = i % 2 == 0
-            mock_match = {
-                'date': datetime.now() - timedelta(days=i*7),
-                'home_team': team_name if is_home else f'Opponent_{i}',
-                'away_team': f'Opponent_{i}' if is_home else team_name,
-                'home_score': np.random.randint(0, 4),
-                'away_score': np.random.randint(0, 4),
-            }
-            mock_data.append(mock_match)
-        
-        return pd.DataFrame(mock_data)
+        return team_recent_matches(team_name, limit)
     
     def _calculate_avg_goals_scored(self, matches: pd.DataFrame, team: str) -> float:
         """Calculate average goals scored by team"""
@@ -198,8 +296,8 @@ class TeamStatsService:
         trend = np.polyfit(x, goals_per_match, 1)[0]
         return trend
     
-    def get_head_to_head(self, team1: str, team2: str) -> Dict:
-        """Get head-to-head statistics between two teams"""
+    def get_head_to_head(self, team1: Hashable, team2: Hashable) -> Dict:
+        """Get head-to-head statistics between two teams, by catalog key"""
         # Mock implementation - replace with actual data
         return {
             'home_wins': 3,
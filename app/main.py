@@ -1,21 +1,103 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
 from fastapi import Request
 import uvicorn
+import asyncio
+import time
+from contextlib import asynccontextmanager
 from .routers import predictions, data
 from .core.config import settings
+from .core.metrics import REQUEST_LATENCY, REQUESTS_IN_FLIGHT, registry
+from .services.prediction_service import get_prediction_service, prescore_periodically
+from .services.warmup import readiness, warm_up
+from .data.ratings import get_team_ratings
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Set to "worker" by app.server on forked workers: the parent already
+    # warmed up and pre-scored, and ratings updates are snapshotted as
+    # they're ingested, so workers skip that. Each worker serves from its
+    # own copy of the fixture table, so every one keeps pre-scoring on
+    # schedule, starting one interval after the parent's pass
+    prefork_role = getattr(app.state, "prefork_role", None)
+    service = get_prediction_service()
+    await service.start_cache_sync()
+    background_tasks = []
+    if prefork_role is None:
+        background_tasks.append(asyncio.create_task(warm_up(service)))
+    prescoring = settings.prescore_competitions or settings.matchup_matrix_competitions
+    if prescoring:
+        background_tasks.append(asyncio.create_task(
+            prescore_periodically(service, skip_first=prefork_role is not None)
+        ))
+    yield
+    for task in background_tasks:
+        task.cancel()
+    await service.stop_cache_sync()
+    
+    ratings = get_team_ratings()
+    if prefork_role is None and ratings.has_unsaved_updates:
+        ratings.save_snapshot()
 
 app = FastAPI(
     title="Football Score Prediction API",
     description="ML-powered football score prediction service",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    with REQUESTS_IN_FLIGHT.track():
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - started,
+                method=request.method,
+                route=_route_template(request),
+                status=status
+            )
+
+def _route_template(request: Request) -> str:
+    """Matched route template (e.g. /api/v1/leagues/{league_id}/simulation).
+    
+    Used as the metrics label so path parameters don't explode cardinality.
+    Routes from included routers only know their own path, so the router
+    prefix is taken from the front of the request path.
+    """
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    segments = route.path.count("/")
+    prefix = request.url.path.rsplit("/", segments)[0] if segments else ""
+    return prefix + route.path
+
 app.include_router(predictions.router, prefix="/api/v1")
 app.include_router(data.router, prefix="/api/v1")
 
+if settings.debug or settings.profiling_enabled:
+    from .core.profiler import profiler_sessions
+    from .routers import debug
+    
+    app.include_router(debug.router)
+    
+    @app.middleware("http")
+    async def profile_matching_requests(request: Request, call_next):
+        if not profiler_sessions.claim(request.url.path):
+            return await call_next(request)
+        profiler_sessions.request_started()
+        try:
+            return await call_next(request)
+        finally:
+            profiler_sessions.request_finished()
+
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
@@ -27,5 +109,17 @@ async def read_root(request: Request):
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Succeeds once the model is loaded and warmed up; liveness stays on /health"""
+    if not readiness.ready:
+        return JSONResponse(readiness.status(), status_code=503)
+    return readiness.status()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(registry.render(), media_type=registry.content_type)
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,229 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from ..core.config import settings
+from .model_manager import FootballModel, frame_to_arrays
+from .scoreline import outcome_probabilities, scoreline_matrix
+
+
+def _actual_outcomes(home_score: np.ndarray, away_score: np.ndarray) -> np.ndarray:
+    """Outcome index per match: 0 home win, 1 draw, 2 away win"""
+    return np.where(home_score > away_score, 0, np.where(home_score == away_score, 1, 2))
+
+
+def _backtest_season(matches: pd.DataFrame, season, refit_every: int, estimator) -> Dict:
+    """Walk forward through one season, refitting only on matches played earlier.
+    
+    Runs in a worker process, so it only receives plain data and an unfitted
+    estimator, and returns plain arrays.
+    """
+    from sklearn.base import clone
+    
+    matches = matches.sort_values('date')
+    season_mask = (matches['season'] == season).to_numpy()
+    season_matches = matches[season_mask]
+    
+    predictions = []
+    model = None
+    matchdays = sorted(season_matches['matchday'].unique())
+    
+    for i, matchday in enumerate(matchdays):
+        fixtures = season_matches[season_matches['matchday'] == matchday]
+        kickoff = fixtures['date'].min()
+        
+        if model is None or i % refit_every == 0:
+            history = matches[matches['date'] < kickoff]
+            if len(history) < settings.backtest_min_train_matches:
+                continue
+            X_train, y_train = frame_to_arrays(history)
+            model = clone(estimator)
+            model.fit(X_train, y_train)
+        
+        X, y = frame_to_arrays(fixtures)
+        xg = np.clip(model.predict(X), 0, None).reshape(len(X), -1)
+        predictions.append(np.column_stack([xg[:, :2], y]))
+    
+    if not predictions:
+        return {'season': season, 'rows': np.empty((0, 4))}
+    return {'season': season, 'rows': np.vstack(predictions)}
+
+
+def calibration_table(probs: np.ndarray, outcomes: np.ndarray, n_bins: int = 10) -> List[Dict]:
+    """Reliability bins over all three outcome probabilities"""
+    observed = np.eye(3)[outcomes].ravel()
+    predicted = probs.ravel()
+    bins = np.minimum((predicted * n_bins).astype(int), n_bins - 1)
+    
+    counts = np.bincount(bins, minlength=n_bins)
+    predicted_sum = np.bincount(bins, weights=predicted, minlength=n_bins)
+    observed_sum = np.bincount(bins, weights=observed, minlength=n_bins)
+    
+    return [
+        {
+            'bin': b / n_bins,
+            'count': int(counts[b]),
+            'mean_predicted': float(predicted_sum[b] / counts[b]),
+            'observed_frequency': float(observed_sum[b] / counts[b])
+        }
+        for b in range(n_bins) if counts[b] > 0
+    ]
+
+
+def score_predictions(rows: np.ndarray) -> Dict:
+    """MAE, Brier score, log loss and calibration for [home_xg, away_xg, home, away] rows"""
+    home_xg, away_xg, home_score, away_score = rows.T
+    probs = outcome_probabilities(scoreline_matrix(
+        home_xg, away_xg,
+        max_goals=settings.scoreline_max_goals,
+        rho=settings.dixon_coles_rho
+    ))
+    outcomes = _actual_outcomes(home_score, away_score)
+    observed = np.eye(3)[outcomes]
+    
+    return {
+        'matches': int(len(rows)),
+        'mae': float(np.mean(np.abs(rows[:, :2] - rows[:, 2:]))),
+        'brier_score': float(np.mean(np.sum((probs - observed) ** 2, axis=1))),
+        'log_loss': float(-np.mean(np.log(
+            np.clip(probs[np.arange(len(rows)), outcomes], 1e-15, 1)
+        ))),
+        'outcome_accuracy': float(np.mean(probs.argmax(axis=1) == outcomes)),
+        'calibration': calibration_table(probs, outcomes)
+    }
+
+
+class Backtester:
+    """Walk-forward backtests replayed matchday by matchday.
+    
+    Each (league, season) pair is replayed in its own worker process. Within
+    a season the model is refit every ``refit_every`` matchdays on all
+    matches that kicked off before the matchday being predicted.
+    """
+    
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        refit_every: Optional[int] = None,
+        estimator=None
+    ):
+        from sklearn.base import clone
+        
+        self.max_workers = max_workers or settings.backtest_workers
+        self.refit_every = refit_every or settings.backtest_refit_every
+        # Same configuration as the model being reported on (by default a
+        # fresh serving model), refit from scratch in every worker
+        if estimator is None:
+            estimator = FootballModel("xgboost").model
+        # Single-threaded: parallelism comes from the process pool
+        self.estimator = clone(estimator).set_params(n_jobs=1)
+    
+    def run(self, matches: pd.DataFrame, seasons: Optional[List] = None) -> Dict:
+        """Backtest the given seasons (default: every season after the first)"""
+        matches = matches.dropna(subset=['home_score', 'away_score']).copy()
+        matches['date'] = pd.to_datetime(matches['date'], utc=True)
+        if 'competition' not in matches.columns:
+            matches['competition'] = 'all'
+        
+        tasks = []
+        for league, league_matches in matches.groupby('competition'):
+            league_seasons = sorted(league_matches['season'].unique())
+            for season in league_seasons[1:] if seasons is None else seasons:
+                if season in league_seasons:
+                    history = league_matches[league_matches['season'] <= season]
+                    tasks.append((league, history, season))
+        
+        if self.max_workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [
+                    pool.submit(_backtest_season, history, season, self.refit_every, self.estimator)
+                    for _, history, season in tasks
+                ]
+                season_results = [f.result() for f in futures]
+        else:
+            season_results = [
+                _backtest_season(history, season, self.refit_every, self.estimator)
+                for _, history, season in tasks
+            ]
+        
+        rows_by_league: Dict[str, List[np.ndarray]] = {}
+        for (league, _, _), result in zip(tasks, season_results):
+            rows_by_league.setdefault(league, []).append(result['rows'])
+        
+        leagues = {}
+        all_rows = []
+        for league, league_rows in rows_by_league.items():
+            rows = np.vstack(league_rows)
+            if len(rows):
+                leagues[str(league)] = score_predictions(rows)
+                all_rows.append(rows)
+        
+        return {
+            'generated_at': datetime.utcnow().isoformat(),
+            'seasons': sorted({str(season) for _, _, season in tasks}),
+            'refit_every': self.refit_every,
+            'overall': score_predictions(np.vstack(all_rows)) if all_rows else None,
+            'leagues': leagues
+        }
+
+
+class BacktestCache:
+    """Backtest results per model version, in memory and as JSON next to the models"""
+    
+    def __init__(self, model_path: Optional[str] = None):
+        self.directory = os.path.join(model_path or settings.model_path, "backtests")
+        self.results: Dict[str, Dict] = {}
+    
+    def _filepath(self, version: str) -> str:
+        return os.path.join(self.directory, f"backtest_{version}.json")
+    
+    def get(self, version: str) -> Optional[Dict]:
+        if version not in self.results:
+            try:
+                with open(self._filepath(version)) as f:
+                    self.results[version] = json.load(f)
+            except (OSError, ValueError):
+                return None
+        return self.results[version]
+    
+    def set(self, version: str, result: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._filepath(version), 'w') as f:
+            json.dump(result, f)
+        self.results[version] = result
+
+
+backtest_cache = BacktestCache()
+
+
+if __name__ == "__main__":
+    import argparse
+    from .model_manager import ModelManager
+    
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the active model")
+    parser.add_argument("matches", nargs="?", help="CSV or Parquet file of historical matches")
+    parser.add_argument(
+        "--synthetic", type=int, metavar="N", help="backtest N generated matches instead"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    
+    if args.synthetic:
+        from ..data.feature_history import build_point_in_time_features
+        from ..data.synthetic import synthetic_matches
+        history = build_point_in_time_features(synthetic_matches(args.synthetic, seed=args.seed))
+    elif args.matches is None:
+        parser.error("give a matches file or --synthetic N")
+    elif args.matches.endswith(".parquet"):
+        history = pd.read_parquet(args.matches)
+    else:
+        history = pd.read_csv(args.matches)
+    
+    model = ModelManager().get_current_model()
+    result = Backtester(max_workers=args.workers, estimator=model.model).run(history)
+    backtest_cache.set(model.version, result)
+    print(json.dumps({k: v for k, v in result.items() if k != 'leagues'}, indent=2))
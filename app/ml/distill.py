@@ -0,0 +1,129 @@
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from ..core.config import settings
+from .backtest import score_predictions
+from .model_manager import FootballModel
+
+
+def truncated_candidate(teacher: FootballModel, n_trees: int) -> FootballModel:
+    """The teacher's first ``n_trees`` boosting rounds as a standalone model"""
+    booster = teacher.model.get_booster()[:n_trees]
+    candidate = FootballModel("xgboost")
+    candidate.model.load_model(bytearray(booster.save_raw()))
+    candidate.trained_at = datetime.utcnow()
+    return candidate
+
+
+def student_candidate(
+    teacher: FootballModel,
+    X: np.ndarray,
+    max_depth: int,
+    n_estimators: int
+) -> FootballModel:
+    """A smaller model fitted to the teacher's predictions rather than the raw scores"""
+    candidate = FootballModel("xgboost")
+    candidate.model.set_params(max_depth=max_depth, n_estimators=n_estimators)
+    candidate.model.fit(X, teacher.predict(X))
+    candidate.trained_at = datetime.utcnow()
+    return candidate
+
+
+def candidate_builders(
+    teacher_trees: int,
+    tree_counts: List[int],
+    student_depths: List[int]
+) -> Dict[str, Callable[[FootballModel, np.ndarray], FootballModel]]:
+    """Each candidate's name and how to build it from (teacher, X_train)"""
+    builders = {'teacher': lambda teacher, X: teacher}
+    for n_trees in tree_counts:
+        if n_trees < teacher_trees:
+            builders[f'truncated_{n_trees}'] = (
+                lambda teacher, X, n_trees=n_trees: truncated_candidate(teacher, n_trees)
+            )
+    for depth in student_depths:
+        for n_trees in tree_counts:
+            builders[f'student_d{depth}_{n_trees}'] = (
+                lambda teacher, X, depth=depth, n_trees=n_trees:
+                    student_candidate(teacher, X, depth, n_trees)
+            )
+    return builders
+
+
+def measure_latency(model: FootballModel, X: np.ndarray, repeats: int = 200) -> Dict[str, float]:
+    """p50/p99 latency of single-row predictions, in milliseconds"""
+    rows = X[np.arange(repeats) % len(X)]
+    model.predict(rows[:1])  # warm-up (e.g. flat backend compilation)
+    
+    timings = np.empty(repeats)
+    for i in range(repeats):
+        started = time.perf_counter()
+        model.predict(rows[i:i + 1])
+        timings[i] = (time.perf_counter() - started) * 1000
+    return {
+        'p50_ms': float(np.percentile(timings, 50)),
+        'p99_ms': float(np.percentile(timings, 99))
+    }
+
+
+def evaluate_candidate(model: FootballModel, X_eval: np.ndarray, y_eval: np.ndarray) -> Dict:
+    """Backtest-style metrics of a model on held-out matches"""
+    goals = model.predict_goals(X_eval)
+    metrics = score_predictions(np.column_stack([goals, y_eval]))
+    metrics.pop('calibration')
+    return metrics
+
+
+def compress_model(
+    teacher: FootballModel,
+    X_train: np.ndarray,
+    X_eval: np.ndarray,
+    y_eval: np.ndarray,
+    latency_budget_ms: Optional[float] = None,
+    tree_counts: Optional[List[int]] = None,
+    student_depths: Optional[List[int]] = None
+) -> Dict:
+    """Score smaller candidates of ``teacher`` for accuracy and latency.
+    
+    Candidates are the teacher itself, truncations to fewer trees and
+    shallower students distilled from the teacher's predictions. The best
+    candidate is the most accurate (lowest MAE) whose p99 single-row
+    latency fits the budget. ``teacher`` must not have been trained on
+    ``X_eval``. ``build`` in the result rebuilds the best candidate from
+    another teacher.
+    """
+    latency_budget_ms = latency_budget_ms or settings.latency_budget_ms
+    tree_counts = tree_counts or settings.distill_tree_counts
+    student_depths = student_depths or settings.distill_student_depths
+    
+    builders = candidate_builders(teacher.num_trees(), tree_counts, student_depths)
+    candidates = {name: build(teacher, X_train) for name, build in builders.items()}
+    
+    teacher_mae = None
+    report = []
+    for name, candidate in candidates.items():
+        metrics = evaluate_candidate(candidate, X_eval, y_eval)
+        if teacher_mae is None:
+            teacher_mae = metrics['mae']
+        latency = measure_latency(candidate, X_eval)
+        report.append({
+            'name': name,
+            'trees': candidate.num_trees(),
+            'max_depth': candidate.model.get_params()['max_depth'],
+            **metrics,
+            'mae_increase': metrics['mae'] - teacher_mae,
+            **latency,
+            'within_budget': latency['p99_ms'] <= latency_budget_ms
+        })
+    
+    eligible = [row for row in report if row['within_budget']]
+    best = min(eligible, key=lambda row: row['mae']) if eligible else None
+    
+    return {
+        'latency_budget_ms': latency_budget_ms,
+        'candidates': report,
+        'best': best['name'] if best else None,
+        'model': candidates[best['name']] if best else None,
+        'build': builders[best['name']] if best else None
+    }
\ No newline at end of file
@@ -0,0 +1,184 @@
+import json
+from typing import Optional
+import numpy as np
+import xgboost as xgb
+
+SUPPORTED_OBJECTIVES = {'reg:squarederror', 'reg:absoluteerror', 'reg:pseudohubererror'}
+
+
+class FlatTreeModel:
+    """A gradient-boosted tree ensemble compiled to flat NumPy arrays.
+    
+    Every tree is padded to the same node count so that a batch can be
+    evaluated for all trees at once: each step gathers the split feature
+    and threshold of the current node for every (row, tree) pair and moves
+    to a child. Leaves point at themselves, so running ``max_depth`` steps
+    lands every pair on its leaf. This skips the DMatrix construction that
+    dominates XGBoost's latency for small batches.
+    """
+    
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        default_left: np.ndarray,
+        value: np.ndarray,
+        tree_target: np.ndarray,
+        base_score: np.ndarray,
+        max_depth: int
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.tree_target = tree_target
+        self.base_score = base_score
+        self.max_depth = max_depth
+        self.n_trees = len(feature)
+        self.n_targets = len(base_score)
+        # (trees, targets) one-hot used to sum leaf values per target
+        self._target_onehot = np.zeros((self.n_trees, self.n_targets), dtype=np.float64)
+        self._target_onehot[np.arange(self.n_trees), tree_target] = 1.0
+        
+        # Raveled copies with child pointers rebased to global node ids, so
+        # traversal is a chain of 1-D takes
+        max_nodes = feature.shape[1]
+        self._tree_offset = (np.arange(self.n_trees, dtype=np.int64) * max_nodes)[None, :]
+        self._feature = feature.ravel().astype(np.int64)
+        self._threshold = threshold.ravel()
+        self._left = (left + self._tree_offset.T).ravel()
+        self._right = (right + self._tree_offset.T).ravel()
+        self._default_left = default_left.ravel()
+        self._value = value.ravel()
+    
+    @classmethod
+    def from_booster(cls, booster: xgb.Booster):
+        """Compile a numeric, single-leaf-value gbtree booster"""
+        model = json.loads(booster.save_raw("json"))
+        learner = model['learner']
+        
+        objective = learner['objective']['name']
+        if objective not in SUPPORTED_OBJECTIVES:
+            raise ValueError(f"Unsupported objective for flat inference: {objective}")
+        if learner['gradient_booster']['name'] != 'gbtree':
+            raise ValueError("Only gbtree boosters can be compiled")
+        
+        trees = learner['gradient_booster']['model']['trees']
+        if any(int(t['tree_param'].get('size_leaf_vector', 1)) > 1 for t in trees):
+            raise ValueError("Vector-leaf (multi_output_tree) models can't be compiled")
+        if any(t.get('categories_nodes') for t in trees):
+            raise ValueError("Categorical splits can't be compiled")
+        
+        n_trees = len(trees)
+        max_nodes = max(len(t['left_children']) for t in trees)
+        feature = np.zeros((n_trees, max_nodes), dtype=np.int32)
+        threshold = np.zeros((n_trees, max_nodes), dtype=np.float32)
+        left = np.zeros((n_trees, max_nodes), dtype=np.int32)
+        right = np.zeros((n_trees, max_nodes), dtype=np.int32)
+        default_left = np.zeros((n_trees, max_nodes), dtype=bool)
+        value = np.zeros((n_trees, max_nodes), dtype=np.float32)
+        max_depth = 0
+        
+        for i, tree in enumerate(trees):
+            n_nodes = len(tree['left_children'])
+            nodes = np.arange(n_nodes)
+            tree_left = np.array(tree['left_children'], dtype=np.int32)
+            is_leaf = tree_left == -1
+            
+            feature[i, :n_nodes] = tree['split_indices']
+            threshold[i, :n_nodes] = tree['split_conditions']
+            # Leaves loop back to themselves; their split condition is the leaf value
+            left[i, :n_nodes] = np.where(is_leaf, nodes, tree_left)
+            right[i, :n_nodes] = np.where(is_leaf, nodes, tree['right_children'])
+            default_left[i, :n_nodes] = np.array(tree['default_left'], dtype=bool)
+            value[i, :n_nodes] = np.where(is_leaf, tree['split_conditions'], 0)
+            max_depth = max(max_depth, _tree_depth(tree_left, np.array(tree['right_children'])))
+        
+        base_score = np.array(
+            [float(v) for v in learner['learner_model_param']['base_score'].strip('[]').split(',')],
+            dtype=np.float64
+        )
+        tree_target = np.array(learner['gradient_booster']['model']['tree_info'], dtype=np.int64)
+        
+        return cls(
+            feature, threshold, left, right, default_left, value, tree_target, base_score, max_depth
+        )
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predictions with the same shape as ``XGBRegressor.predict``"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        x_flat = X.ravel()
+        row_offset = (np.arange(n_rows, dtype=np.int64) * n_features)[:, None]
+        
+        # Global node ids into the raveled (trees * max_nodes) arrays
+        node = np.broadcast_to(self._tree_offset, (n_rows, self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            x = x_flat.take(row_offset + self._feature.take(node))
+            go_left = np.where(
+                np.isnan(x), self._default_left.take(node), x < self._threshold.take(node)
+            )
+            node = np.where(go_left, self._left.take(node), self._right.take(node))
+        
+        output = self._value.take(node) @ self._target_onehot + self.base_score
+        if self.n_targets == 1:
+            return output[:, 0]
+        return output
+    
+    def split_probe_rows(self, n_features: int, seed: int = 0) -> np.ndarray:
+        """Rows that reach both sides of every split, and the missing branch.
+        
+        Each feature's column cycles through its split thresholds and the
+        float32 value just below each, so verification covers the ranges
+        the trees actually split on (e.g. Elo ratings around 1500) rather
+        than wherever random rows happen to fall.
+        """
+        nodes = np.arange(self.feature.shape[1])[None, :]
+        # Leaves point at themselves; padding nodes point at the root
+        is_split = (self.left != nodes) & (self.right != 0)
+        columns = []
+        for f in range(n_features):
+            thresholds = np.unique(self.threshold[is_split & (self.feature == f)])
+            below = np.nextafter(thresholds, np.float32(-np.inf))
+            columns.append(np.concatenate([thresholds, below, [np.nan]]).astype(np.float32))
+        
+        rng = np.random.default_rng(seed)
+        n_rows = max(len(values) for values in columns)
+        rows = np.empty((n_rows, n_features), dtype=np.float32)
+        for f, values in enumerate(columns):
+            # Shuffled per column so rows mix different splits of each feature
+            rows[:, f] = rng.permutation(np.resize(values, n_rows))
+        return rows
+    
+    def verify(self, booster: xgb.Booster, X: np.ndarray, atol: float = 1e-4) -> bool:
+        """Check the compiled model reproduces Booster.predict on X"""
+        expected = booster.predict(xgb.DMatrix(X))
+        return bool(np.allclose(self.predict(X), expected, atol=atol))
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth = np.zeros(len(left), dtype=np.int32)
+    # XGBoost numbers children after their parents
+    for node in range(len(left)):
+        if left[node] != -1:
+            depth[left[node]] = depth[node] + 1
+            depth[right[node]] = depth[node] + 1
+    return int(depth.max())
+
+
+def compile_booster(
+    booster: xgb.Booster,
+    verify_rows: Optional[np.ndarray] = None
+) -> Optional[FlatTreeModel]:
+    """Compile a booster, or None if it can't be compiled or fails verification"""
+    try:
+        flat_model = FlatTreeModel.from_booster(booster)
+    except ValueError:
+        return None
+    if verify_rows is not None and not flat_model.verify(booster, verify_rows):
+        return None
+    return flat_model
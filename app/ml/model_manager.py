@@ -1,14 +1,80 @@
+import copy
 import joblib
 import os
 import numpy as np
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
 import xgboost as xgb
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, mean_absolute_error
 import pandas as pd
+from ..core.cache import publish_invalidation
 from ..core.config import settings
+from ..data.synthetic import training_arrays
+
+# Cache namespace of live predictions; its invalidations carry model versions
+PREDICTIONS_CACHE = 'predictions'
+
+# Training feature columns, with the value used when a column is missing.
+# Mock feature set - replace with actual feature engineering
+TRAINING_FEATURES = [
+    ('home_team_avg_goals', 1.5),
+    ('away_team_avg_goals', 1.2),
+    ('home_advantage', 0.3),
+    ('head_to_head_home_wins', 0.5),
+    ('recent_form_home', 0.6),
+    ('recent_form_away', 0.4),
+    ('days_since_last_match', 7),
+    ('league_competitiveness', 0.7),
+    ('season_progress', 0.5),
+    ('weather_factor', 0.5),
+]
+
+# Pre-match Elo ratings, used when settings.use_rating_features is on
+RATING_TRAINING_FEATURES = [
+    ('home_elo', 1500.0),
+    ('away_elo', 1500.0),
+    ('elo_home_win_expectancy', 0.5),
+]
+
+TRAINING_TARGETS = ['home_score', 'away_score']
+
+
+def training_features() -> list:
+    """Feature columns the model is trained on under the current settings"""
+    if settings.use_rating_features:
+        return TRAINING_FEATURES + RATING_TRAINING_FEATURES
+    return TRAINING_FEATURES
+
+
+def frame_to_arrays(data: pd.DataFrame) -> tuple:
+    """Extract the training feature matrix and [home, away] targets from match rows"""
+    features = training_features()
+    n_rows = len(data)
+    X = np.empty((n_rows, len(features)), dtype=np.float64)
+    
+    for i, (column, default) in enumerate(features):
+        if column in data.columns:
+            X[:, i] = data[column].to_numpy(dtype=np.float64)
+        else:
+            X[:, i] = default
+    
+    y = data[TRAINING_TARGETS].to_numpy()
+    return X, y
+
+
+def expected_goals(prediction: np.ndarray) -> np.ndarray:
+    """Normalise raw model output to an (n, 2) array of [home, away] goals.
+    
+    Two-target models already return that shape. Older single-target models
+    predict total goals, which are split 60/40 in favour of the home side.
+    """
+    prediction = np.asarray(prediction, dtype=np.float64)
+    if prediction.ndim == 2 and prediction.shape[1] >= 2:
+        goals = prediction[:, :2]
+    else:
+        total_goals = prediction.reshape(-1, 1)
+        goals = np.hstack([total_goals * 0.6, total_goals * 0.4])
+    return np.clip(goals, 0, None)
+
 
 class FootballModel:
     def __init__(self, model_type: str = "xgboost"):
@@ -17,15 +83,22 @@ class FootballModel:
         self.version = "1.0.0"
         self.trained_at = None
         self.performance_metrics = {}
+        self._flat_model = None
+        self._flat_model_source = None
         
         if model_type == "xgboost":
+            # Home and away goals are fitted jointly when given 2-column targets;
+            # "multi_output_tree" grows one tree with vector leaves per round
             self.model = xgb.XGBRegressor(
                 n_estimators=100,
                 max_depth=6,
                 learning_rate=0.1,
-                random_state=42
+                random_state=42,
+                tree_method="hist",
+                multi_strategy=settings.model_multi_strategy
             )
         elif model_type == "random_forest":
+            from sklearn.ensemble import RandomForestRegressor
             self.model = RandomForestRegressor(
                 n_estimators=100,
                 max_depth=10,
@@ -34,6 +107,10 @@ class FootballModel:
     
     def train(self, X: np.ndarray, y: np.ndarray):
         """Train the model"""
+        # sklearn is only needed for training; serving never imports it
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import mean_squared_error, mean_absolute_error
+        
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42
         )
@@ -50,12 +127,109 @@ class FootballModel:
             'test_samples': len(X_test)
         }
     
+    def train_incremental(self, X: np.ndarray, y: np.ndarray, mode: str = "add", n_trees: int = 20):
+        """Continue training the existing booster on new data"""
+        from sklearn.metrics import mean_absolute_error
+        
+        if self.model_type != "xgboost":
+            raise ValueError("Incremental training is only supported for xgboost models")
+        
+        booster = self.model.get_booster()
+        dtrain = xgb.DMatrix(X, label=y)
+        
+        multi_strategy = self.model.get_params().get('multi_strategy')
+        if mode == "refresh" and multi_strategy == "multi_output_tree":
+            # XGBoost's refresh updater doesn't support vector-leaf trees yet
+            mode = "add"
+        
+        if mode == "refresh":
+            # Keep the tree structure, re-fit leaf values on the new data
+            params = {"process_type": "update", "updater": "refresh", "refresh_leaf": True}
+            num_rounds = booster.num_boosted_rounds()
+        elif mode == "add":
+            params = self.model.get_xgb_params()
+            num_rounds = n_trees
+        else:
+            raise ValueError(f"Unknown incremental mode: {mode}")
+        
+        booster = xgb.train(params, dtrain, num_boost_round=num_rounds, xgb_model=booster)
+        self.model.load_model(bytearray(booster.save_raw()))
+        self.trained_at = datetime.utcnow()
+        
+        y_pred = self.model.predict(X)
+        self.performance_metrics = {
+            **self.performance_metrics,
+            'incremental_mae': mean_absolute_error(y, y_pred),
+            'incremental_samples': len(X),
+            'train_samples': self.performance_metrics.get('train_samples', 0) + len(X)
+        }
+    
+    def num_trees(self) -> int:
+        """Number of boosting rounds in the underlying booster"""
+        if self.model_type != "xgboost":
+            return self.model.n_estimators
+        return self.model.get_booster().num_boosted_rounds()
+    
     def predict(self, X: np.ndarray) -> np.ndarray:
         """Make predictions"""
         if self.model is None:
             raise ValueError("Model not trained yet")
+        if (settings.inference_backend == "flat" and self.model_type == "xgboost"
+                and len(X) <= settings.flat_inference_max_batch):
+            flat_model = self.get_flat_model()
+            if flat_model is not None:
+                return flat_model.predict(X)
         return self.model.predict(X)
     
+    def get_flat_model(self):
+        """The booster compiled to flat arrays, rebuilt whenever the booster changes.
+        
+        Returns None (use XGBoost) if the booster can't be compiled or the
+        compiled model disagrees with Booster.predict on rows either side of
+        every split threshold.
+        """
+        from .flat_trees import compile_booster
+        
+        booster = self.model.get_booster()
+        if self._flat_model_source is not booster:
+            flat_model = compile_booster(booster)
+            if flat_model is not None:
+                verify_rows = flat_model.split_probe_rows(booster.num_features())
+                if not flat_model.verify(booster, verify_rows):
+                    flat_model = None
+            self._flat_model = flat_model
+            self._flat_model_source = booster
+        return self._flat_model
+    
+    @property
+    def can_explain(self) -> bool:
+        """Whether explain() can attribute this model's predictions"""
+        return (
+            self.model_type == "xgboost"
+            and self.model.get_params().get('multi_strategy') != "multi_output_tree"
+        )
+    
+    def explain(self, X: np.ndarray) -> np.ndarray:
+        """TreeSHAP feature contributions for every row of X.
+        
+        Returns (n_rows, n_targets, n_features + 1); the last column is the
+        bias term, and each row sums to the model's prediction.
+        """
+        if self.model_type != "xgboost":
+            raise ValueError("Feature attribution is only supported for xgboost models")
+        if self.model.get_params().get('multi_strategy') == "multi_output_tree":
+            raise ValueError("XGBoost can't attribute multi_output_tree models yet")
+        
+        contributions = self.model.get_booster().predict(xgb.DMatrix(X), pred_contribs=True)
+        if contributions.ndim == 2:
+            # Single-target (total goals) models
+            contributions = contributions[:, None, :]
+        return contributions
+    
+    def predict_goals(self, X: np.ndarray) -> np.ndarray:
+        """Expected [home, away] goals for every row of X in one model call"""
+        return expected_goals(self.predict(X))
+    
     def save(self, filepath: str):
         """Save model to disk"""
         model_data = {
@@ -77,6 +251,16 @@ class FootballModel:
         instance.trained_at = model_data['trained_at']
         instance.performance_metrics = model_data['performance_metrics']
         return instance
+    
+    @classmethod
+    def load_from(cls, other: "FootballModel"):
+        """Copy another model so it can be trained without touching the original"""
+        instance = cls(other.model_type)
+        instance.model = copy.deepcopy(other.model)
+        instance.version = other.version
+        instance.trained_at = other.trained_at
+        instance.performance_metrics = dict(other.performance_metrics)
+        return instance
 
 class ModelManager:
     def __init__(self):
@@ -103,23 +287,11 @@ class ModelManager:
         """Create a default model with synthetic training data"""
         model = FootballModel("xgboost")
         
-        # Generate synthetic training data
-        np.random.seed(42)
-        n_samples = 1000
-        n_features = 10
-        
-        # Mock features: team stats, form, etc.
-        X = np.random.random((n_samples, n_features))
+        # Generate synthetic training data: mock features, [home_score, away_score] targets
+        X, y = training_arrays(1000, len(training_features()), seed=42)
         
-        # Mock target: [home_score, away_score]
-        y = np.column_stack([
-            np.random.poisson(1.5, n_samples),  # home scores
-            np.random.poisson(1.2, n_samples)   # away scores
-        ])
-        
-        # Simple model that predicts sum of goals
-        y_simple = np.sum(y, axis=1)
-        model.model.fit(X, y_simple)
+        # Fit home and away goals jointly
+        model.model.fit(X, y)
         model.trained_at = datetime.utcnow()
         model.version = "1.0.0-default"
         
@@ -133,6 +305,104 @@ class ModelManager:
         # Create and train new model
         model = FootballModel("xgboost")
         model.train(X, y)
+        
+        return self.register_model(model)
+    
+    def update_model(self, training_data: pd.DataFrame) -> FootballModel:
+        """Warm-start the current model on matches played since it was trained.
+        
+        Falls back to a full retrain when the booster would grow past
+        ``incremental_max_trees`` or when the error on the new matches has
+        drifted past ``incremental_drift_ratio`` times the holdout MAE.
+        """
+        current = self.get_current_model()
+        if (current.model_type != "xgboost" or current.trained_at is None
+                or 'date' not in training_data.columns):
+            return self.train_new_model(training_data)
+        
+        match_dates = pd.to_datetime(training_data['date'], utc=True).dt.tz_localize(None)
+        new_matches = training_data[match_dates > current.trained_at]
+        if new_matches.empty:
+            return current
+        
+        X, y = self.prepare_training_data(new_matches)
+        
+        if current.num_trees() + settings.incremental_trees > settings.incremental_max_trees:
+            return self.train_new_model(training_data)
+        
+        # Models trained on a different target shape can't be warm-started
+        y_pred = current.predict(X)
+        if y_pred.shape != y.shape:
+            return self.train_new_model(training_data)
+        
+        from sklearn.metrics import mean_absolute_error
+        
+        baseline_mae = current.performance_metrics.get('mae')
+        drift_limit = baseline_mae * settings.incremental_drift_ratio if baseline_mae else None
+        if drift_limit and mean_absolute_error(y, y_pred) > drift_limit:
+            return self.train_new_model(training_data)
+        
+        model = FootballModel.load_from(current)
+        model.train_incremental(
+            X, y,
+            mode=settings.incremental_mode,
+            n_trees=settings.incremental_trees
+        )
+        
+        return self.register_model(model)
+    
+    def train_from_shards(self, shard_paths: List[str], external_memory: bool = False) -> tuple:
+        """Train a new model out-of-core from Parquet feature shards"""
+        from .shard_training import train_from_shards
+        
+        model, report = train_from_shards(
+            shard_paths,
+            external_memory=external_memory,
+            cache_dir=self.model_path
+        )
+        return self.register_model(model), report
+    
+    def compress_model(
+        self,
+        training_data: pd.DataFrame,
+        holdout_fraction: float = 0.2
+    ) -> Dict[str, Any]:
+        """Register the most accurate smaller variant of the current model that fits the budget.
+        
+        Candidates are scored on the most recent ``holdout_fraction`` of
+        matches (chronologically when a date column is present). The current
+        model may have been trained on those matches, so every candidate,
+        the teacher included, is derived from a copy of it refitted on the
+        earlier matches only; the winner is then rebuilt from the current
+        model. The current model stays active if it already fits or nothing
+        does.
+        """
+        from .distill import compress_model
+        
+        teacher = self.get_current_model()
+        if 'date' in training_data.columns:
+            training_data = training_data.sort_values('date', kind='stable')
+        X, y = self.prepare_training_data(training_data)
+        split = int(len(X) * (1 - holdout_fraction))
+        
+        holdout_teacher = FootballModel.load_from(teacher)
+        holdout_teacher.train(X[:split], y[:split])
+        result = compress_model(holdout_teacher, X[:split], X[split:], y[split:])
+        result.pop('model')
+        build = result.pop('build')
+        best = build(teacher, X) if build is not None else None
+        if best is not None and best is not teacher:
+            best.performance_metrics = {
+                **{k: v for k, v in next(
+                    row for row in result['candidates'] if row['name'] == result['best']
+                ).items() if k != 'name'},
+                'compressed_from': teacher.version
+            }
+            result['registered_version'] = self.register_model(best).version
+        return result
+    
+    def register_model(self, model: FootballModel) -> FootballModel:
+        """Version, save and activate a freshly trained model"""
         model.version = f"1.0.{int(datetime.utcnow().timestamp())}"
         
         # Save the model
@@ -144,6 +414,9 @@ class ModelManager:
         
         # Update current model
         self.current_model = model
+        # Registration usually runs in a training job, not a serving process:
+        # announce the version so serving replicas load it from model_path
+        publish_invalidation(PREDICTIONS_CACHE, note=model.version)
         
         return model
     
@@ -165,33 +438,14 @@ class ModelManager:
         
         return self.current_model
     
+    def build_training_frame(self, matches: pd.DataFrame) -> pd.DataFrame:
+        """Point-in-time training features for a raw match history, in one pass"""
+        from ..data.feature_history import build_point_in_time_features
+        return build_point_in_time_features(matches)
+    
     def prepare_training_data(self, data: pd.DataFrame) -> tuple:
         """Prepare training data from raw match data"""
-        # Mock implementation - replace with actual feature engineering
-        features = []
-        targets = []
-        
-        for _, row in data.iterrows():
-            # Mock feature extraction
-            feature_vector = [
-                row.get('home_team_avg_goals', 1.5),
-                row.get('away_team_avg_goals', 1.2),
-                row.get('home_advantage', 0.3),
-                row.get('head_to_head_home_wins', 0.5),
-                row.get('recent_form_home', 0.6),
-                row.get('recent_form_away', 0.4),
-                row.get('days_since_last_match', 7),
-                row.get('league_competitiveness', 0.7),
-                row.get('season_progress', 0.5),
-                row.get('weather_factor', 0.5)
-            ]
-            
-            target_vector = [row['home_score'], row['away_score']]
-            
-            features.append(feature_vector)
-            targets.append(target_vector)
-        
-        return np.array(features), np.array(targets)
+        return frame_to_arrays(data)
     
     def get_model_performance(self) -> Dict[str, Any]:
         """Get performance metrics of current model"""
@@ -0,0 +1,167 @@
+from collections import deque
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import numpy as np
+from ..core.config import settings
+from ..core.metrics import Gauge, registry
+from ..data.team_catalog import get_team_catalog
+from .scoreline import OUTCOMES
+
+
+def _outcome(home_score: int, away_score: int) -> int:
+    if home_score > away_score:
+        return 0
+    if home_score == away_score:
+        return 1
+    return 2
+
+
+class RunningMetrics:
+    """Accuracy counters updated in O(1) per settled prediction.
+    
+    Keeps lifetime sums plus a fixed-size window whose running sums are
+    adjusted as results enter and leave it.
+    """
+    
+    def __init__(self, window: int = 100):
+        self.count = 0
+        self.abs_error_sum = 0.0
+        self.brier_sum = 0.0
+        self.correct = 0
+        self.window = deque(maxlen=window)
+        self.window_abs_error_sum = 0.0
+        self.window_brier_sum = 0.0
+    
+    def update(self, abs_error: float, brier: float, correct: bool):
+        self.count += 1
+        self.abs_error_sum += abs_error
+        self.brier_sum += brier
+        self.correct += int(correct)
+        
+        if len(self.window) == self.window.maxlen:
+            old_error, old_brier = self.window[0]
+            self.window_abs_error_sum -= old_error
+            self.window_brier_sum -= old_brier
+        self.window.append((abs_error, brier))
+        self.window_abs_error_sum += abs_error
+        self.window_brier_sum += brier
+    
+    def to_dict(self) -> Dict:
+        if self.count == 0:
+            return {'matches': 0}
+        window_size = len(self.window)
+        return {
+            'matches': self.count,
+            'mae': self.abs_error_sum / self.count,
+            'brier_score': self.brier_sum / self.count,
+            'outcome_accuracy': self.correct / self.count,
+            'rolling_mae': self.window_abs_error_sum / window_size,
+            'rolling_brier_score': self.window_brier_sum / window_size,
+            'rolling_window': window_size
+        }
+
+
+class OnlineEvaluator:
+    """Joins logged predictions to results as they are ingested"""
+    
+    def __init__(self, window: int = 100, max_pending: int = 10000):
+        self.window = window
+        self.max_pending = max_pending
+        self.pending: Dict[Tuple, Dict] = {}
+        self.metrics: Dict[Tuple[str, str], RunningMetrics] = {}
+    
+    @staticmethod
+    def _key(home_team: str, away_team: str, match_date: datetime) -> Tuple:
+        # By catalog key, so a result settles a prediction made under another spelling
+        catalog = get_team_catalog()
+        return (catalog.key(home_team), catalog.key(away_team), match_date.date())
+    
+    def log_prediction(
+        self,
+        home_team: str,
+        away_team: str,
+        match_date: datetime,
+        home_xg: float,
+        away_xg: float,
+        probabilities: Dict,
+        model_version: str,
+        league: Optional[str] = None
+    ):
+        """Remember a prediction until its result arrives"""
+        if len(self.pending) >= self.max_pending:
+            # Drop the oldest unsettled prediction (dicts keep insertion order)
+            self.pending.pop(next(iter(self.pending)))
+        
+        self.pending[self._key(home_team, away_team, match_date)] = {
+            'xg': (home_xg, away_xg),
+            'probs': np.array([probabilities[o] for o in OUTCOMES]),
+            'model_version': model_version,
+            'league': league
+        }
+    
+    def record_result(
+        self,
+        home_team: str,
+        away_team: str,
+        match_date: datetime,
+        home_score: int,
+        away_score: int,
+        league: Optional[str] = None
+    ) -> bool:
+        """Settle the matching prediction; returns False if none was logged"""
+        prediction = self.pending.pop(self._key(home_team, away_team, match_date), None)
+        if prediction is None:
+            return False
+        
+        home_xg, away_xg = prediction['xg']
+        abs_error = (abs(home_xg - home_score) + abs(away_xg - away_score)) / 2
+        
+        actual = _outcome(home_score, away_score)
+        observed = np.zeros(3)
+        observed[actual] = 1.0
+        brier = float(np.sum((prediction['probs'] - observed) ** 2))
+        correct = int(np.argmax(prediction['probs'])) == actual
+        
+        key = (league or prediction['league'] or 'unknown', prediction['model_version'])
+        if key not in self.metrics:
+            self.metrics[key] = RunningMetrics(self.window)
+        self.metrics[key].update(abs_error, brier, correct)
+        return True
+    
+    def summary(self, model_version: Optional[str] = None) -> Dict:
+        """Running metrics by league and model version"""
+        leagues: Dict[str, Dict] = {}
+        for (league, version), metrics in self.metrics.items():
+            if model_version is None or version == model_version:
+                leagues.setdefault(league, {})[version] = metrics.to_dict()
+        return {
+            'pending_predictions': len(self.pending),
+            'leagues': leagues
+        }
+
+
+online_evaluator = OnlineEvaluator(window=settings.online_eval_window)
+
+
+def _live_metric(name: str) -> Dict[Tuple[str, str], float]:
+    return {
+        (league, version): metrics.to_dict()[name]
+        for (league, version), metrics in online_evaluator.metrics.items()
+        if metrics.count
+    }
+
+
+for _name, _documentation in [
+    ('matches', 'Settled live predictions'),
+    ('rolling_mae', 'Rolling mean absolute goal error of live predictions'),
+    ('rolling_brier_score', 'Rolling Brier score of live outcome probabilities'),
+    ('outcome_accuracy', 'Share of live predictions with the right outcome'),
+]:
+    registry.register(Gauge(
+        f'online_eval_{_name}', _documentation, ('league', 'model_version'),
+        collect=lambda _name=_name: _live_metric(_name)
+    ))
+registry.register(Gauge(
+    'online_eval_pending_predictions', 'Logged predictions awaiting a result',
+    collect=lambda: {(): len(online_evaluator.pending)}
+))
\ No newline at end of file
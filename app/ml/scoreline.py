@@ -0,0 +1,82 @@
+from typing import Dict, Optional
+import numpy as np
+
+OUTCOMES = ['home_win', 'draw', 'away_win']
+
+
+def poisson_pmf(rates: np.ndarray, max_goals: int) -> np.ndarray:
+    """P(goals = k) for k in 0..max_goals, one row per rate"""
+    goals = np.arange(max_goals + 1)
+    log_factorial = np.cumsum(np.log(np.maximum(goals, 1)))
+    rates = np.maximum(np.asarray(rates, dtype=np.float64), 1e-9)[:, None]
+    return np.exp(goals * np.log(rates) - rates - log_factorial)
+
+
+def scoreline_matrix(
+    home_xg: np.ndarray,
+    away_xg: np.ndarray,
+    max_goals: int = 10,
+    rho: Optional[float] = None
+) -> np.ndarray:
+    """(n, max_goals + 1, max_goals + 1) probabilities of each home x away score.
+    
+    Goals are independent Poisson counts. With ``rho`` the Dixon-Coles
+    adjustment re-weights the 0-0, 1-0, 0-1 and 1-1 cells; a negative
+    ``rho`` raises 0-0 and 1-1, the low-scoring draws plain Poisson
+    under-predicts. Mass beyond ``max_goals`` is dropped and the matrix
+    renormalised.
+    """
+    home_xg = np.atleast_1d(np.asarray(home_xg, dtype=np.float64))
+    away_xg = np.atleast_1d(np.asarray(away_xg, dtype=np.float64))
+    matrix = (
+        poisson_pmf(home_xg, max_goals)[:, :, None]
+        * poisson_pmf(away_xg, max_goals)[:, None, :]
+    )
+    
+    if rho:
+        low_scores = np.ones((len(home_xg), 2, 2))
+        low_scores[:, 0, 0] = 1 - home_xg * away_xg * rho
+        low_scores[:, 0, 1] = 1 + home_xg * rho
+        low_scores[:, 1, 0] = 1 + away_xg * rho
+        low_scores[:, 1, 1] = 1 - rho
+        matrix[:, :2, :2] *= np.maximum(low_scores, 0)
+    
+    return matrix / matrix.sum(axis=(1, 2), keepdims=True)
+
+
+def outcome_probabilities(matrix: np.ndarray) -> np.ndarray:
+    """(n, 3) home win / draw / away win probabilities from scoreline matrices"""
+    return np.stack([
+        np.tril(matrix, -1).sum(axis=(1, 2)),
+        np.trace(matrix, axis1=1, axis2=2),
+        np.triu(matrix, 1).sum(axis=(1, 2))
+    ], axis=1)
+
+
+def entropy_confidence(probs: np.ndarray) -> np.ndarray:
+    """1 minus the normalised outcome entropy: 0 for a coin toss, 1 for a certainty"""
+    entropy = -np.sum(probs * np.log(np.clip(probs, 1e-15, 1)), axis=1)
+    return np.clip(1 - entropy / np.log(probs.shape[1]), 0, 1)
+
+
+def scoreline_probabilities(
+    home_xg: np.ndarray,
+    away_xg: np.ndarray,
+    max_goals: int = 10,
+    rho: Optional[float] = None
+) -> Dict[str, np.ndarray]:
+    """Outcome probabilities, most likely score and confidence for a batch of fixtures"""
+    matrix = scoreline_matrix(home_xg, away_xg, max_goals, rho)
+    probs = outcome_probabilities(matrix)
+    
+    n_scores = max_goals + 1
+    most_likely = matrix.reshape(len(matrix), -1).argmax(axis=1)
+    
+    return {
+        'home_win': probs[:, 0],
+        'draw': probs[:, 1],
+        'away_win': probs[:, 2],
+        'most_likely_home': most_likely // n_scores,
+        'most_likely_away': most_likely % n_scores,
+        'confidence': entropy_confidence(probs)
+    }
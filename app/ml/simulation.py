@@ -0,0 +1,113 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+import numpy as np
+
+
+def _simulate_chunk(
+    home_idx: np.ndarray,
+    away_idx: np.ndarray,
+    home_xg: np.ndarray,
+    away_xg: np.ndarray,
+    base_points: np.ndarray,
+    base_gd: np.ndarray,
+    base_gf: np.ndarray,
+    n_simulations: int,
+    seed: np.random.SeedSequence
+) -> Dict[str, np.ndarray]:
+    """Play out every remaining fixture ``n_simulations`` times and rank the tables.
+    
+    All seasons in the chunk are simulated at once as (simulations, fixtures)
+    arrays; results are scattered to teams with one-hot fixture matrices.
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(base_points)
+    n_fixtures = len(home_idx)
+    
+    home_goals = rng.poisson(home_xg, size=(n_simulations, n_fixtures))
+    away_goals = rng.poisson(away_xg, size=(n_simulations, n_fixtures))
+    
+    home_onehot = np.zeros((n_fixtures, n_teams))
+    home_onehot[np.arange(n_fixtures), home_idx] = 1
+    away_onehot = np.zeros((n_fixtures, n_teams))
+    away_onehot[np.arange(n_fixtures), away_idx] = 1
+    
+    draws = home_goals == away_goals
+    home_points = 3 * (home_goals > away_goals) + draws
+    away_points = 3 * (away_goals > home_goals) + draws
+    
+    points = base_points + home_points @ home_onehot + away_points @ away_onehot
+    goals_for = home_goals @ home_onehot + away_goals @ away_onehot
+    goals_against = away_goals @ home_onehot + home_goals @ away_onehot
+    goal_difference = base_gd + goals_for - goals_against
+    goals_for = base_gf + goals_for
+    
+    # Tie-breakers: points, goal difference, goals scored, then drawing lots
+    lots = rng.random((n_simulations, n_teams))
+    order = np.lexsort((lots, -goals_for, -goal_difference, -points), axis=-1)
+    
+    positions = np.empty_like(order)
+    positions[np.arange(n_simulations)[:, None], order] = np.arange(n_teams)
+    position_counts = np.bincount(
+        (np.arange(n_teams) * n_teams + positions).ravel(),
+        minlength=n_teams * n_teams
+    ).reshape(n_teams, n_teams)
+    
+    return {
+        'position_counts': position_counts,
+        'points_sum': points.sum(axis=0)
+    }
+
+
+def simulate_season(
+    home_idx: np.ndarray,
+    away_idx: np.ndarray,
+    home_xg: np.ndarray,
+    away_xg: np.ndarray,
+    base_points: np.ndarray,
+    base_gd: np.ndarray,
+    base_gf: np.ndarray,
+    n_simulations: int = 10000,
+    seed: int = 42,
+    chunk_size: int = 10000,
+    max_workers: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """Monte Carlo simulation of the rest of a season.
+    
+    Simulations are split into fixed-size chunks, each with its own child
+    seed, so results depend only on ``seed`` and ``chunk_size`` and not on
+    how many worker processes run the chunks.
+    
+    Returns per-team position counts (team x final position) and expected
+    final points.
+    """
+    chunk_sizes = [chunk_size] * (n_simulations // chunk_size)
+    if n_simulations % chunk_size:
+        chunk_sizes.append(n_simulations % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    
+    args = (
+        np.asarray(home_idx), np.asarray(away_idx),
+        np.asarray(home_xg, dtype=np.float64), np.asarray(away_xg, dtype=np.float64),
+        np.asarray(base_points), np.asarray(base_gd), np.asarray(base_gf)
+    )
+    
+    if max_workers and max_workers > 1 and len(chunk_sizes) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(_simulate_chunk, *args, size, chunk_seed)
+                for size, chunk_seed in zip(chunk_sizes, seeds)
+            ]
+            chunks = [f.result() for f in futures]
+    else:
+        chunks = [
+            _simulate_chunk(*args, size, chunk_seed)
+            for size, chunk_seed in zip(chunk_sizes, seeds)
+        ]
+    
+    position_counts = sum(c['position_counts'] for c in chunks)
+    points_sum = sum(c['points_sum'] for c in chunks)
+    
+    return {
+        'position_counts': position_counts,
+        'expected_points': points_sum / n_simulations
+    }
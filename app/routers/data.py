@@ -1,6 +1,12 @@
+import asyncio
 from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+from typing import Hashable, List, Optional, Tuple
 from datetime import datetime
+from ..schemas.prediction import MatchResult
+from ..ml.online_eval import online_evaluator
+from ..data.ratings import ratings_update
+from ..data.team_catalog import get_team_catalog
+from ..services.prediction_service import get_prediction_service
 
 router = APIRouter(tags=["data"])
 
@@ -21,6 +27,56 @@ async def get_matches(
 ):
     return {"message": "Matches endpoint"}
 
+def _update_ratings(results: List[MatchResult], teams: List[Tuple[Hashable, Hashable]]) -> int:
+    """Roll the team ratings forward; returns how many results were new.
+    
+    ``teams`` are the catalog keys of each result's home and away team.
+    Blocking (file lock and snapshot I/O in prefork mode), so it runs in
+    the default executor.
+    """
+    rated = 0
+    with ratings_update() as ratings:
+        for result, (home_key, away_key) in zip(results, teams):
+            # Without a football-data.org id, a fixture is identified by its teams and day
+            match_id = result.match_id if result.match_id is not None else (
+                home_key, away_key, result.match_date.date().isoformat()
+            )
+            rated += ratings.update(
+                home_key, away_key, result.home_score, result.away_score,
+                match_id=match_id,
+                match_date=result.match_date.date()
+            )
+    return rated
+
 @router.post("/data/refresh")
-async def refresh_data():
-    return {"message": "Data refresh triggered"}
\ No newline at end of file
+async def refresh_data(results: Optional[List[MatchResult]] = None):
+    # Settle any logged predictions against the newly ingested results
+    # and roll the team ratings forward
+    rated = 0
+    if results:
+        catalog = get_team_catalog()
+        teams = [(catalog.key(r.home_team), catalog.key(r.away_team)) for r in results]
+        rated = await asyncio.get_running_loop().run_in_executor(
+            None, _update_ratings, results, teams
+        )
+    settled = 0
+    for result in results or []:
+        settled += online_evaluator.record_result(
+            result.home_team,
+            result.away_team,
+            result.match_date,
+            result.home_score,
+            result.away_score,
+            league=result.league
+        )
+    
+    if results:
+        # New results change team form; recompute features on next use
+        await get_prediction_service().team_stats.clear_cache()
+    
+    return {
+        "message": "Data refresh triggered",
+        "results_ingested": len(results or []),
+        "ratings_updated": rated,
+        "predictions_settled": settled
+    }
\ No newline at end of file
@@ -0,0 +1,50 @@
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from ..core.config import settings
+from ..core.profiler import profiler_sessions
+from ..schemas.debug import ProfileRequest
+
+# Only mounted when settings.debug or settings.profiling_enabled is set
+
+
+async def require_debug_token(x_debug_token: Optional[str] = Header(None)):
+    if not settings.profiling_token:
+        raise HTTPException(status_code=403, detail="Profiling token not configured")
+    if x_debug_token is None or not hmac.compare_digest(x_debug_token, settings.profiling_token):
+        raise HTTPException(status_code=401, detail="Invalid debug token")
+
+router = APIRouter(prefix="/debug", tags=["debug"], dependencies=[Depends(require_debug_token)])
+
+@router.post("/profile")
+async def start_profile(request: ProfileRequest):
+    if (request.seconds is None) == (request.requests is None):
+        raise HTTPException(status_code=400, detail="Give exactly one of seconds or requests")
+    interval = settings.profiler_interval_ms / 1000
+    
+    try:
+        if request.seconds is not None:
+            seconds = min(request.seconds, settings.profiler_max_seconds)
+            await profiler_sessions.profile_for(seconds, interval, request.allocations)
+        else:
+            profiler_sessions.profile_requests(
+                request.requests, request.route, interval, request.allocations
+            )
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return profiler_sessions.status()
+
+@router.get("/profile")
+async def profile_status():
+    return profiler_sessions.status()
+
+@router.get("/profile/collapsed", response_class=PlainTextResponse)
+async def collapsed_stacks():
+    """Last session's stacks in collapsed format, for flamegraph.pl or speedscope"""
+    if profiler_sessions.profiler is None:
+        raise HTTPException(status_code=404, detail="No profile recorded yet")
+    return PlainTextResponse(
+        profiler_sessions.profiler.collapsed(),
+        headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'}
+    )
\ No newline at end of file
@@ -1,29 +1,117 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import List
-from ..schemas.prediction import PredictionRequest, PredictionResponse
-from ..services.prediction_service import PredictionService
+from ..schemas.prediction import BatchPredictionRequest, PredictionRequest, PredictionResponse
+from ..services.prediction_service import PredictionService, get_prediction_service
+from ..services.season_simulator import SeasonSimulator, get_season_simulator
+from ..core.config import settings
+from ..ml.online_eval import online_evaluator
 
 router = APIRouter(tags=["predictions"])
 
 @router.post("/predict", response_model=PredictionResponse)
 async def predict_match(
     request: PredictionRequest,
-    prediction_service: PredictionService = Depends()
+    prediction_service: PredictionService = Depends(get_prediction_service)
 ):
     try:
         prediction = await prediction_service.predict_match(
             home_team=request.home_team,
             away_team=request.away_team,
-            match_date=request.match_date
+            match_date=request.match_date,
+            league=request.league
         )
         return prediction
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/predict/batch", response_model=List[PredictionResponse])
+async def predict_matches(
+    request: BatchPredictionRequest,
+    prediction_service: PredictionService = Depends(get_prediction_service)
+):
+    if not request.matches:
+        return []
+    try:
+        return await prediction_service.predict_matches(request.matches)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/predict/explain")
+async def explain_match(
+    request: PredictionRequest,
+    prediction_service: PredictionService = Depends(get_prediction_service)
+):
+    try:
+        explanations = await prediction_service.explain_matches(
+            [(request.home_team, request.away_team)]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return explanations[0]
+
+@router.post("/predict/explain/batch")
+async def explain_matches(
+    request: BatchPredictionRequest,
+    prediction_service: PredictionService = Depends(get_prediction_service)
+):
+    try:
+        return await prediction_service.explain_matches(
+            [(m.home_team, m.away_team) for m in request.matches]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/leagues/{league_id}/simulation")
+async def simulate_league(
+    league_id: int,
+    simulations: int = Query(10000, ge=100, le=100000),
+    seed: int = 42,
+    simulator: SeasonSimulator = Depends(get_season_simulator)
+):
+    try:
+        return await simulator.simulate_league(league_id, n_simulations=simulations, seed=seed)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/predictions/prescore")
+async def prescore_fixtures(
+    prediction_service: PredictionService = Depends(get_prediction_service)
+):
+    try:
+        await prediction_service.prescore_upcoming(
+            settings.prescore_competitions,
+            days_ahead=settings.prescore_days_ahead
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        'fixtures': prediction_service.fixture_table.summary(),
+        'matchup_matrices': {
+            competition_id: matrix.summary()
+            for competition_id, matrix in prediction_service.matchup_matrices.items()
+        }
+    }
+
 @router.get("/predictions/recent")
 async def get_recent_predictions(limit: int = 10):
     return {"message": "Recent predictions endpoint"}
 
 @router.get("/model/performance")
-async def get_model_performance():
-    return {"message": "Model performance metrics"}
\ No newline at end of file
+async def get_model_performance(
+    prediction_service: PredictionService = Depends(get_prediction_service)
+):
+    model_manager = prediction_service.model_manager
+    model = model_manager.get_current_model()
+    
+    # Backtests are computed offline; serving only reads the cached result,
+    # and only loads the backtest module once someone asks for it
+    from ..ml.backtest import backtest_cache
+    
+    performance = model_manager.get_model_performance()
+    performance['backtest'] = backtest_cache.get(model.version)
+    performance['live'] = online_evaluator.summary()
+    return performance
\ No newline at end of file
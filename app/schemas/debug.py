@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class ProfileRequest(BaseModel):
+    # Exactly one of seconds / requests
+    seconds: Optional[float] = Field(None, gt=0)
+    requests: Optional[int] = Field(None, gt=0)
+    route: str = "/api/v1/predict"
+    allocations: bool = False
\ No newline at end of file
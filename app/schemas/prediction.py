@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 class PredictionRequest(BaseModel):
     home_team: str
@@ -8,6 +8,9 @@ class PredictionRequest(BaseModel):
     match_date: datetime
     league: Optional[str] = None
 
+class BatchPredictionRequest(BaseModel):
+    matches: List[PredictionRequest]
+
 class PredictionResponse(BaseModel):
     model_config = ConfigDict(protected_namespaces=())
     
@@ -19,6 +22,8 @@ class PredictionResponse(BaseModel):
     win_probability_away: float
     draw_probability: float
     confidence: float
+    most_likely_score_home: Optional[int] = None
+    most_likely_score_away: Optional[int] = None
     model_version: str
     prediction_timestamp: datetime
 
@@ -28,4 +33,5 @@ class MatchResult(BaseModel):
     home_score: int
     away_score: int
     match_date: datetime
-    league: str
\ No newline at end of file
+    league: str
+    match_id: Optional[int] = None  # football-data.org id; deduplicates re-sent results
\ No newline at end of file
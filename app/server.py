@@ -0,0 +1,198 @@
+"""Preforked multi-worker server.
+
+The parent imports the app, loads and warms up the model and team tables
+and runs the first pre-scoring pass once, freezes the garbage collector,
+then forks uvicorn workers that all accept on one shared socket. Workers
+share the parent's memory copy-on-write, so each extra worker only costs
+the pages it writes to. Workers skip the warm-up and keep pre-scoring
+on schedule, each into its own copy of the fixture table.
+
+Each worker still has its own copy of anything it changes afterwards.
+Team ratings are kept in step through snapshots (see
+``app.data.ratings.ratings_update``); the online evaluator's log is
+per worker, so /data/refresh only settles predictions the receiving
+worker served.
+
+    python -m app.server --workers 4 --port 8000
+"""
+import os
+
+# One OpenMP thread per worker: parallelism comes from the worker processes,
+# and GNU OpenMP thread pools don't survive fork. Must be set before
+# XGBoost is imported.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import gc  # noqa: E402
+import json  # noqa: E402
+import signal  # noqa: E402
+import socket  # noqa: E402
+import time  # noqa: E402
+from datetime import datetime  # noqa: E402
+from typing import Dict, List, Optional  # noqa: E402
+import uvicorn  # noqa: E402
+from .core.config import settings  # noqa: E402
+from .core.metrics import BACKGROUND_JOB_FAILURES  # noqa: E402
+from .core.memory import memory_breakdown_mb  # noqa: E402
+from .data import ratings  # noqa: E402
+from .main import app  # noqa: E402
+from .services.prediction_service import get_prediction_service  # noqa: E402
+from .services.warmup import warm_up  # noqa: E402
+
+
+class PreforkServer:
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        workers: Optional[int] = None,
+        memory_report_seconds: Optional[float] = None
+    ):
+        self.host = host
+        self.port = port
+        self.n_workers = workers or settings.server_workers
+        self.memory_report_seconds = memory_report_seconds or settings.worker_memory_report_seconds
+        self.workers: List[int] = []
+        self.socket: Optional[socket.socket] = None
+        self._stopping = False
+    
+    def preload(self) -> Dict:
+        """Load everything workers would otherwise each load, then freeze it"""
+        ratings.shared_snapshots = True
+        service = get_prediction_service()
+        state = asyncio.run(self._warm_up(service))
+        # The Redis client's connections belong to the loop that just closed
+        service.reset_cache_clients()
+        
+        # Move every surviving object to a permanent generation so workers'
+        # collections don't touch (and so copy) the shared pages
+        gc.collect()
+        gc.freeze()
+        return state.report
+    
+    async def _warm_up(self, service):
+        state = await warm_up(service)
+        if state.ready and (settings.prescore_competitions or settings.matchup_matrix_competitions):
+            try:
+                await service.prescore_upcoming(
+                    settings.prescore_competitions,
+                    days_ahead=settings.prescore_days_ahead
+                )
+            except Exception as e:
+                # Workers retry on their next cycle
+                BACKGROUND_JOB_FAILURES.inc(job='prescore', error=type(e).__name__)
+        return state
+    
+    def bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        self.port = sock.getsockname()[1]
+        self.socket = sock
+        return sock
+    
+    def spawn_worker(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            app.state.prefork_role = "worker"
+            get_prediction_service().reset_cache_clients()
+            config = uvicorn.Config(
+                app,
+                lifespan="on",
+                log_level="info" if settings.debug else "warning"
+            )
+            uvicorn.Server(config).run(sockets=[self.socket])
+            os._exit(0)
+        self.workers.append(pid)
+        return pid
+    
+    def memory_report(self) -> Dict:
+        """Per-process memory in MB: parent and every live worker"""
+        return {
+            'timestamp': datetime.utcnow().isoformat(),
+            'parent': {'pid': os.getpid(), **memory_breakdown_mb()},
+            'workers': [{'pid': pid, **memory_breakdown_mb(pid)} for pid in self.workers],
+        }
+    
+    def _reap(self):
+        """Forget exited workers and replace them unless shutting down"""
+        while self.workers:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers = []
+                return
+            if pid == 0:
+                return
+            if pid in self.workers:
+                self.workers.remove(pid)
+                if not self._stopping:
+                    self.spawn_worker()
+    
+    def _request_stop(self, signum, frame):
+        self._stopping = True
+    
+    def stop(self, timeout: float = 30):
+        self._stopping = True
+        for pid in self.workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + timeout
+        while self.workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for pid in self.workers:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                continue
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.workers = []
+        if self.socket is not None:
+            self.socket.close()
+    
+    def run(self):
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        
+        warmup = self.preload()
+        self.bind()
+        print(json.dumps({
+            'event': 'preloaded', 'port': self.port, 'workers': self.n_workers, **warmup
+        }), flush=True)
+        for _ in range(self.n_workers):
+            self.spawn_worker()
+        
+        next_report = time.monotonic() + self.memory_report_seconds
+        try:
+            while not self._stopping:
+                self._reap()
+                if time.monotonic() >= next_report:
+                    print(json.dumps({'event': 'memory', **self.memory_report()}), flush=True)
+                    next_report += self.memory_report_seconds
+                time.sleep(0.5)
+        finally:
+            self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run the API as preforked workers sharing one model copy"
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--memory-report-seconds", type=float, default=None)
+    args = parser.parse_args()
+    
+    PreforkServer(args.host, args.port, args.workers, args.memory_report_seconds).run()
\ No newline at end of file
@@ -0,0 +1,78 @@
+from datetime import datetime
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+
+
+class FixturePredictionTable:
+    """Pre-scored predictions for upcoming fixtures.
+    
+    Predictions are held as a few contiguous arrays plus a
+    (home_team, away_team) -> row index, so serving a known fixture is a
+    dict lookup. Teams are indexed by ``key``, e.g. ``TeamCatalog.key``, so
+    any spelling of a fixture finds its row. The table remembers which
+    model version and team feature version produced it; a lookup against
+    any other version misses.
+    """
+    
+    def __init__(self, key: Callable[[str], Hashable] = lambda name: name):
+        self.key = key
+        self.index: Dict[Tuple[Hashable, Hashable], int] = {}
+        self._pairs: List[Tuple[str, str]] = []
+        self.goals = np.empty((0, 2))
+        self.probabilities: Dict[str, np.ndarray] = {}
+        self.model_version: Optional[str] = None
+        self.features_version: Optional[str] = None
+        self.refreshed_at: Optional[datetime] = None
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    @property
+    def pairs(self) -> List[Tuple[str, str]]:
+        return list(self._pairs)
+    
+    def load(
+        self,
+        pairs: List[Tuple[str, str]],
+        goals: np.ndarray,
+        probabilities: Dict[str, np.ndarray],
+        model_version: str,
+        features_version: str
+    ):
+        """Replace the table contents with a freshly scored batch"""
+        self.index = {
+            (self.key(home_team), self.key(away_team)): i
+            for i, (home_team, away_team) in enumerate(pairs)
+        }
+        self._pairs = list(pairs)
+        self.goals = np.asarray(goals, dtype=np.float64)
+        self.probabilities = probabilities
+        self.model_version = model_version
+        self.features_version = features_version
+        self.refreshed_at = datetime.utcnow()
+    
+    def is_stale(self, model_version: str, features_version: str) -> bool:
+        return (self.model_version, self.features_version) != (model_version, features_version)
+    
+    def lookup(
+        self,
+        home_team: str,
+        away_team: str,
+        model_version: str,
+        features_version: str
+    ) -> Optional[Tuple[float, float, Dict]]:
+        """Pre-scored (home_score, away_score, probabilities) or None"""
+        row = self.index.get((self.key(home_team), self.key(away_team)))
+        if row is None or self.is_stale(model_version, features_version):
+            return None
+        
+        probabilities = {k: v[row].item() for k, v in self.probabilities.items()}
+        return float(self.goals[row, 0]), float(self.goals[row, 1]), probabilities
+    
+    def summary(self) -> Dict:
+        return {
+            'fixtures': len(self),
+            'model_version': self.model_version,
+            'features_version': self.features_version,
+            'refreshed_at': self.refreshed_at.isoformat() if self.refreshed_at else None
+        }
@@ -0,0 +1,76 @@
+from datetime import datetime
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+import numpy as np
+
+
+class MatchupMatrix:
+    """Predictions for every home x away pairing within one league.
+    
+    All arrays are (n_teams, n_teams) with rows indexed by the home team
+    and columns by the away team, so any intra-league pairing is an array
+    index. Like the fixture table, teams are found by ``key`` and the
+    matrix is tied to the model and team feature versions that produced it.
+    """
+    
+    def __init__(
+        self,
+        teams: List[Dict],
+        goals: np.ndarray,
+        probabilities: Dict[str, np.ndarray],
+        model_version: str,
+        features_version: str,
+        key: Callable[[str], Hashable] = lambda name: name
+    ):
+        n_teams = len(teams)
+        self.key = key
+        self.teams = teams
+        self.team_ids = np.array([team['id'] for team in teams])
+        self.id_to_row = {team['id']: i for i, team in enumerate(teams)}
+        self.key_to_row = {key(team['name']): i for i, team in enumerate(teams)}
+        self.home_goals = goals[:, 0].reshape(n_teams, n_teams)
+        self.away_goals = goals[:, 1].reshape(n_teams, n_teams)
+        self.probabilities = {k: v.reshape(n_teams, n_teams) for k, v in probabilities.items()}
+        self.model_version = model_version
+        self.features_version = features_version
+        self.built_at = datetime.utcnow()
+    
+    def is_stale(self, model_version: str, features_version: str) -> bool:
+        return (self.model_version, self.features_version) != (model_version, features_version)
+    
+    def lookup_rows(self, home_row: int, away_row: int) -> Tuple[float, float, Dict]:
+        probabilities = {k: v[home_row, away_row].item() for k, v in self.probabilities.items()}
+        return (
+            float(self.home_goals[home_row, away_row]),
+            float(self.away_goals[home_row, away_row]),
+            probabilities
+        )
+    
+    def lookup_ids(self, home_id: int, away_id: int) -> Optional[Tuple[float, float, Dict]]:
+        home_row = self.id_to_row.get(home_id)
+        away_row = self.id_to_row.get(away_id)
+        if home_row is None or away_row is None or home_row == away_row:
+            return None
+        return self.lookup_rows(home_row, away_row)
+    
+    def lookup(
+        self,
+        home_team: str,
+        away_team: str,
+        model_version: str,
+        features_version: str
+    ) -> Optional[Tuple[float, float, Dict]]:
+        """Precomputed (home_score, away_score, probabilities) or None"""
+        home_row = self.key_to_row.get(self.key(home_team))
+        away_row = self.key_to_row.get(self.key(away_team))
+        if (home_row is None or away_row is None or home_row == away_row
+                or self.is_stale(model_version, features_version)):
+            return None
+        return self.lookup_rows(home_row, away_row)
+    
+    def summary(self) -> Dict:
+        return {
+            'teams': len(self.teams),
+            'model_version': self.model_version,
+            'features_version': self.features_version,
+            'built_at': self.built_at.isoformat()
+        }
@@ -1,113 +1,541 @@
-from datetime import datetime
-from typing import Dict, List
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, List, Optional, Tuple
 import pandas as pd
 import numpy as np
-from ..schemas.prediction import PredictionResponse
-from ..ml.model_manager import ModelManager
+from ..schemas.prediction import PredictionRequest, PredictionResponse
+from ..ml.model_manager import PREDICTIONS_CACHE, ModelManager, expected_goals
+from ..ml.online_eval import online_evaluator
+from ..ml.scoreline import scoreline_probabilities
+from ..core.cache import RecordCodec, TwoLevelCache, get_redis, reset_redis
+from ..core.config import settings
+from ..core.metrics import BACKGROUND_JOB_FAILURES, PREDICTION_STAGE_LATENCY, record_cache
+from ..data.feature_store import TEAM_FEATURE_KEYS
+from ..data.football_api_client import UPCOMING_STATUSES
 from ..data.team_stats import TeamStatsService
+from ..data.ratings import EloRatings, get_team_ratings
+from .fixture_table import FixturePredictionTable
+from .matchup_matrix import MatchupMatrix
+
+logger = logging.getLogger(__name__)
+
+# Model inputs, in order: home team stats, away team stats, head-to-head record
+HOME_FEATURE_KEYS = ['avg_goals_scored', 'avg_goals_conceded', 'home_advantage', 'recent_form']
+AWAY_FEATURE_KEYS = ['avg_goals_scored', 'avg_goals_conceded', 'away_form']
+H2H_FEATURE_KEYS = ['home_wins', 'away_wins', 'draws']
+
+# Positions of the home and away team inputs in team feature rows
+HOME_COLUMNS = [TEAM_FEATURE_KEYS.index(k) for k in HOME_FEATURE_KEYS]
+AWAY_COLUMNS = [TEAM_FEATURE_KEYS.index(k) for k in AWAY_FEATURE_KEYS]
+
+FEATURE_NAMES = (
+    [f'home_{k}' for k in HOME_FEATURE_KEYS]
+    + [f'away_{k}' for k in AWAY_FEATURE_KEYS]
+    + [f'h2h_{k}' for k in H2H_FEATURE_KEYS]
+)
+
+# Appended when settings.use_rating_features is on
+RATING_FEATURE_NAMES = ['home_elo', 'away_elo', 'elo_home_win_expectancy']
+
+# Cached live predictions: expected goals followed by the probabilities dict
+PREDICTION_CODEC = RecordCodec(
+    ['home_goals', 'away_goals', 'home_win', 'draw', 'away_win', 'confidence',
+     'most_likely_home', 'most_likely_away'],
+    int_fields=['most_likely_home', 'most_likely_away']
+)
+
+
+def feature_names() -> List[str]:
+    """Names of the model inputs built by _prepare_batch_features, in order"""
+    if settings.use_rating_features:
+        return FEATURE_NAMES + RATING_FEATURE_NAMES
+    return FEATURE_NAMES
+
 
 class PredictionService:
     def __init__(self):
         self.model_manager = ModelManager()
         self.team_stats = TeamStatsService()
+        self.online_evaluator = online_evaluator
+        self.fixture_table = FixturePredictionTable(key=self._team_key)
+        self.matchup_matrices: Dict[int, MatchupMatrix] = {}
+        # Serializes re-scoring of the fixture table and matchup matrices
+        self._rescore_lock = asyncio.Lock()
+        self._rescore_task: Optional[asyncio.Task] = None
+        # LRU by catalog keys, capped at explanation_cache_size pairings
+        self.explanation_cache: "OrderedDict[Tuple[Hashable, Hashable], Dict]" = OrderedDict()
+        self.explanation_cache_version = None
+        # Live predictions by model version, features version and teams,
+        # shared with other replicas through Redis when configured
+        self.prediction_cache = TwoLevelCache(
+            PREDICTIONS_CACHE,
+            PREDICTION_CODEC,
+            client=get_redis(),
+            max_local=settings.cache_local_max_entries,
+            ttl_seconds=settings.prediction_cache_ttl_seconds,
+            on_invalidate=self._model_swapped_elsewhere
+        )
+    
+    @property
+    def ratings(self) -> EloRatings:
+        # Looked up on each use so preforked workers see ratings reloaded
+        # from other workers' snapshots
+        return get_team_ratings()
+    
+    async def start_cache_sync(self):
+        """Follow cache invalidations published by other replicas"""
+        await self.team_stats.features_cache.start()
+        await self.prediction_cache.start()
+    
+    async def stop_cache_sync(self):
+        await self.team_stats.features_cache.stop()
+        await self.prediction_cache.stop()
+    
+    def reset_cache_clients(self):
+        """Point the caches at a fresh Redis client, e.g. after fork"""
+        reset_redis()
+        self.team_stats.features_cache.client = get_redis()
+        self.prediction_cache.client = get_redis()
+    
+    def _model_swapped_elsewhere(self, model_version: str):
+        """Load the model a training job just registered, if it isn't ours"""
+        current = self.model_manager.current_model
+        if model_version and (current is None or current.version != model_version):
+            asyncio.get_running_loop().run_in_executor(None, self.model_manager.load_latest_model)
     
     async def predict_match(
         self, 
         home_team: str, 
         away_team: str, 
-        match_date: datetime
+        match_date: datetime,
+        league: Optional[str] = None
     ) -> PredictionResponse:
         
-        # Get team features
-        home_features = await self.team_stats.get_team_features(home_team)
-        away_features = await self.team_stats.get_team_features(away_team)
+        fixture = PredictionRequest(
+            home_team=home_team,
+            away_team=away_team,
+            match_date=match_date,
+            league=league
+        )
+        predictions = await self.predict_matches([fixture])
+        return predictions[0]
+    
+    async def predict_matches(self, fixtures: List[PredictionRequest]) -> List[PredictionResponse]:
+        """Predict several fixtures with a single batched model call.
         
-        # Prepare input features
-        features = self._prepare_features(home_features, away_features)
+        Fixtures already in the pre-scored table or a league matchup matrix
+        are served from them; only the remaining ones go through live
+        inference.
+        """
         
-        # Make prediction
         model = self.model_manager.get_current_model()
-        prediction = model.predict(features)
+        features_version = self.team_stats.features_version
+        with PREDICTION_STAGE_LATENCY.time(stage='precomputed_lookup', model_version=model.version):
+            self._refresh_precomputed(model.version, features_version)
+            scored = [
+                self._lookup_precomputed(f.home_team, f.away_team, model.version, features_version)
+                for f in fixtures
+            ]
         
-        # Convert to probabilities and scores
-        home_score, away_score, probabilities = self._process_prediction(prediction)
+        misses = [i for i, hit in enumerate(scored) if hit is None]
+        record_cache('precomputed', hit=True, count=len(fixtures) - len(misses))
+        record_cache('precomputed', hit=False, count=len(misses))
+        if misses:
+            misses = await self._lookup_cached_predictions(
+                fixtures, misses, scored, model.version, features_version
+            )
+        if misses:
+            goals = await self.predict_expected_goals(
+                [(fixtures[i].home_team, fixtures[i].away_team) for i in misses]
+            )
+            # Convert to probabilities and scores for the whole batch at once
+            with PREDICTION_STAGE_LATENCY.time(stage='probabilities', model_version=model.version):
+                batch_probabilities = self._process_predictions(goals)
+                for j, i in enumerate(misses):
+                    scored[i] = (
+                        float(goals[j, 0]),
+                        float(goals[j, 1]),
+                        {k: v[j].item() for k, v in batch_probabilities.items()}
+                    )
+            await self.prediction_cache.set_many({
+                self._prediction_key(fixtures[i], model.version, features_version): {
+                    'home_goals': scored[i][0], 'away_goals': scored[i][1], **scored[i][2]
+                }
+                for i in misses
+            })
         
-        return PredictionResponse(
-            home_team=home_team,
-            away_team=away_team,
-            predicted_score_home=home_score,
-            predicted_score_away=away_score,
-            win_probability_home=probabilities['home_win'],
-            win_probability_away=probabilities['away_win'],
-            draw_probability=probabilities['draw'],
-            confidence=probabilities['confidence'],
-            model_version=model.version,
-            prediction_timestamp=datetime.utcnow()
+        with PREDICTION_STAGE_LATENCY.time(stage='response', model_version=model.version):
+            return self._build_responses(fixtures, scored, model.version)
+    
+    def _build_responses(
+        self,
+        fixtures: List[PredictionRequest],
+        scored: List[Tuple[float, float, Dict]],
+        model_version: str
+    ) -> List[PredictionResponse]:
+        predictions = []
+        for fixture, (home_score, away_score, probabilities) in zip(fixtures, scored):
+            # Keep the prediction so it can be scored once the result is ingested
+            self.online_evaluator.log_prediction(
+                fixture.home_team, fixture.away_team, fixture.match_date,
+                home_score, away_score, probabilities,
+                model_version=model_version,
+                league=fixture.league
+            )
+            
+            predictions.append(PredictionResponse(
+                home_team=fixture.home_team,
+                away_team=fixture.away_team,
+                predicted_score_home=home_score,
+                predicted_score_away=away_score,
+                win_probability_home=probabilities['home_win'],
+                win_probability_away=probabilities['away_win'],
+                draw_probability=probabilities['draw'],
+                confidence=probabilities['confidence'],
+                most_likely_score_home=probabilities['most_likely_home'],
+                most_likely_score_away=probabilities['most_likely_away'],
+                model_version=model_version,
+                prediction_timestamp=datetime.utcnow()
+            ))
+        
+        return predictions
+    
+    def _team_key(self, name: str) -> Hashable:
+        """Catalog key of a team, so every spelling of it shares one entry"""
+        return self.team_stats.catalog.key(name)
+    
+    def _prediction_key(
+        self,
+        fixture: PredictionRequest,
+        model_version: str,
+        features_version: str
+    ) -> str:
+        catalog = self.team_stats.catalog
+        return (
+            f"{model_version}:{features_version}:"
+            f"{catalog.key(fixture.home_team)}:{catalog.key(fixture.away_team)}"
         )
     
-    def _prepare_features(self, home_features: Dict, away_features: Dict) -> np.ndarray:
-        # Combine and normalize features
-        feature_vector = []
-        
-        # Home team features
-        feature_vector.extend([
-            home_features.get('avg_goals_scored', 0),
-            home_features.get('avg_goals_conceded', 0),
-            home_features.get('home_advantage', 0),
-            home_features.get('recent_form', 0),
-        ])
-        
-        # Away team features
-        feature_vector.extend([
-            away_features.get('avg_goals_scored', 0),
-            away_features.get('avg_goals_conceded', 0),
-            away_features.get('away_form', 0),
-        ])
-        
-        # Head-to-head features
-        h2h = self.team_stats.get_head_to_head(home_features['team'], away_features['team'])
-        feature_vector.extend([
-            h2h.get('home_wins', 0),
-            h2h.get('away_wins', 0),
-            h2h.get('draws', 0),
-        ])
-        
-        return np.array(feature_vector).reshape(1, -1)
+    async def _lookup_cached_predictions(
+        self,
+        fixtures: List[PredictionRequest],
+        misses: List[int],
+        scored: List,
+        model_version: str,
+        features_version: str
+    ) -> List[int]:
+        """Fill ``scored`` from the prediction cache; returns the fixtures still missing"""
+        with PREDICTION_STAGE_LATENCY.time(stage='prediction_cache', model_version=model_version):
+            keys = {
+                i: self._prediction_key(fixtures[i], model_version, features_version)
+                for i in misses
+            }
+            cached = await self.prediction_cache.get_many(keys.values())
+            remaining = []
+            for i in misses:
+                hit = cached.get(keys[i])
+                if hit is None:
+                    remaining.append(i)
+                    continue
+                probabilities = {
+                    k: v for k, v in hit.items() if k not in ('home_goals', 'away_goals')
+                }
+                scored[i] = (hit['home_goals'], hit['away_goals'], probabilities)
+            return remaining
     
-    def _process_prediction(self, prediction: np.ndarray) -> tuple:
-        # Handle both scalar and array predictions
-        if prediction.ndim == 0 or len(prediction.shape) == 1:
-            # Scalar prediction - split it into home/away scores
-            if prediction.ndim == 0:
-                total_goals = max(0, float(prediction.item()))
-            else:
-                total_goals = max(0, float(prediction[0]))
-            home_score = total_goals * 0.6  # Home advantage
-            away_score = total_goals * 0.4
-        else:
-            # Array prediction with [home, away] scores
-            home_score = max(0, float(prediction[0][0]))
-            away_score = max(0, float(prediction[0][1]))
-        
-        # Calculate probabilities based on score difference
-        score_diff = home_score - away_score
-        
-        if score_diff > 0.5:
-            home_win_prob = 0.6
-            away_win_prob = 0.2
-            draw_prob = 0.2
-        elif score_diff < -0.5:
-            home_win_prob = 0.2
-            away_win_prob = 0.6
-            draw_prob = 0.2
+    def _lookup_precomputed(
+        self,
+        home_team: str,
+        away_team: str,
+        model_version: str,
+        features_version: str
+    ) -> Optional[Tuple[float, float, Dict]]:
+        hit = self.fixture_table.lookup(home_team, away_team, model_version, features_version)
+        if hit is None:
+            for matrix in self.matchup_matrices.values():
+                hit = matrix.lookup(home_team, away_team, model_version, features_version)
+                if hit is not None:
+                    break
+        return hit
+    
+    def _refresh_precomputed(self, model_version: str, features_version: str):
+        """Start re-scoring precomputed predictions made by another model or
+        feature version in the background. Stale entries aren't served, so
+        until it finishes those fixtures go through live inference."""
+        versions = (model_version, features_version)
+        stale = (
+            (len(self.fixture_table) and self.fixture_table.is_stale(*versions))
+            or any(m.is_stale(*versions) for m in self.matchup_matrices.values())
+        )
+        if stale and (self._rescore_task is None or self._rescore_task.done()):
+            self._rescore_task = asyncio.get_running_loop().create_task(self._rescore_precomputed())
+    
+    async def _rescore_precomputed(self):
+        async with self._rescore_lock:
+            try:
+                model = self.model_manager.get_current_model()
+                features_version = self.team_stats.features_version
+                if (len(self.fixture_table)
+                        and self.fixture_table.is_stale(model.version, features_version)):
+                    await self.prescore_fixtures(self.fixture_table.pairs)
+                for competition_id, matrix in list(self.matchup_matrices.items()):
+                    if matrix.is_stale(model.version, features_version):
+                        await self.build_matchup_matrix(competition_id, matrix.teams)
+            except Exception as e:
+                # Requests keep using live inference; retried on the next stale lookup
+                BACKGROUND_JOB_FAILURES.inc(job='rescore', error=type(e).__name__)
+                logger.exception("Re-scoring precomputed predictions failed")
+    
+    async def build_matchup_matrix(self, competition_id: int, teams: List[Dict]) -> MatchupMatrix:
+        """Predict every home x away pairing of a league's teams in one model call.
+        
+        ``teams`` are football-data.org team dicts with at least ``id`` and
+        ``name``.
+        """
+        model = self.model_manager.get_current_model()
+        features_version = self.team_stats.features_version
+        
+        team_names = [team['name'] for team in teams]
+        team_rows = await self.team_stats.get_many_team_feature_rows(team_names)
+        goals = model.predict_goals(self._prepare_pairing_features(team_names, team_rows))
+        probabilities = self._process_predictions(goals)
+        
+        matrix = MatchupMatrix(
+            teams, goals, probabilities, model.version, features_version,
+            key=self._team_key
+        )
+        self.matchup_matrices[competition_id] = matrix
+        return matrix
+    
+    async def explain_matches(self, pairs: List[Tuple[str, str]]) -> List[Dict]:
+        """Per-feature contributions to the expected goals of each pairing.
+        
+        Explanations are cached per model and team-features version; only
+        pairings not cached yet are attributed, in one batched call.
+        """
+        model = self.model_manager.get_current_model()
+        cache_version = (model.version, self.team_stats.features_version)
+        if self.explanation_cache_version != cache_version:
+            self.explanation_cache.clear()
+            self.explanation_cache_version = cache_version
+        
+        keys = [(self._team_key(home), self._team_key(away)) for home, away in pairs]
+        explanations = {}
+        for key in keys:
+            if key in self.explanation_cache:
+                self.explanation_cache.move_to_end(key)
+                explanations[key] = self.explanation_cache[key]
+        # One pairing per key: another spelling of the same fixture shares its explanation
+        missing = {key: pair for key, pair in zip(keys, pairs) if key not in explanations}
+        record_cache('explanations', hit=False, count=len(missing))
+        record_cache('explanations', hit=True, count=len(pairs) - len(missing))
+        if missing:
+            rows = await self._prepare_batch_features(list(missing.values()))
+            explanations.update(
+                self._cache_explanations(list(missing), model.explain(rows), model.version)
+            )
+        
+        return [
+            {**explanations[key], 'home_team': home_team, 'away_team': away_team}
+            for key, (home_team, away_team) in zip(keys, pairs)
+        ]
+    
+    def _cache_explanations(
+        self,
+        keys: List[Tuple[Hashable, Hashable]],
+        contributions: np.ndarray,
+        model_version: str
+    ) -> Dict[Tuple[Hashable, Hashable], Dict]:
+        names = feature_names()
+        targets = ['home_goals', 'away_goals'] if contributions.shape[1] == 2 else ['total_goals']
+        
+        explanations = {}
+        for key, row in zip(keys, contributions):
+            explanation = {'model_version': model_version}
+            for target, target_row in zip(targets, row):
+                explanation[target] = {
+                    'base_value': float(target_row[-1]),
+                    'prediction': float(target_row.sum()),
+                    'contributions': dict(zip(names, target_row[:-1].tolist()))
+                }
+            explanations[key] = explanation
+            self.explanation_cache[key] = explanation
+        
+        while len(self.explanation_cache) > settings.explanation_cache_size:
+            self.explanation_cache.popitem(last=False)
+        return explanations
+    
+    async def prescore_fixtures(self, pairs: List[Tuple[str, str]]) -> int:
+        """Score (home_team, away_team) pairs in one batch into the fixture table"""
+        pairs = list(dict.fromkeys(pairs))
+        model = self.model_manager.get_current_model()
+        features_version = self.team_stats.features_version
+        
+        if pairs:
+            goals = await self.predict_expected_goals(pairs)
+            probabilities = self._process_predictions(goals)
+            if settings.prescore_explanations and model.can_explain:
+                # Popular fixtures get their explanations ready alongside
+                await self.explain_matches(pairs)
         else:
-            home_win_prob = 0.3
-            away_win_prob = 0.3
-            draw_prob = 0.4
-        
-        return home_score, away_score, {
-            'home_win': home_win_prob,
-            'away_win': away_win_prob,
-            'draw': draw_prob,
-            'confidence': 0.75
-        }
\ No newline at end of file
+            goals, probabilities = np.empty((0, 2)), {}
+        
+        self.fixture_table.load(pairs, goals, probabilities, model.version, features_version)
+        return len(pairs)
+    
+    async def prescore_upcoming(self, competition_ids: List[int], days_ahead: int = 14) -> int:
+        """Fetch scheduled fixtures for the given competitions and pre-score them.
+        
+        Leagues in ``matchup_matrix_competitions`` also get a full
+        home x away matrix built from their team lists.
+        """
+        api_client = self.team_stats.api_client
+        date_from = datetime.utcnow()
+        date_to = date_from + timedelta(days=days_ahead)
+        
+        await self.team_stats.catalog.load(
+            api_client, list(competition_ids) + list(settings.matchup_matrix_competitions)
+        )
+        
+        pairs = []
+        for competition_id in competition_ids:
+            matches = await api_client.get_matches(
+                competition_id,
+                date_from=date_from,
+                date_to=date_to,
+                status=UPCOMING_STATUSES
+            )
+            pairs.extend(
+                (m['homeTeam']['name'], m['awayTeam']['name']) for m in matches
+            )
+        
+        teams = {
+            competition_id: await api_client.get_teams(competition_id)
+            for competition_id in settings.matchup_matrix_competitions
+        }
+        async with self._rescore_lock:
+            for competition_id, competition_teams in teams.items():
+                await self.build_matchup_matrix(competition_id, competition_teams)
+            return await self.prescore_fixtures(pairs)
+    
+    async def predict_expected_goals(self, pairs: List[Tuple[str, str]]) -> np.ndarray:
+        """(n, 2) expected [home, away] goals for (home_team, away_team) pairs"""
+        
+        rows = await self._prepare_batch_features(pairs)
+        
+        # Make prediction: one model call for the whole batch
+        model = self.model_manager.get_current_model()
+        with PREDICTION_STAGE_LATENCY.time(stage='model_predict', model_version=model.version):
+            return model.predict_goals(rows)
+    
+    async def _prepare_batch_features(self, pairs: List[Tuple[str, str]]) -> np.ndarray:
+        model_version = self.model_manager.get_current_model().version
+        
+        # Get team feature rows, head-to-head records, then one input row per fixture
+        with PREDICTION_STAGE_LATENCY.time(stage='team_features', model_version=model_version):
+            team_rows = await self.team_stats.get_many_team_feature_rows(
+                [team for pair in pairs for team in pair]
+            )
+        # Head-to-head and rating features are keyed like the team caches
+        keys = [(self._team_key(home), self._team_key(away)) for home, away in pairs]
+        with PREDICTION_STAGE_LATENCY.time(stage='head_to_head', model_version=model_version):
+            h2h_rows = np.array([
+                [h2h.get(k, 0) for k in H2H_FEATURE_KEYS]
+                for h2h in (self.team_stats.get_head_to_head(*pair) for pair in keys)
+            ])
+        with PREDICTION_STAGE_LATENCY.time(stage='prepare_features', model_version=model_version):
+            blocks = [team_rows[0::2, HOME_COLUMNS], team_rows[1::2, AWAY_COLUMNS], h2h_rows]
+            if settings.use_rating_features:
+                blocks.append(np.array([
+                    [ratings[k] for k in RATING_FEATURE_NAMES]
+                    for ratings in (self.ratings.get_features(*pair) for pair in keys)
+                ]))
+            return np.hstack(blocks)
+    
+    def _prepare_pairing_features(self, team_names: List[str], team_rows: np.ndarray) -> np.ndarray:
+        """Feature rows for every home x away pairing of the given teams.
+        
+        ``team_rows`` are the teams' feature rows, as returned by
+        ``get_many_team_feature_rows``. Returns an (n * n, n_features)
+        matrix in row-major (home, away) order, built with fancy indexing.
+        Rows where a team meets itself are included so the result reshapes
+        to (n, n).
+        """
+        n_teams = len(team_names)
+        keys = [self._team_key(name) for name in team_names]
+        home_table = team_rows[:, HOME_COLUMNS]
+        away_table = team_rows[:, AWAY_COLUMNS]
+        
+        h2h_table = np.zeros((n_teams, n_teams, len(H2H_FEATURE_KEYS)))
+        for i, home_key in enumerate(keys):
+            for j, away_key in enumerate(keys):
+                if i != j:
+                    h2h = self.team_stats.get_head_to_head(home_key, away_key)
+                    h2h_table[i, j] = [h2h.get(k, 0) for k in H2H_FEATURE_KEYS]
+        
+        home_idx, away_idx = np.divmod(np.arange(n_teams * n_teams), n_teams)
+        blocks = [
+            home_table[home_idx],
+            away_table[away_idx],
+            h2h_table.reshape(n_teams * n_teams, -1)
+        ]
+        
+        if settings.use_rating_features:
+            elo = np.array([self.ratings.get_rating(key) for key in keys])
+            home_elo = elo[home_idx]
+            away_elo = elo[away_idx]
+            expectancy = 1 / (1 + 10 ** ((away_elo - home_elo - self.ratings.home_advantage) / 400))
+            blocks.append(np.column_stack([home_elo, away_elo, expectancy]))
+        
+        return np.hstack(blocks)
+    
+    def _process_predictions(self, goals: np.ndarray) -> Dict[str, np.ndarray]:
+        """Scoreline-based probabilities for (n, 2) expected goals in one vectorized pass"""
+        return scoreline_probabilities(
+            goals[:, 0],
+            goals[:, 1],
+            max_goals=settings.scoreline_max_goals,
+            rho=settings.dixon_coles_rho
+        )
+    
+    def _process_prediction(self, prediction: np.ndarray) -> tuple:
+        # Handles both [home, away] predictions and legacy total-goals scalars
+        goals = expected_goals(prediction)
+        home_score = float(goals[0, 0])
+        away_score = float(goals[0, 1])
+        
+        probabilities = self._process_predictions(goals[:1])
+        return home_score, away_score, {k: v[0].item() for k, v in probabilities.items()}
+
+
+_prediction_service = None
+
+def get_prediction_service() -> PredictionService:
+    """Shared service so the loaded model and caches survive across requests"""
+    global _prediction_service
+    if _prediction_service is None:
+        _prediction_service = PredictionService()
+    return _prediction_service
+
+
+async def prescore_periodically(service: PredictionService, skip_first: bool = False):
+    """Background task re-scoring upcoming fixtures every prescore_interval_hours.
+    
+    ``skip_first`` waits one interval before the first pass, for workers
+    whose parent process already pre-scored.
+    """
+    if skip_first:
+        await asyncio.sleep(settings.prescore_interval_hours * 3600)
+    while True:
+        try:
+            await service.prescore_upcoming(
+                settings.prescore_competitions,
+                days_ahead=settings.prescore_days_ahead
+            )
+        except Exception as e:
+            # Keep serving from live inference; retry on the next cycle
+            BACKGROUND_JOB_FAILURES.inc(job='prescore', error=type(e).__name__)
+            logger.exception("Pre-scoring upcoming fixtures failed")
+        await asyncio.sleep(settings.prescore_interval_hours * 3600)
\ No newline at end of file
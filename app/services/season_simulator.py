@@ -0,0 +1,149 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import numpy as np
+from ..core.config import settings
+from ..core.metrics import EXECUTOR_PENDING, record_cache
+from ..data.football_api_client import UPCOMING_STATUSES, FootballAPIClient
+from ..ml.simulation import simulate_season
+from .prediction_service import PredictionService, get_prediction_service
+
+
+class SeasonSimulator:
+    """Final-table, title and relegation odds from simulated seasons"""
+    
+    def __init__(self, prediction_service: PredictionService):
+        self.prediction_service = prediction_service
+        self.api_client = FootballAPIClient()
+        # Least recently used results are evicted past simulation_cache_size
+        self.cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+    
+    async def simulate_league(
+        self,
+        competition_id: int,
+        n_simulations: int = 10000,
+        seed: int = 42
+    ) -> Dict:
+        """Simulate the remaining fixtures of a competition from its current standings"""
+        standings = await self.api_client.get_standings(competition_id)
+        fixtures = await self.api_client.get_matches(competition_id, status=UPCOMING_STATUSES)
+        return await self.simulate(
+            standings, fixtures, n_simulations, seed,
+            cache_key=competition_id
+        )
+    
+    async def simulate(
+        self,
+        standings: Dict,
+        fixtures: List[Dict],
+        n_simulations: int = 10000,
+        seed: int = 42,
+        cache_key: Optional[int] = None
+    ) -> Dict:
+        """Simulate from football-data.org style standings and scheduled matches"""
+        table = self._total_table(standings)
+        model = self.prediction_service.model_manager.get_current_model()
+        
+        # Results are cached per model version, team features (which change
+        # with /data/refresh) and state of the table
+        key = (
+            cache_key,
+            model.version,
+            self.prediction_service.team_stats.features_version,
+            tuple((row['team']['id'], row['playedGames'], row['points']) for row in table),
+            n_simulations,
+            seed
+        )
+        if key in self.cache:
+            record_cache('simulations', hit=True)
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        record_cache('simulations', hit=False)
+        
+        teams = [row['team'] for row in table]
+        team_index = {team['id']: i for i, team in enumerate(teams)}
+        remaining = [
+            f for f in fixtures
+            if f['homeTeam']['id'] in team_index and f['awayTeam']['id'] in team_index
+        ]
+        
+        if remaining:
+            # Every remaining fixture is scored in a single batch
+            goals = await self.prediction_service.predict_expected_goals(
+                [(f['homeTeam']['name'], f['awayTeam']['name']) for f in remaining]
+            )
+        else:
+            goals = np.empty((0, 2))
+        
+        # The simulation is CPU-bound; keep it off the event loop
+        with EXECUTOR_PENDING.track(executor='simulation'):
+            result = await asyncio.get_running_loop().run_in_executor(
+                None,
+                lambda: simulate_season(
+                    np.array([team_index[f['homeTeam']['id']] for f in remaining], dtype=int),
+                    np.array([team_index[f['awayTeam']['id']] for f in remaining], dtype=int),
+                    goals[:, 0],
+                    goals[:, 1],
+                    np.array([row['points'] for row in table]),
+                    np.array([row['goalDifference'] for row in table]),
+                    np.array([row['goalsFor'] for row in table]),
+                    n_simulations=n_simulations,
+                    seed=seed,
+                    chunk_size=settings.simulation_chunk_size,
+                    max_workers=settings.simulation_workers
+                )
+            )
+        
+        simulation = self._summarise(teams, result, n_simulations, model.version, len(remaining))
+        self.cache[key] = simulation
+        while len(self.cache) > settings.simulation_cache_size:
+            self.cache.popitem(last=False)
+        return simulation
+    
+    def _total_table(self, standings: Dict) -> List[Dict]:
+        for group in standings.get('standings', []):
+            if group.get('type', 'TOTAL') == 'TOTAL':
+                return group['table']
+        raise ValueError("No overall standings table available")
+    
+    def _summarise(
+        self,
+        teams: List[Dict],
+        result: Dict,
+        n_simulations: int,
+        model_version: str,
+        n_fixtures: int
+    ) -> Dict:
+        position_probs = result['position_counts'] / n_simulations
+        n_teams = len(teams)
+        relegation_spots = min(settings.simulation_relegation_spots, n_teams)
+        
+        relegation_probs = position_probs[:, n_teams - relegation_spots:].sum(axis=1)
+        summary = []
+        for i, team in enumerate(teams):
+            summary.append({
+                'team_id': team['id'],
+                'team': team['name'],
+                'expected_points': float(result['expected_points'][i]),
+                'title_probability': float(position_probs[i, 0]),
+                'relegation_probability': float(relegation_probs[i]),
+                'position_probabilities': position_probs[i].round(4).tolist()
+            })
+        summary.sort(key=lambda row: -row['expected_points'])
+        
+        return {
+            'model_version': model_version,
+            'simulations': n_simulations,
+            'remaining_fixtures': n_fixtures,
+            'teams': summary
+        }
+
+
+_season_simulator = None
+
+def get_season_simulator() -> SeasonSimulator:
+    """Shared simulator so simulation results stay cached across requests"""
+    global _season_simulator
+    if _season_simulator is None:
+        _season_simulator = SeasonSimulator(get_prediction_service())
+    return _season_simulator
@@ -0,0 +1,103 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+from ..core.config import settings
+from .prediction_service import PredictionService, feature_names
+
+# Dummy inference batch sizes: one row exercises the single-request path
+# (and the flat backend when enabled), a larger one the batched path
+WARMUP_BATCH_SIZES = [1, 16]
+
+
+class Readiness:
+    """Whether this process has finished warming up and can take traffic"""
+    
+    def __init__(self):
+        self.ready = False
+        self.started_at: Optional[datetime] = None
+        self.completed_at: Optional[datetime] = None
+        self.report: Dict = {}
+        self.error: Optional[str] = None
+    
+    def status(self) -> Dict:
+        return {
+            'status': 'ready' if self.ready else 'failed' if self.error else 'warming_up',
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'warmup': self.report,
+            'error': self.error
+        }
+
+
+readiness = Readiness()
+
+
+def _warm_model(service: PredictionService, inferences: int) -> Dict:
+    """Load the model, compile the flat backend if used, and run dummy predictions"""
+    started = time.perf_counter()
+    model = service.model_manager.get_current_model()
+    loaded_s = time.perf_counter() - started
+    
+    if settings.inference_backend == "flat" and model.model_type == "xgboost":
+        model.get_flat_model()
+    
+    n_features = len(feature_names())
+    for batch_size in WARMUP_BATCH_SIZES:
+        rows = np.zeros((batch_size, n_features))
+        for _ in range(inferences):
+            service._process_predictions(model.predict_goals(rows))
+    
+    return {
+        'model_version': model.version,
+        'model_load_s': loaded_s,
+        'model_warmup_s': time.perf_counter() - started
+    }
+
+
+async def _preload_team_features(service: PredictionService, competition_ids: List[int]) -> Dict:
+    """Fill the catalog and team feature cache for the configured leagues"""
+    started = time.perf_counter()
+    catalog = service.team_stats.catalog
+    await catalog.load(service.team_stats.api_client, competition_ids)
+    for team in list(catalog.teams.values()):
+        await service.team_stats.get_team_features(team['name'])
+    return {
+        'competitions': competition_ids,
+        'teams': len(catalog),
+        'team_features_s': time.perf_counter() - started
+    }
+
+
+async def warm_up(service: PredictionService, state: Readiness = readiness) -> Readiness:
+    """Get the process ready to serve, then mark it ready.
+    
+    The model work runs in a thread so liveness checks stay responsive
+    meanwhile. If the model can't be loaded the process never becomes
+    ready and /ready reports why. Team features are best effort: if the
+    football API is unreachable the pod still becomes ready and computes
+    them on demand.
+    """
+    state.started_at = datetime.utcnow()
+    loop = asyncio.get_running_loop()
+    try:
+        state.report = await loop.run_in_executor(
+            None, _warm_model, service, settings.warmup_inferences
+        )
+    except Exception as e:
+        state.error = f"Model warm-up failed: {e}"
+        return state
+    
+    competition_ids = settings.warmup_competitions or list(dict.fromkeys(
+        settings.prescore_competitions + settings.matchup_matrix_competitions
+    ))
+    if competition_ids:
+        try:
+            state.report.update(await _preload_team_features(service, competition_ids))
+        except Exception as e:
+            state.error = f"Team feature preload failed: {e}"
+    
+    state.completed_at = datetime.utcnow()
+    state.ready = True
+    return state
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""In-process latency and throughput of the prediction API.
+
+Drives the FastAPI app through httpx's ASGI transport, so numbers cover
+routing, validation, the prediction service and serialization without
+network noise.
+
+    python -m benchmarks.api_latency                   # print results
+    python -m benchmarks.api_latency --save-baseline   # overwrite the baseline
+    python -m benchmarks.api_latency --compare         # exit 1 on regression
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+import httpx
+import numpy as np
+from app.data.synthetic import generate_matches
+from app.main import app
+from app.services.prediction_service import get_prediction_service
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "api_latency.json")
+# One generated season: every team appears within the first two matchdays
+FIXTURES = generate_matches(n_leagues=1, n_seasons=1, teams_per_league=10, seed=0)
+# Latency regressions smaller than this are treated as noise
+MIN_REGRESSION_MS = 0.5
+
+
+def _fixture(i: int) -> dict:
+    match = FIXTURES.iloc[i % len(FIXTURES)]
+    return {
+        "home_team": match.home_team,
+        "away_team": match.away_team,
+        "match_date": match.date.isoformat()
+    }
+
+
+async def _clear_caches():
+    """Forget everything the service has cached about teams and fixtures"""
+    service = get_prediction_service()
+    await service.team_stats.clear_cache()
+    service.prediction_cache.clear_local()
+    service.explanation_cache.clear()
+
+
+def summarise(timings: List[float], elapsed: float) -> Dict:
+    timings = np.array(timings)
+    return {
+        'requests': int(len(timings)),
+        'throughput_rps': float(len(timings) / elapsed) if elapsed else 0.0,
+        'p50_ms': float(np.percentile(timings, 50)),
+        'p95_ms': float(np.percentile(timings, 95)),
+        'p99_ms': float(np.percentile(timings, 99)),
+    }
+
+
+async def _timed_post(
+    client: httpx.AsyncClient,
+    url: str,
+    payload: dict,
+    timings: List[float],
+    cold: bool = False
+):
+    if cold:
+        await _clear_caches()
+    started = time.perf_counter()
+    response = await client.post(url, json=payload)
+    timings.append((time.perf_counter() - started) * 1000)
+    response.raise_for_status()
+
+
+async def _sequential(client, url, payloads, cold=False) -> Dict:
+    timings = []
+    started = time.perf_counter()
+    for payload in payloads:
+        await _timed_post(client, url, payload, timings, cold)
+    return summarise(timings, time.perf_counter() - started)
+
+
+async def _concurrent(client, url, payloads, clients: int) -> Dict:
+    timings = []
+    
+    async def worker(worker_payloads):
+        for payload in worker_payloads:
+            await _timed_post(client, url, payload, timings)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(payloads[i::clients]) for i in range(clients)))
+    return summarise(timings, time.perf_counter() - started)
+
+
+async def run_scenarios(
+    n_requests: int = 200,
+    batch_size: int = 32,
+    clients: int = 16
+) -> Dict[str, Dict]:
+    """Run every scenario and return its summary keyed by scenario name"""
+    fixtures = [_fixture(i) for i in range(n_requests)]
+    batches = [
+        {"matches": [_fixture(i * batch_size + j) for j in range(batch_size)]}
+        for i in range(max(n_requests // 10, 1))
+    ]
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Load the model and fill caches before anything is timed
+        await client.post("/api/v1/predict", json=fixtures[0])
+        
+        results = {
+            'predict_cold': await _sequential(client, "/api/v1/predict", fixtures, cold=True),
+        }
+        await _sequential(client, "/api/v1/predict", fixtures[:10])
+        results['predict_warm'] = await _sequential(client, "/api/v1/predict", fixtures)
+        results[f'predict_batch_{batch_size}'] = await _sequential(
+            client, "/api/v1/predict/batch", batches
+        )
+        results[f'predict_concurrent_{clients}'] = await _concurrent(
+            client, "/api/v1/predict", fixtures, clients
+        )
+    return results
+
+
+def compare(
+    results: Dict[str, Dict],
+    baseline: Dict[str, Dict],
+    threshold: float = 0.25
+) -> List[str]:
+    """Describe every metric that is more than ``threshold`` worse than the baseline"""
+    regressions = []
+    for scenario, base in baseline.items():
+        current = results.get(scenario)
+        if current is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            limit = max(base[metric] * (1 + threshold), base[metric] + MIN_REGRESSION_MS)
+            if current[metric] > limit:
+                regressions.append(
+                    f"{scenario} {metric}: {current[metric]:.2f} > {base[metric]:.2f} baseline"
+                )
+        if current['throughput_rps'] < base['throughput_rps'] * (1 - threshold):
+            regressions.append(
+                f"{scenario} throughput_rps: {current['throughput_rps']:.1f}"
+                f" < {base['throughput_rps']:.1f} baseline"
+            )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    args = parser.parse_args()
+    
+    results = asyncio.run(run_scenarios(args.requests, clients=args.clients))
+    print(json.dumps(results, indent=2))
+    
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    
+    if args.compare:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""Latency of XGBoost vs the compiled flat-array backend at several batch sizes.
+
+    python -m benchmarks.inference_backends
+"""
+import json
+import time
+import numpy as np
+from app.ml.model_manager import ModelManager
+from app.ml.flat_trees import FlatTreeModel
+
+BATCH_SIZES = [1, 16, 1024]
+
+
+def time_call(fn, repeats: int) -> dict:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings = np.array(timings)
+    return {
+        'p50_ms': float(np.percentile(timings, 50)),
+        'p99_ms': float(np.percentile(timings, 99)),
+    }
+
+
+def run(repeats: int = 200) -> dict:
+    model = ModelManager().create_default_model()
+    booster = model.model.get_booster()
+    flat_model = FlatTreeModel.from_booster(booster)
+    rng = np.random.default_rng(0)
+    
+    results = {}
+    for batch_size in BATCH_SIZES:
+        X = rng.random((batch_size, booster.num_features()))
+        assert flat_model.verify(booster, X), "flat backend disagrees with Booster.predict"
+        results[batch_size] = {
+            'xgboost': time_call(lambda: model.model.predict(X), repeats),
+            'flat': time_call(lambda: flat_model.predict(X), repeats),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,168 @@
+"""How feature engineering, normalization and training scale with history size.
+
+Each (case, size) runs in a fresh process so peak RSS belongs to that case
+alone. Wall time comes from a plain run; allocation peaks from a second
+run under tracemalloc, which slows code down too much to time.
+
+    python -m benchmarks.scaling                          # 1k .. 1M matches
+    python -m benchmarks.scaling --sizes 1000 10000 --output scaling.json
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from app.core.memory import peak_rss_mb, rss_mb
+from app.data.synthetic import synthetic_matches
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def _raw_api_matches(matches: pd.DataFrame) -> List[Dict]:
+    """football-data.org shaped dicts, as normalize_match_data receives them"""
+    dates = matches['date'].dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+    return [
+        {
+            'id': int(row.id),
+            'utcDate': date,
+            'homeTeam': {'id': int(row.home_team_id), 'name': row.home_team},
+            'awayTeam': {'id': int(row.away_team_id), 'name': row.away_team},
+            'score': {
+                'fullTime': {'home': int(row.home_score), 'away': int(row.away_score)},
+                'halfTime': {'home': None, 'away': None}
+            },
+            'competition': {'name': 'Synthetic League'},
+            'season': {'startDate': '2000-08-01'},
+            'matchday': 1,
+            'status': 'FINISHED'
+        }
+        for row, date in zip(matches.itertuples(), dates)
+    ]
+
+
+def _setup_team_stats(matches):
+    from app.data.team_stats import TeamStatsService
+    service = TeamStatsService()
+    # Every match involving one team, most recent first, as the service expects
+    team = matches['home_team'].iloc[0]
+    team_matches = matches[(matches['home_team'] == team) | (matches['away_team'] == team)]
+    team_matches = team_matches.iloc[::-1].reset_index(drop=True)
+    return lambda: service.compute_features(team_matches, team)
+
+
+def _setup_point_in_time(matches):
+    from app.data.feature_history import build_point_in_time_features
+    return lambda: build_point_in_time_features(matches, include_ratings=False)
+
+
+def _setup_normalize(matches):
+    from app.data.football_api_client import FootballAPIClient
+    client = FootballAPIClient()
+    raw = _raw_api_matches(matches)
+    return lambda: client.normalize_match_data(raw)
+
+
+def _setup_prepare(matches):
+    from app.data.feature_history import build_point_in_time_features
+    from app.ml.model_manager import ModelManager
+    manager = ModelManager()
+    frame = build_point_in_time_features(matches, include_ratings=False)
+    return lambda: manager.prepare_training_data(frame)
+
+
+def _setup_train(matches):
+    from app.data.feature_history import build_point_in_time_features
+    from app.ml.model_manager import FootballModel, ModelManager
+    frame = build_point_in_time_features(matches, include_ratings=False)
+    X, y = ModelManager().prepare_training_data(frame)
+    return lambda: FootballModel("xgboost").train(X, y)
+
+
+# case -> builds its inputs (untimed) and returns the call to measure
+CASES: Dict[str, Callable] = {
+    'team_stats_features': _setup_team_stats,
+    'point_in_time_features': _setup_point_in_time,
+    'normalize_match_data': _setup_normalize,
+    'prepare_training_data': _setup_prepare,
+    'model_train': _setup_train,
+}
+
+
+def run_case(case: str, n_matches: int, trace_allocations: bool = True) -> Dict:
+    """Measure one case at one size in the current process"""
+    call = CASES[case](synthetic_matches(n_matches))
+    rss_before = rss_mb()
+    
+    started = time.perf_counter()
+    call()
+    wall_s = time.perf_counter() - started
+    result = {
+        'case': case,
+        'n_matches': n_matches,
+        'wall_s': wall_s,
+        'rss_before_mb': rss_before,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    
+    if trace_allocations:
+        tracemalloc.start()
+        call()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['alloc_peak_mb'] = peak / 2 ** 20
+    return result
+
+
+def _run_case_in_child(args) -> Dict:
+    return run_case(*args)
+
+
+def run(
+    sizes: Optional[List[int]] = None,
+    cases: Optional[List[str]] = None,
+    trace_allocations: bool = True
+) -> Dict:
+    """Report every case at every size, each measured in its own process"""
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for case in cases or list(CASES):
+        for n_matches in sizes or SIZES:
+            with context.Pool(1) as pool:
+                results.append(
+                    pool.apply(_run_case_in_child, ((case, n_matches, trace_allocations),))
+                )
+    return {
+        'generated_at': datetime.utcnow().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'xgboost': xgb.__version__,
+            'cpu_count': multiprocessing.cpu_count(),
+        },
+        'results': results
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument(
+        "--no-tracemalloc", action="store_true", help="skip the allocation-tracing pass"
+    )
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+    
+    report = run(args.sizes, args.cases, not args.no_tracemalloc)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""Cold-start cost of the API process.
+
+Imports ``app.main`` in fresh interpreters: wall time against a target, an
+``-X importtime`` breakdown of where the time goes, and a check that
+training-only modules stay out of the serving process.
+
+    python -m benchmarks.startup               # exit 1 if over target
+    python -m benchmarks.startup --target 2.5 --top 20
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+# Measured on a 1-vCPU container with every dependency installed. XGBoost's
+# scikit-learn wrapper pulls in sklearn.base (and SciPy) on its own, so that
+# share of the time cannot be deferred from here.
+STARTUP_TARGET_S = 3.0
+
+# Only needed to train or evaluate models, never to serve predictions
+# (xgboost's own wrapper already imports sklearn.metrics/model_selection)
+TRAINING_ONLY_MODULES = [
+    'sklearn.ensemble',
+    'pyarrow.parquet',
+    'app.data.feature_history',
+    'app.ml.backtest',
+    'app.ml.shard_training',
+    'app.ml.distill',
+]
+
+
+def _run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, '-c', code],
+        capture_output=True, text=True, check=True
+    )
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Rows of ``-X importtime`` output as dicts with times in seconds"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_s': int(self_us) / 1e6,
+            'cumulative_s': int(cumulative_us) / 1e6,
+        })
+    return rows
+
+
+def import_time_report(module: str = 'app.main', top: int = 15) -> Dict:
+    """Where importing ``module`` spends its time"""
+    rows = parse_importtime(_run_python(f'import {module}', '-X', 'importtime').stderr)
+    root = next(row for row in rows if row['module'] == module)
+    # Packages imported directly by something in the app, ranked by their whole subtree
+    entry_points = [row for row in rows if row['depth'] <= 2 and row['module'] != module]
+    return {
+        'total_s': root['cumulative_s'],
+        'modules': len(rows),
+        'top_cumulative': sorted(entry_points, key=lambda r: r['cumulative_s'], reverse=True)[:top],
+        'top_self': sorted(rows, key=lambda r: r['self_s'], reverse=True)[:top],
+    }
+
+
+def startup_time(module: str = 'app.main', repeats: int = 5) -> Dict:
+    """Wall time of importing ``module`` in fresh interpreters"""
+    code = f'import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)'
+    timings = [float(_run_python(code).stdout) for _ in range(repeats)]
+    return {'min_s': min(timings), 'median_s': statistics.median(timings), 'repeats': repeats}
+
+
+def loaded_training_modules(module: str = 'app.main') -> List[str]:
+    """Training-only modules that importing ``module`` drags in"""
+    code = f'import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))'
+    loaded = set(json.loads(_run_python(code).stdout))
+    return [name for name in TRAINING_ONLY_MODULES if name in loaded]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--target", type=float, default=STARTUP_TARGET_S, help="seconds")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    
+    report = {
+        'startup': startup_time(args.module, args.repeats),
+        'target_s': args.target,
+        'training_modules_loaded': loaded_training_modules(args.module),
+        'import_time': import_time_report(args.module, args.top),
+    }
+    print(json.dumps(report, indent=2))
+    
+    failures = []
+    if report['startup']['median_s'] > args.target:
+        failures.append(
+            f"median import time {report['startup']['median_s']:.2f}s > {args.target:.2f}s target"
+        )
+    if report['training_modules_loaded']:
+        modules = ', '.join(report['training_modules_loaded'])
+        failures.append(f"training-only modules imported: {modules}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
\ No newline at end of file
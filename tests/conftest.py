@@ -0,0 +1,12 @@
+import pytest
+import app.data.ratings as ratings_module
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_ratings_path(tmp_path_factory):
+    """Keep Elo snapshots written on lifespan shutdown out of models/ratings"""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(settings, "ratings_path", str(tmp_path_factory.mktemp("ratings")))
+        mp.setattr(ratings_module, "_team_ratings", None)
+        yield
\ No newline at end of file
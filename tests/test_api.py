@@ -40,4 +40,62 @@ def test_prediction_endpoint_valid_data():
     data = response.json()
     assert "predicted_score_home" in data
     assert "predicted_score_away" in data
-    assert "confidence" in data
\ No newline at end of file
+    assert "confidence" in data
+
+
+def test_model_performance_endpoint():
+    """Test model performance reports the active model and any cached backtest"""
+    response = client.get("/api/v1/model/performance")
+    assert response.status_code == 200
+    data = response.json()
+    assert "version" in data
+    assert "backtest" in data
+
+def test_refresh_settles_predictions():
+    """Test ingesting a result scores the prediction logged for it"""
+    fixture = {
+        "home_team": "Liverpool",
+        "away_team": "Everton",
+        "match_date": "2024-12-07T15:00:00",
+        "league": "Premier League"
+    }
+    assert client.post("/api/v1/predict", json=fixture).status_code == 200
+    
+    response = client.post(
+        "/api/v1/data/refresh",
+        json=[{**fixture, "home_score": 2, "away_score": 0}]
+    )
+    assert response.status_code == 200
+    assert response.json()["predictions_settled"] == 1
+    assert response.json()["ratings_updated"] == 1
+    
+    # Re-sending the same result doesn't count it twice
+    response = client.post(
+        "/api/v1/data/refresh",
+        json=[{**fixture, "home_score": 2, "away_score": 0}]
+    )
+    assert response.json()["ratings_updated"] == 0
+    
+    live = client.get("/api/v1/model/performance").json()["live"]
+    assert "Premier League" in live["leagues"]
+
+def test_batch_prediction_endpoint():
+    """Test batch prediction returns one prediction per fixture"""
+    response = client.post(
+        "/api/v1/predict/batch",
+        json={"matches": [
+            {"home_team": "Arsenal", "away_team": "Chelsea", "match_date": "2024-12-01T15:00:00"},
+            {"home_team": "Chelsea", "away_team": "Arsenal", "match_date": "2025-04-01T15:00:00"}
+        ]}
+    )
+    assert response.status_code == 200
+    assert [p["home_team"] for p in response.json()] == ["Arsenal", "Chelsea"]
+
+def test_explain_endpoint():
+    """Test the explanation endpoint returns per-feature contributions"""
+    response = client.post(
+        "/api/v1/predict/explain",
+        json={"home_team": "Arsenal", "away_team": "Chelsea", "match_date": "2024-12-01T15:00:00"}
+    )
+    assert response.status_code == 200
+    assert "contributions" in response.json()["home_goals"]
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+from app.ml.backtest import Backtester, BacktestCache, score_predictions
+from app.ml.model_manager import FootballModel
+
+def _league_history(league, seasons=3, matchdays=10, fixtures_per_matchday=6, seed=0):
+    """Synthetic league history with goal rates driven by the features"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for season in range(seasons):
+        season_start = pd.Timestamp(f"{2020 + season}-08-01", tz="UTC")
+        for matchday in range(1, matchdays + 1):
+            kickoff = season_start + pd.Timedelta(days=7 * matchday)
+            home_attack = rng.random(fixtures_per_matchday) * 3
+            away_attack = rng.random(fixtures_per_matchday) * 3
+            for i in range(fixtures_per_matchday):
+                rows.append({
+                    'date': kickoff,
+                    'season': 2020 + season,
+                    'competition': league,
+                    'matchday': matchday,
+                    'home_team_avg_goals': home_attack[i],
+                    'away_team_avg_goals': away_attack[i],
+                    'home_score': rng.poisson(home_attack[i]),
+                    'away_score': rng.poisson(away_attack[i]),
+                })
+    return pd.DataFrame(rows)
+
+def test_score_predictions_perfect_forecast():
+    """Test metrics on predictions that match the results"""
+    rows = np.array([[3.0, 0.0, 3, 0], [0.0, 3.0, 0, 3]], dtype=float)
+    metrics = score_predictions(rows)
+    
+    assert metrics['mae'] == 0
+    assert metrics['outcome_accuracy'] == 1
+    assert metrics['brier_score'] < 0.2
+    assert sum(b['count'] for b in metrics['calibration']) == 6
+
+def test_backtest_walk_forward():
+    """Test the backtest replays every season after the first, per league"""
+    matches = pd.concat([
+        _league_history("Premier League", seed=1),
+        _league_history("La Liga", seed=2)
+    ])
+    result = Backtester(max_workers=2, refit_every=5).run(matches)
+    
+    assert result['seasons'] == ['2021', '2022']
+    assert set(result['leagues']) == {"Premier League", "La Liga"}
+    # First season is training only: 2 seasons x 10 matchdays x 6 fixtures
+    assert result['leagues']['La Liga']['matches'] == 120
+    assert result['overall']['matches'] == 240
+    assert 0 <= result['overall']['brier_score'] <= 2
+
+def test_backtest_uses_given_estimator():
+    """Test the backtest refits the reported model's configuration, single-threaded"""
+    model = FootballModel("xgboost")
+    model.model.set_params(max_depth=3, n_estimators=20)
+    backtester = Backtester(estimator=model.model)
+    
+    params = backtester.estimator.get_params()
+    assert (params['max_depth'], params['n_estimators'], params['n_jobs']) == (3, 20, 1)
+    assert params['multi_strategy'] == model.model.get_params()['multi_strategy']
+    assert model.model.get_params()['n_jobs'] is None
+
+def test_backtest_cache_round_trip(tmp_path):
+    """Test cached results are read back from disk by a fresh cache"""
+    BacktestCache(str(tmp_path)).set("1.0.1", {'overall': {'mae': 1.1}})
+    
+    assert BacktestCache(str(tmp_path)).get("1.0.1") == {'overall': {'mae': 1.1}}
+    assert BacktestCache(str(tmp_path)).get("missing") is None
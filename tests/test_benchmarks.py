@@ -0,0 +1,72 @@
+import pytest
+from benchmarks.api_latency import compare, run_scenarios
+from benchmarks.scaling import CASES, run_case
+from benchmarks.startup import loaded_training_modules, parse_importtime
+
+def _scenario(throughput_rps, p50_ms, p95_ms, p99_ms, requests=100):
+    return {
+        'requests': requests,
+        'throughput_rps': throughput_rps,
+        'p50_ms': p50_ms,
+        'p95_ms': p95_ms,
+        'p99_ms': p99_ms
+    }
+
+BASELINE = {'predict_warm': _scenario(300.0, 3.0, 4.0, 10.0)}
+
+def test_compare_flags_regressions():
+    """Test latency and throughput regressions beyond the threshold are reported"""
+    current = {'predict_warm': _scenario(200.0, 3.2, 4.1, 20.0)}
+    
+    regressions = compare(current, BASELINE, threshold=0.25)
+    
+    assert len(regressions) == 2
+    assert any('p99_ms' in r for r in regressions)
+    assert any('throughput_rps' in r for r in regressions)
+
+def test_compare_ignores_small_absolute_changes():
+    """Test sub-noise slowdowns and unknown scenarios are not regressions"""
+    current = {
+        'predict_warm': _scenario(290.0, 3.4, 4.2, 10.2),
+        'new_scenario': _scenario(1.0, 99.0, 99.0, 99.0, requests=1)
+    }
+    
+    assert compare(current, BASELINE, threshold=0.25) == []
+
+@pytest.mark.asyncio
+async def test_run_scenarios_smoke():
+    """Test every scenario runs against the in-process app"""
+    results = await run_scenarios(n_requests=10, batch_size=4, clients=2)
+    
+    assert set(results) == {
+        'predict_cold', 'predict_warm', 'predict_batch_4', 'predict_concurrent_2'
+    }
+    assert all(r['requests'] > 0 and r['p99_ms'] >= r['p50_ms'] for r in results.values())
+
+@pytest.mark.parametrize("case", list(CASES))
+def test_scaling_case_reports_time_and_memory(case):
+    """Test each scaling case runs on a small history and reports its measurements"""
+    result = run_case(case, 1000, trace_allocations=case == 'prepare_training_data')
+    
+    assert result['case'] == case and result['n_matches'] == 1000
+    assert result['wall_s'] > 0
+    assert result['peak_rss_mb'] > 0 and result['rss_before_mb'] > 0
+    if case == 'prepare_training_data':
+        assert result['alloc_peak_mb'] > 0
+
+def test_parse_importtime():
+    """Test -X importtime lines parse into per-module seconds and depth"""
+    rows = parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     json.decoder\n"
+        "import time:      2000 |       2120 |   json\n"
+    )
+    
+    assert rows == [
+        {'module': 'json.decoder', 'depth': 2, 'self_s': 0.00012, 'cumulative_s': 0.00012},
+        {'module': 'json', 'depth': 1, 'self_s': 0.002, 'cumulative_s': 0.00212},
+    ]
+
+def test_serving_does_not_import_training_modules():
+    """Test importing the API leaves training-only modules unloaded"""
+    assert loaded_training_modules('app.main') == []
\ No newline at end of file
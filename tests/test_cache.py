@@ -0,0 +1,157 @@
+import asyncio
+import time
+import pytest
+from datetime import datetime
+from app.core.cache import InMemoryRedis, RecordCodec, TwoLevelCache
+from app.core.config import settings
+from app.data.team_stats import TEAM_FEATURES_CODEC
+from app.ml.model_manager import PREDICTIONS_CACHE, ModelManager
+from app.services.prediction_service import PredictionService
+
+CODEC = RecordCodec(
+    ['home_goals', 'away_goals', 'most_likely_home'], int_fields=['most_likely_home']
+)
+
+def test_codec_round_trip():
+    """Test records pack into a fixed-size payload and decode with their field names"""
+    payload = CODEC.encode({'home_goals': 1.25, 'away_goals': 0.5, 'most_likely_home': 1})
+    
+    assert len(payload) == 1 + 3 * 8
+    assert CODEC.decode(payload) == {'home_goals': 1.25, 'away_goals': 0.5, 'most_likely_home': 1}
+    assert CODEC.decode(b'\x02' + payload[1:]) is None
+    assert len(TEAM_FEATURES_CODEC.encode({})) == 1 + len(TEAM_FEATURES_CODEC.fields) * 4
+
+@pytest.mark.asyncio
+async def test_replicas_share_l2_in_one_round_trip():
+    """Test one replica's writes are served to another from a single MGET"""
+    redis = InMemoryRedis()
+    writer = TwoLevelCache('predictions', CODEC, client=redis)
+    reader = TwoLevelCache('predictions', CODEC, client=redis)
+    
+    await writer.set_many({
+        f'k{i}': {'home_goals': i, 'away_goals': 0, 'most_likely_home': 0} for i in range(5)
+    })
+    round_trips = redis.round_trips
+    found = await reader.get_many([f'k{i}' for i in range(8)])
+    
+    assert redis.round_trips == round_trips + 1
+    assert sorted(found) == [f'k{i}' for i in range(5)]
+    assert found['k3']['home_goals'] == 3
+    # Now in the reader's L1: no further Redis traffic
+    await reader.get_many(['k3'])
+    assert redis.round_trips == round_trips + 1
+
+@pytest.mark.asyncio
+async def test_invalidation_reaches_other_replicas():
+    """Test invalidating on one replica clears the others and skips old L2 entries"""
+    redis = InMemoryRedis()
+    notes = []
+    replicas = [
+        TwoLevelCache('predictions', CODEC, client=redis, on_invalidate=notes.append)
+        for _ in range(2)
+    ]
+    for replica in replicas:
+        await replica.start()
+    
+    await replicas[0].set('k', {'home_goals': 1, 'away_goals': 1, 'most_likely_home': 1})
+    await replicas[1].get('k')
+    await replicas[0].invalidate(note='1.0.2')
+    await asyncio.sleep(0.01)
+    
+    assert replicas[1].generation == replicas[0].generation == 1
+    assert len(replicas[1].local) == 0
+    assert notes == ['1.0.2']
+    assert await replicas[1].get('k') is None
+    for replica in replicas:
+        await replica.stop()
+
+@pytest.mark.asyncio
+async def test_redis_errors_are_misses():
+    """Test an unreachable Redis degrades to the in-process cache"""
+    class DownRedis(InMemoryRedis):
+        async def mget(self, keys):
+            raise ConnectionError("redis down")
+    
+    cache = TwoLevelCache('predictions', CODEC, client=DownRedis(), max_local=2)
+    assert await cache.get_many(['a', 'b']) == {}
+    
+    for key in 'abc':
+        cache.set_local(key, {'home_goals': 0})
+    assert list(cache.local) == ['b', 'c']
+
+@pytest.mark.asyncio
+async def test_prediction_served_from_another_replica():
+    """Test a replica answers from predictions another replica cached in Redis"""
+    redis = InMemoryRedis()
+    replicas = [PredictionService() for _ in range(2)]
+    for service in replicas:
+        service.prediction_cache.client = redis
+        service.team_stats.features_cache.client = redis
+    replicas[1].model_manager.current_model = replicas[0].model_manager.get_current_model()
+    
+    live = await replicas[0].predict_match("Arsenal", "Chelsea", datetime(2024, 12, 1))
+    
+    async def no_inference(pairs):
+        raise AssertionError("expected a cache hit")
+    replicas[1].predict_expected_goals = no_inference
+    cached = await replicas[1].predict_match("Arsenal", "Chelsea", datetime(2024, 12, 1))
+    
+    assert cached.predicted_score_home == pytest.approx(live.predicted_score_home)
+    assert cached.win_probability_home == pytest.approx(live.win_probability_home)
+    assert cached.most_likely_score_home == live.most_likely_score_home
+
+@pytest.mark.asyncio
+async def test_listener_resubscribes_and_catches_up(monkeypatch):
+    """Test a replica that loses its subscription reconnects and applies what it missed"""
+    monkeypatch.setattr(settings, 'redis_reconnect_seconds', 0.01)
+    
+    class FlakyRedis(InMemoryRedis):
+        subscriptions = 0
+        
+        def pubsub(self):
+            pubsub = super().pubsub()
+            self.subscriptions += 1
+            if self.subscriptions == 1:
+                async def dropped():
+                    raise ConnectionError("connection reset")
+                    yield
+                pubsub.listen = dropped
+            return pubsub
+    
+    redis = FlakyRedis()
+    notes = []
+    replica = TwoLevelCache('predictions', CODEC, client=redis, on_invalidate=notes.append)
+    other = TwoLevelCache('predictions', CODEC, client=redis)
+    await replica.start()
+    await other.invalidate(note='1.0.9')
+    await asyncio.sleep(0.1)
+    
+    assert redis.subscriptions == 2
+    assert replica.generation == 1
+    assert notes == ['1.0.9']
+    # Live again
+    await other.invalidate(note='1.0.10')
+    await asyncio.sleep(0.01)
+    assert notes == ['1.0.9', '1.0.10']
+    await replica.stop()
+
+@pytest.mark.asyncio
+async def test_replica_loads_announced_model(tmp_path, monkeypatch):
+    """Test a serving replica swaps to the model version a training job announced"""
+    monkeypatch.setattr(settings, 'model_path', str(tmp_path))
+    redis = InMemoryRedis()
+    service = PredictionService()
+    service.prediction_cache.client = redis
+    await service.prediction_cache.start()
+    serving = service.model_manager.get_current_model()
+    
+    new_model = ModelManager().create_default_model()
+    new_model.version = "1.0.2"
+    new_model.save(str(tmp_path / "football_model_1.0.2.joblib"))
+    await TwoLevelCache(PREDICTIONS_CACHE, CODEC, client=redis).invalidate(note="1.0.2")
+    
+    deadline = time.time() + 10
+    while service.model_manager.current_model is serving and time.time() < deadline:
+        await asyncio.sleep(0.05)
+    assert service.model_manager.current_model.version == "1.0.2"
+    await service.prediction_cache.stop()
\ No newline at end of file
@@ -0,0 +1,112 @@
+import numpy as np
+from app.core.config import settings
+from app.ml import distill
+from app.ml.distill import compress_model, truncated_candidate
+from app.ml.model_manager import FootballModel, ModelManager
+
+def _teacher():
+    rng = np.random.default_rng(0)
+    X = rng.random((400, 10))
+    y = rng.poisson(1 + X[:, :2] * 2)
+    teacher = FootballModel("xgboost")
+    # The last 100 rows are the evaluation holdout in these tests
+    teacher.train(X[:300], y[:300])
+    return teacher, X, y
+
+def test_truncated_candidate_keeps_first_trees():
+    """Test truncation keeps the requested number of boosting rounds"""
+    teacher, X, _ = _teacher()
+    candidate = truncated_candidate(teacher, 10)
+    
+    assert candidate.num_trees() == 10
+    assert candidate.predict(X[:2]).shape == (2, 2)
+
+def test_compress_model_respects_latency_budget():
+    """Test every candidate is scored and the choice fits the budget"""
+    teacher, X, y = _teacher()
+    result = compress_model(
+        teacher, X[:300], X[300:], y[300:],
+        latency_budget_ms=1000, tree_counts=[10], student_depths=[2]
+    )
+    
+    names = {row['name'] for row in result['candidates']}
+    assert names == {'teacher', 'truncated_10', 'student_d2_10'}
+    assert result['best'] in names
+    assert all('p99_ms' in row and 'brier_score' in row for row in result['candidates'])
+
+def test_compress_model_without_eligible_candidate():
+    """Test nothing is chosen when no candidate fits an impossible budget"""
+    teacher, X, y = _teacher()
+    result = compress_model(
+        teacher, X[:300], X[300:], y[300:],
+        latency_budget_ms=1e-9, tree_counts=[10], student_depths=[2]
+    )
+    
+    assert result['best'] is None
+    assert result['model'] is None
+
+def _manager_with_teacher(tmp_path, monkeypatch, latency_budget_ms):
+    """A manager whose teacher was trained on the whole history, latency fixed by tree count"""
+    import pandas as pd
+    monkeypatch.setattr(settings, "latency_budget_ms", latency_budget_ms)
+    # 0.01 ms per tree: the 100-tree teacher takes 1 ms, 25-tree candidates 0.25 ms
+    monkeypatch.setattr(
+        distill, "measure_latency",
+        lambda model, X: {'p50_ms': model.num_trees() * 0.01, 'p99_ms': model.num_trees() * 0.01}
+    )
+    manager = ModelManager()
+    manager.model_path = str(tmp_path)
+    rng = np.random.default_rng(0)
+    history = pd.DataFrame({
+        'home_team_avg_goals': rng.random(300) * 3,
+        'home_score': rng.poisson(1.5, 300),
+        'away_score': rng.poisson(1.2, 300),
+    })
+    # Including the last 20% that compress_model holds out
+    teacher = manager.train_new_model(history)
+    return manager, teacher, history
+
+
+def test_manager_registers_compressed_model(tmp_path, monkeypatch):
+    """Test the manager activates a compressed candidate when the teacher is too slow"""
+    manager, teacher, history = _manager_with_teacher(tmp_path, monkeypatch, latency_budget_ms=0.5)
+    
+    result = manager.compress_model(history)
+    
+    assert result['best'] != 'teacher'
+    assert manager.current_model.version == result['registered_version']
+    assert manager.current_model.num_trees() <= 50
+    assert manager.current_model.performance_metrics['compressed_from'] == teacher.version
+
+
+def test_manager_scores_candidates_on_unseen_rows(tmp_path, monkeypatch):
+    """Test candidates are scored on rows the teacher didn't see, the winner rebuilt from it"""
+    manager, teacher, history = _manager_with_teacher(tmp_path, monkeypatch, latency_budget_ms=0.3)
+    scored = []
+    evaluate_candidate = distill.evaluate_candidate
+    
+    def recording_evaluate(model, X_eval, y_eval):
+        scored.append(model)
+        return evaluate_candidate(model, X_eval, y_eval)
+    
+    monkeypatch.setattr(distill, "evaluate_candidate", recording_evaluate)
+    monkeypatch.setattr(settings, "distill_student_depths", [])
+    result = manager.compress_model(history)
+    
+    assert all(model is not teacher for model in scored)
+    assert result['best'] == 'truncated_25'
+    X, _ = manager.prepare_training_data(history)
+    np.testing.assert_allclose(
+        manager.current_model.predict(X[:5]), truncated_candidate(teacher, 25).predict(X[:5])
+    )
+
+
+def test_manager_keeps_teacher_when_nothing_fits(tmp_path, monkeypatch):
+    """Test the current model stays active when no candidate fits the budget"""
+    manager, teacher, history = _manager_with_teacher(tmp_path, monkeypatch, latency_budget_ms=0.1)
+    
+    result = manager.compress_model(history)
+    
+    assert result['best'] is None
+    assert 'registered_version' not in result
+    assert manager.current_model is teacher
\ No newline at end of file
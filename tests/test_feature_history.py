@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+from app.data.feature_history import build_point_in_time_features
+from app.ml.model_manager import ModelManager
+
+TEAMS = ['Arsenal', 'Chelsea', 'Liverpool', 'Everton', 'Fulham']
+
+def _random_history(n_matches=120, seed=3):
+    rng = np.random.default_rng(seed)
+    home = rng.integers(0, len(TEAMS), n_matches)
+    away = (home + rng.integers(1, len(TEAMS), n_matches)) % len(TEAMS)
+    return pd.DataFrame({
+        # Several matches share a day, and rows are not in date order
+        'date': (
+            pd.Timestamp('2023-08-01')
+            + pd.to_timedelta(rng.integers(0, 60, n_matches), unit='D')
+        ),
+        'home_team': [TEAMS[i] for i in home],
+        'away_team': [TEAMS[i] for i in away],
+        'home_score': rng.poisson(1.5, n_matches),
+        'away_score': rng.poisson(1.1, n_matches),
+    })
+
+def _naive_features(history, match, window):
+    """Features recomputed from scratch using only earlier days"""
+    before = history[history['date'].dt.normalize() < match['date'].normalize()]
+    before = before.sort_values('date', kind='stable')
+    
+    def goals_for(team):
+        games = before[(before['home_team'] == team) | (before['away_team'] == team)].tail(window)
+        scored = np.where(games['home_team'] == team, games['home_score'], games['away_score'])
+        return scored.mean() if len(scored) else np.nan
+    
+    home, away = match['home_team'], match['away_team']
+    meetings = before[
+        ((before['home_team'] == home) & (before['away_team'] == away))
+        | ((before['home_team'] == away) & (before['away_team'] == home))
+    ]
+    won = np.where(
+        meetings['home_team'] == match['home_team'],
+        meetings['home_score'] > meetings['away_score'],
+        meetings['away_score'] > meetings['home_score']
+    )
+    h2h = won.mean() if len(won) else np.nan
+    return goals_for(match['home_team']), goals_for(match['away_team']), h2h
+
+def test_point_in_time_features_match_naive_recomputation():
+    """Test the single-pass builder equals recomputing each match from scratch"""
+    history = _random_history()
+    frame = build_point_in_time_features(history, window=4, include_ratings=False)
+    
+    for i, match in history.iterrows():
+        home_avg, away_avg, h2h = _naive_features(history, match, window=4)
+        np.testing.assert_allclose(
+            frame.loc[i, ['home_team_avg_goals', 'away_team_avg_goals', 'head_to_head_home_wins']]
+            .to_numpy(dtype=float),
+            [home_avg, away_avg, h2h]
+        )
+
+def test_first_match_has_no_history():
+    """Test a team's first match carries no information about its own result"""
+    history = pd.DataFrame({
+        'date': pd.to_datetime(['2024-08-10', '2024-08-17']),
+        'home_team': ['Arsenal', 'Chelsea'],
+        'away_team': ['Chelsea', 'Arsenal'],
+        'home_score': [5, 0],
+        'away_score': [0, 0],
+    })
+    frame = build_point_in_time_features(history, include_ratings=False)
+    
+    assert np.isnan(frame.loc[0, 'home_team_avg_goals'])
+    assert frame.loc[1, 'away_team_avg_goals'] == 5
+    assert frame.loc[1, 'head_to_head_home_wins'] == 0
+    assert frame.loc[1, 'days_since_last_match'] == 7
+
+def test_training_frame_feeds_model_training(tmp_path):
+    """Test the point-in-time frame trains a model directly"""
+    manager = ModelManager()
+    manager.model_path = str(tmp_path)
+    
+    frame = manager.build_training_frame(_random_history(200))
+    model = manager.train_new_model(frame)
+    
+    assert model.performance_metrics['train_samples'] == 160
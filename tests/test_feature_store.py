@@ -0,0 +1,108 @@
+import os
+import numpy as np
+import pytest
+from app.core.config import settings
+from app.data.feature_store import (
+    TEAM_FEATURE_KEYS,
+    SharedFeatureTable,
+    publish_features,
+    publish_team_features,
+    read_current_version
+)
+from app.data.team_catalog import TeamCatalog
+from app.data.team_stats import TeamStatsService
+
+def _features(value):
+    return {key: value for key in TEAM_FEATURE_KEYS}
+
+def test_publish_and_lookup(tmp_path):
+    """Test published rows are read back as float32 views of one matrix"""
+    version = publish_features(
+        str(tmp_path), {57: _features(1.5), 'Chelsea': _features(0.25)}, {57: 'Arsenal FC'}
+    )
+    table = SharedFeatureTable(str(tmp_path), check_seconds=0)
+    
+    assert version == 1 and table.refresh()
+    assert table.lookup(57).dtype == np.float32
+    assert np.all(table.lookup(57) == 1.5)
+    assert table.get_features('Arsenal FC')['win_rate'] == 1.5
+    assert table.get_features('Chelsea')['win_rate'] == 0.25
+    assert table.lookup('Liverpool') is None
+    
+    rows, found = table.lookup_rows([57, 'Liverpool', 'Chelsea'])
+    assert found.tolist() == [True, False, True]
+    assert rows.shape == (3, len(TEAM_FEATURE_KEYS))
+    assert np.all(rows[1] == 0)
+
+def test_versions_swap_and_are_double_buffered(tmp_path):
+    """Test readers switch to a new version and only two versions stay on disk"""
+    directory = str(tmp_path)
+    publish_features(directory, {1: _features(1.0)})
+    table = SharedFeatureTable(directory, check_seconds=0)
+    old_row = table.lookup(1)
+    
+    for value in (2.0, 3.0):
+        publish_features(directory, {1: _features(value)})
+    
+    assert read_current_version(directory) == 3
+    assert old_row[0] == 1.0  # a mapping of a pruned version stays readable
+    assert table.lookup(1)[0] == 3.0 and table.version == 3
+    assert sorted(f for f in os.listdir(directory) if f.endswith('.npy')) == [
+        'features_v00000002.npy', 'features_v00000003.npy'
+    ]
+
+def test_refresh_is_rate_limited(tmp_path):
+    """Test the CURRENT pointer is only re-read every check_seconds"""
+    directory = str(tmp_path)
+    publish_features(directory, {1: _features(1.0)})
+    table = SharedFeatureTable(directory, check_seconds=3600)
+    table.refresh()
+    publish_features(directory, {1: _features(2.0)})
+    
+    assert table.lookup(1)[0] == 1.0
+    assert table.refresh(force=True)
+    assert table.lookup(1)[0] == 2.0
+
+@pytest.mark.asyncio
+async def test_team_stats_reads_shared_features(tmp_path, monkeypatch):
+    """Test the service serves published features and tracks their version"""
+    monkeypatch.setattr(settings, "feature_store_path", str(tmp_path))
+    monkeypatch.setattr(settings, "feature_store_check_seconds", 0)
+    publisher = TeamStatsService()
+    publisher.catalog = TeamCatalog()
+    publisher.catalog.add_teams([
+        {'id': 57, 'name': 'Arsenal FC', 'shortName': 'Arsenal', 'tla': 'ARS'}
+    ])
+    await publish_team_features(publisher, ['Arsenal FC'])
+    
+    service = TeamStatsService()
+    service.catalog = TeamCatalog()
+    version = service.features_version
+    features = await service.get_team_features('Arsenal FC')
+    
+    recent_matches = await publisher._get_recent_matches('Arsenal FC')
+    expected = publisher.compute_features(recent_matches, 'Arsenal FC')
+    assert features['team'] == 'Arsenal FC'
+    assert features['win_rate'] == pytest.approx(expected['win_rate'], rel=1e-6)
+    assert service.cache == {}
+    
+    await publish_team_features(publisher, ['Arsenal FC'])
+    assert service.features_version != version
+    # Cache generation and table version are separate components
+    await service.clear_cache()
+    assert service.features_version == "1.2"
+
+@pytest.mark.asyncio
+async def test_team_feature_rows_mix_published_and_cached(tmp_path, monkeypatch):
+    """Test feature rows come from the shared table, with the rest computed"""
+    monkeypatch.setattr(settings, "feature_store_path", str(tmp_path))
+    service = TeamStatsService()
+    service.catalog = TeamCatalog()
+    await publish_team_features(service, ['Arsenal FC'])
+    
+    rows = await service.get_many_team_feature_rows(['Chelsea', 'Arsenal FC'])
+    features = await service.get_many_team_features(['Chelsea', 'Arsenal FC'])
+    
+    expected = [[f[k] for k in TEAM_FEATURE_KEYS] for f in features]
+    np.testing.assert_allclose(rows, expected, rtol=1e-6)
+    assert list(service.cache) == ['Chelsea']
\ No newline at end of file
@@ -0,0 +1,66 @@
+import pytest
+import numpy as np
+import xgboost as xgb
+from app.core.config import settings
+from app.ml.flat_trees import FlatTreeModel, compile_booster
+from app.ml.model_manager import FootballModel
+
+def _fitted_regressor(y, **params):
+    rng = np.random.default_rng(0)
+    X = rng.random((300, 10))
+    model = xgb.XGBRegressor(n_estimators=30, max_depth=5, **params)
+    model.fit(X, y(rng, 300))
+    return model
+
+@pytest.mark.parametrize("targets", [
+    lambda rng, n: rng.poisson(1.4, (n, 2)),
+    lambda rng, n: rng.poisson(2.7, n),
+])
+def test_flat_model_matches_booster(targets):
+    """Test compiled inference reproduces Booster.predict, including missing values"""
+    model = _fitted_regressor(targets)
+    flat_model = FlatTreeModel.from_booster(model.get_booster())
+    
+    X = np.random.default_rng(1).random((50, 10))
+    X[::5, 2] = np.nan
+    
+    np.testing.assert_allclose(flat_model.predict(X), model.predict(X), atol=1e-4)
+    assert flat_model.predict(X[:1]).shape == model.predict(X[:1]).shape
+
+def test_vector_leaf_models_are_not_compiled():
+    """Test multi_output_tree boosters fall back to XGBoost"""
+    model = _fitted_regressor(
+        lambda rng, n: rng.poisson(1.4, (n, 2)),
+        tree_method="hist", multi_strategy="multi_output_tree"
+    )
+    
+    assert compile_booster(model.get_booster()) is None
+
+def test_football_model_flat_backend(monkeypatch):
+    """Test the flat backend is used for small batches when selected"""
+    monkeypatch.setattr(settings, "inference_backend", "flat")
+    model = FootballModel("xgboost")
+    X = np.random.random((100, 10))
+    model.train(X, np.random.poisson(1.4, (100, 2)))
+    
+    flat_prediction = model.predict(X[:3])
+    
+    assert model.get_flat_model() is not None
+    np.testing.assert_allclose(flat_prediction, model.model.predict(X[:3]), atol=1e-4)
+
+def test_split_probe_rows_reach_rating_scale_splits():
+    """Test verification rows catch errors on splits outside [0, 1), e.g. Elo ratings"""
+    rng = np.random.default_rng(0)
+    X = rng.random((300, 3))
+    X[:, 2] = 1000 + 1000 * X[:, 2]
+    model = xgb.XGBRegressor(n_estimators=10, max_depth=3)
+    model.fit(X, X[:, 2] / 500 + rng.random(300))
+    booster = model.get_booster()
+    flat_model = FlatTreeModel.from_booster(booster)
+    probe_rows = flat_model.split_probe_rows(3)
+    assert flat_model.verify(booster, probe_rows)
+    
+    # Shift the rating thresholds: uniform rows never notice, probe rows do
+    flat_model._threshold[flat_model._feature == 2] += 0.5
+    assert flat_model.verify(booster, rng.random((64, 3)))
+    assert not flat_model.verify(booster, probe_rows)
@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.core.metrics import Counter, Gauge, Histogram, Registry
+from app.main import app
+
+def test_histogram_buckets_are_cumulative():
+    """Test observations land in cumulative le buckets with sum and count"""
+    registry = Registry()
+    histogram = registry.register(
+        Histogram('stage_seconds', 'Stage latency', ('stage',), buckets=(0.1, 1.0))
+    )
+    histogram.observe(0.05, stage='a')
+    histogram.observe(0.5, stage='a')
+    histogram.observe(5, stage='a')
+    
+    text = registry.render()
+    
+    assert '# TYPE stage_seconds histogram' in text
+    assert 'stage_seconds_bucket{stage="a",le="0.1"} 1' in text
+    assert 'stage_seconds_bucket{stage="a",le="1.0"} 2' in text
+    assert 'stage_seconds_bucket{stage="a",le="+Inf"} 3' in text
+    assert 'stage_seconds_count{stage="a"} 3' in text
+    assert 'stage_seconds_sum{stage="a"} 5.55' in text
+
+def test_counter_gauge_and_collect():
+    """Test counters, gauges and scrape-time callbacks render with labels"""
+    registry = Registry()
+    counter = registry.register(Counter('lookups_total', 'Lookups', ('result',)))
+    gauge = registry.register(Gauge('in_flight', 'In flight'))
+    registry.register(Gauge('queue', 'Queue', ('name',), collect=lambda: {('x',): 3}))
+    counter.inc(result='hit')
+    counter.inc(2, result='hit')
+    with gauge.track():
+        assert gauge.get() == 1
+    
+    text = registry.render()
+    
+    assert 'lookups_total{result="hit"} 3.0' in text
+    assert 'in_flight 0.0' in text
+    assert 'queue{name="x"} 3.0' in text
+
+def test_duplicate_metric_rejected():
+    """Test a metric name can only be registered once"""
+    registry = Registry()
+    registry.register(Counter('dup', 'Dup'))
+    with pytest.raises(ValueError):
+        registry.register(Counter('dup', 'Dup'))
+
+def test_metrics_endpoint_reports_prediction_stages():
+    """Test a prediction shows up as stage timings and request latency"""
+    client = TestClient(app)
+    client.post("/api/v1/predict", json={
+        "home_team": "Arsenal",
+        "away_team": "Chelsea",
+        "match_date": "2024-03-15T15:00:00"
+    })
+    
+    response = client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'prediction_stage_duration_seconds_count{stage="model_predict"' in response.text
+    assert (
+        'http_request_duration_seconds_count{method="POST",route="/api/v1/predict",status="200"}'
+        in response.text
+    )
+    assert 'cache_requests_total{cache="precomputed"' in response.text
+    assert 'online_eval_pending_predictions' in response.text
\ No newline at end of file
@@ -1,5 +1,9 @@
 import pytest
 import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from app.core.config import settings
+import app.ml.model_manager as model_manager
 from app.ml.model_manager import ModelManager, FootballModel
 
 def test_model_manager_init():
@@ -45,4 +49,90 @@ def test_model_performance_tracking():
     
     assert isinstance(performance, dict)
     # Should have at least version info
-    assert "version" in performance
\ No newline at end of file
+    assert "version" in performance
+
+def _match_history(n_matches, start):
+    """Synthetic match history with the columns prepare_training_data reads"""
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'date': pd.date_range(start, periods=n_matches, freq='D', tz='UTC'),
+        'home_team_avg_goals': rng.random(n_matches) * 3,
+        'away_team_avg_goals': rng.random(n_matches) * 3,
+        'home_score': rng.poisson(1.5, n_matches),
+        'away_score': rng.poisson(1.2, n_matches),
+    })
+
+def test_incremental_update_adds_trees(tmp_path):
+    """Test warm-start update continues the previous booster"""
+    manager = ModelManager()
+    manager.model_path = str(tmp_path)
+    
+    history = _match_history(200, "2020-01-01")
+    model = manager.train_new_model(history)
+    trees_before = model.num_trees()
+    
+    # Matches played after the model was trained
+    new_matches = _match_history(30, datetime.utcnow() + timedelta(days=1))
+    updated = manager.update_model(pd.concat([history, new_matches]))
+    
+    assert updated is manager.current_model
+    assert updated.num_trees() == trees_before + settings.incremental_trees
+    assert updated.performance_metrics['incremental_samples'] == 30
+    # The previous model is left untouched
+    assert model.num_trees() == trees_before
+
+def test_incremental_update_without_new_matches(tmp_path):
+    """Test update is a no-op when nothing was played since training"""
+    manager = ModelManager()
+    manager.model_path = str(tmp_path)
+    
+    history = _match_history(100, "2020-01-01")
+    model = manager.train_new_model(history)
+    
+    assert manager.update_model(history) is model
+
+def test_incremental_refresh_keeps_tree_count():
+    """Test refresh mode re-fits leaves without growing the booster"""
+    model = FootballModel("xgboost")
+    X = np.random.random((100, 10))
+    y = np.random.poisson(1.4, (100, 2))
+    model.train(X, y)
+    trees_before = model.num_trees()
+    
+    model.train_incremental(X[:20], y[:20], mode="refresh")
+    
+    assert model.num_trees() == trees_before
+    assert model.predict(X[:1]).shape == (1, 2)
+
+def test_default_model_predicts_both_scores():
+    """Test the default model is a native two-target model"""
+    manager = ModelManager()
+    model = manager.create_default_model()
+    
+    goals = model.predict_goals(np.random.random((5, 10)))
+    assert goals.shape == (5, 2)
+    assert (goals >= 0).all()
+
+def test_predict_goals_splits_legacy_total_goals():
+    """Test single-target models still yield [home, away] goals"""
+    model = FootballModel("xgboost")
+    X = np.random.random((100, 10))
+    model.train(X, np.random.poisson(2.7, 100))
+    
+    goals = model.predict_goals(X[:3])
+    assert goals.shape == (3, 2)
+    assert np.allclose(goals[:, 0] * 0.4, goals[:, 1] * 0.6)
+
+def test_register_model_announces_version(tmp_path, monkeypatch):
+    """Test registering a model tells serving replicas which version to load"""
+    announced = []
+    
+    def record(namespace, note=""):
+        announced.append((namespace, note))
+    
+    monkeypatch.setattr(model_manager, 'publish_invalidation', record)
+    manager = ModelManager()
+    manager.model_path = str(tmp_path)
+    model = manager.train_new_model(_match_history(100, "2020-01-01"))
+    
+    assert announced == [(model_manager.PREDICTIONS_CACHE, model.version)]
@@ -0,0 +1,54 @@
+import pytest
+from datetime import datetime
+from app.data import team_catalog
+from app.data.team_catalog import TeamCatalog
+from app.ml.online_eval import OnlineEvaluator, RunningMetrics
+
+MATCH_DATE = datetime(2024, 12, 1, 15, 0)
+HOME_FAVOURITE = {'home_win': 0.6, 'draw': 0.2, 'away_win': 0.2}
+
+def test_result_settles_logged_prediction():
+    """Test a result is joined to its prediction and scored"""
+    evaluator = OnlineEvaluator()
+    evaluator.log_prediction(
+        "Arsenal", "Chelsea", MATCH_DATE, 2.0, 1.0, HOME_FAVOURITE, "1.0.1", "PL"
+    )
+    
+    assert evaluator.record_result("Arsenal", "Chelsea", MATCH_DATE, 2, 0)
+    metrics = evaluator.summary()['leagues']['PL']['1.0.1']
+    assert metrics['matches'] == 1
+    assert metrics['mae'] == pytest.approx(0.5)
+    assert metrics['brier_score'] == pytest.approx(0.16 + 0.04 + 0.04)
+    assert metrics['outcome_accuracy'] == 1.0
+    assert evaluator.summary()['pending_predictions'] == 0
+
+def test_result_settles_prediction_under_another_spelling(monkeypatch):
+    """Test predictions and results are joined by catalog key"""
+    catalog = TeamCatalog()
+    catalog.add_teams([
+        {'id': 57, 'name': 'Arsenal FC', 'shortName': 'Arsenal', 'tla': 'ARS'},
+        {'id': 61, 'name': 'Chelsea FC', 'shortName': 'Chelsea', 'tla': 'CHE'},
+    ])
+    monkeypatch.setattr(team_catalog, "_team_catalog", catalog)
+    evaluator = OnlineEvaluator()
+    evaluator.log_prediction("Arsenal", "Chelsea", MATCH_DATE, 2.0, 1.0, HOME_FAVOURITE, "1.0.1")
+    
+    assert evaluator.record_result("Arsenal FC", "Chelsea FC", MATCH_DATE, 2, 0)
+
+def test_result_without_prediction_is_ignored():
+    """Test results for fixtures we never predicted are skipped"""
+    evaluator = OnlineEvaluator()
+    
+    assert not evaluator.record_result("Arsenal", "Chelsea", MATCH_DATE, 1, 1)
+    assert evaluator.summary()['leagues'] == {}
+
+def test_rolling_window_drops_old_results():
+    """Test the rolling MAE only covers the most recent results"""
+    metrics = RunningMetrics(window=2)
+    for error in [3.0, 1.0, 1.0]:
+        metrics.update(error, 0.0, True)
+    
+    summary = metrics.to_dict()
+    assert summary['mae'] == pytest.approx(5.0 / 3)
+    assert summary['rolling_mae'] == pytest.approx(1.0)
+    assert summary['rolling_window'] == 2
@@ -1,7 +1,13 @@
+import asyncio
 import pytest
 import numpy as np
 from datetime import datetime
-from app.services.prediction_service import PredictionService
+from app.schemas.prediction import PredictionRequest
+from app.core.config import settings
+from app.core.metrics import BACKGROUND_JOB_FAILURES
+from app.data.team_catalog import TeamCatalog
+from app.ml.model_manager import FootballModel
+from app.services.prediction_service import FEATURE_NAMES, PredictionService, prescore_periodically
 
 @pytest.mark.asyncio
 async def test_prediction_service_init():
@@ -52,4 +58,181 @@ def test_process_prediction():
     assert 'home_win' in probs
     assert 'away_win' in probs
     assert 'draw' in probs
-    assert 'confidence' in probs
\ No newline at end of file
+    assert 'confidence' in probs
+
+
+@pytest.mark.asyncio
+async def test_predict_matches_batch():
+    """Test several fixtures are predicted in one call"""
+    service = PredictionService()
+    fixtures = [
+        PredictionRequest(home_team=home, away_team=away, match_date=datetime(2024, 12, 1))
+        for home, away in [("Arsenal", "Chelsea"), ("Liverpool", "Everton")]
+    ]
+    
+    predictions = await service.predict_matches(fixtures)
+    
+    assert [p.home_team for p in predictions] == ["Arsenal", "Liverpool"]
+    assert all(p.predicted_score_away >= 0 for p in predictions)
+
+@pytest.mark.asyncio
+async def test_prescored_fixture_is_served_from_table():
+    """Test a pre-scored fixture is a table lookup matching live inference"""
+    service = PredictionService()
+    live = await service.predict_match("Arsenal", "Chelsea", datetime(2024, 12, 1))
+    
+    assert await service.prescore_fixtures([("Arsenal", "Chelsea")]) == 1
+    model = service.model_manager.get_current_model()
+    hit = service.fixture_table.lookup(
+        "Arsenal", "Chelsea", model.version, service.team_stats.features_version
+    )
+    assert hit is not None
+    assert hit[0] == pytest.approx(live.predicted_score_home)
+    
+    cached = await service.predict_match("Arsenal", "Chelsea", datetime(2024, 12, 1))
+    assert cached.win_probability_home == pytest.approx(live.win_probability_home)
+
+@pytest.mark.asyncio
+async def test_fixture_table_rescored_when_features_change():
+    """Test the table is rebuilt once, in the background, after team features are invalidated"""
+    service = PredictionService()
+    await service.prescore_fixtures([("Arsenal", "Chelsea")])
+    refreshed_at = service.fixture_table.refreshed_at
+    
+    await service.team_stats.clear_cache()
+    model = service.model_manager.get_current_model()
+    versions = (model.version, service.team_stats.features_version)
+    assert service.fixture_table.lookup("Arsenal", "Chelsea", *versions) is None
+    
+    rescored = []
+    prescore_fixtures = service.prescore_fixtures
+    
+    async def counting_prescore(pairs):
+        rescored.append(pairs)
+        return await prescore_fixtures(pairs)
+    
+    service.prescore_fixtures = counting_prescore
+    # Concurrent requests are served live while a single pass re-scores
+    predictions = await asyncio.gather(*(
+        service.predict_match("Arsenal", "Chelsea", datetime(2024, 12, 1)) for _ in range(4)
+    ))
+    await service._rescore_task
+    
+    assert len(rescored) == 1
+    assert all(p.predicted_score_home == predictions[0].predicted_score_home for p in predictions)
+    assert service.fixture_table.features_version == service.team_stats.features_version
+    assert service.fixture_table.refreshed_at > refreshed_at
+
+@pytest.mark.asyncio
+async def test_matchup_matrix_matches_live_inference():
+    """Test every pairing in the matrix equals predicting it directly"""
+    service = PredictionService()
+    teams = [
+        {'id': 57, 'name': 'Arsenal'},
+        {'id': 61, 'name': 'Chelsea'},
+        {'id': 64, 'name': 'Liverpool'}
+    ]
+    
+    matrix = await service.build_matchup_matrix(2021, teams)
+    live = await service.predict_expected_goals([("Chelsea", "Liverpool")])
+    
+    assert matrix.home_goals.shape == (3, 3)
+    home_score, away_score, probabilities = matrix.lookup_ids(61, 64)
+    assert home_score == pytest.approx(live[0, 0], rel=1e-5)
+    assert away_score == pytest.approx(live[0, 1], rel=1e-5)
+    assert matrix.lookup_ids(61, 61) is None
+    
+    prediction = await service.predict_match("Chelsea", "Liverpool", datetime(2024, 12, 1))
+    assert prediction.win_probability_home == pytest.approx(probabilities['home_win'])
+
+@pytest.mark.asyncio
+async def test_explain_matches_sums_to_prediction():
+    """Test contributions are named and add up to the expected goals"""
+    service = PredictionService()
+    explanation, = await service.explain_matches([("Arsenal", "Chelsea")])
+    goals = await service.predict_expected_goals([("Arsenal", "Chelsea")])
+    
+    assert set(explanation['home_goals']['contributions']) >= {'home_avg_goals_scored', 'h2h_draws'}
+    assert explanation['home_goals']['prediction'] == pytest.approx(goals[0, 0], abs=1e-4)
+    assert explanation['away_goals']['prediction'] == pytest.approx(goals[0, 1], abs=1e-4)
+    
+    # Served from the cache the second time
+    again, = await service.explain_matches([("Arsenal", "Chelsea")])
+    assert again['home_goals'] is explanation['home_goals']
+
+
+@pytest.mark.asyncio
+async def test_explanation_cache_is_bounded(monkeypatch):
+    """Test least recently used explanations are evicted past the cache size"""
+    monkeypatch.setattr(settings, "explanation_cache_size", 2)
+    service = PredictionService()
+    pairs = [("Arsenal", "Chelsea"), ("Liverpool", "Everton"), ("Fulham", "Brentford")]
+    
+    explanations = await service.explain_matches(pairs)
+    
+    assert [e['home_team'] for e in explanations] == ["Arsenal", "Liverpool", "Fulham"]
+    assert list(service.explanation_cache) == pairs[1:]
+
+
+@pytest.mark.asyncio
+async def test_precomputed_lookups_use_catalog_keys():
+    """Test another spelling of a pre-scored fixture is served from the table"""
+    service = PredictionService()
+    service.team_stats.catalog = TeamCatalog()
+    service.team_stats.catalog.add_teams([
+        {'id': 57, 'name': 'Arsenal FC', 'shortName': 'Arsenal', 'tla': 'ARS'},
+        {'id': 61, 'name': 'Chelsea FC', 'shortName': 'Chelsea', 'tla': 'CHE'},
+    ])
+    versions = (
+        service.model_manager.get_current_model().version,
+        service.team_stats.features_version
+    )
+    
+    await service.prescore_fixtures([("Arsenal FC", "Chelsea FC")])
+    
+    assert service.fixture_table.index == {(57, 61): 0}
+    assert service.fixture_table.lookup("ARS", "Chelsea", *versions) is not None
+    
+    first, = await service.explain_matches([("Arsenal FC", "Chelsea FC")])
+    second, = await service.explain_matches([("Arsenal", "CHE")])
+    assert list(service.explanation_cache) == [(57, 61)]
+    assert second['home_goals'] is first['home_goals']
+    assert (second['home_team'], second['away_team']) == ("Arsenal", "CHE")
+
+
+@pytest.mark.asyncio
+async def test_prescore_multi_output_tree_model(monkeypatch):
+    """Test fixtures are pre-scored even when the model can't be explained"""
+    monkeypatch.setattr(settings, "model_multi_strategy", "multi_output_tree")
+    service = PredictionService()
+    model = FootballModel("xgboost")
+    model.train(np.random.random((200, len(FEATURE_NAMES))), np.random.poisson(1.4, (200, 2)))
+    service.model_manager.current_model = model
+    
+    assert not model.can_explain
+    assert await service.prescore_fixtures([("Arsenal", "Chelsea")]) == 1
+    assert service.fixture_table.lookup(
+        "Arsenal", "Chelsea", model.version, service.team_stats.features_version
+    ) is not None
+    assert len(service.explanation_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_prescore_failures_are_recorded(monkeypatch):
+    """Test a failing pre-scoring cycle is counted and logged, then retried"""
+    service = PredictionService()
+    
+    async def fail(*args, **kwargs):
+        raise ConnectionError("football API down")
+    
+    async def stop(seconds):
+        raise asyncio.CancelledError
+    
+    monkeypatch.setattr(service, "prescore_upcoming", fail)
+    monkeypatch.setattr(asyncio, "sleep", stop)
+    before = BACKGROUND_JOB_FAILURES.get(job='prescore', error='ConnectionError')
+    
+    with pytest.raises(asyncio.CancelledError):
+        await prescore_periodically(service)
+    
+    assert BACKGROUND_JOB_FAILURES.get(job='prescore', error='ConnectionError') == before + 1
\ No newline at end of file
@@ -0,0 +1,99 @@
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.profiler import ProfilerSessions, SamplingProfiler
+from app.routers import debug
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return total
+
+def test_sampling_profiler_collapsed_stacks():
+    """Test busy code shows up root-first in collapsed stacks"""
+    profiler = SamplingProfiler(interval=0.001, trace_allocations=True)
+    profiler.start()
+    _busy(0.2)
+    allocated = [bytearray(1024) for _ in range(200)]
+    profiler.finish()
+    
+    collapsed = profiler.collapsed()
+    assert profiler.samples > 0
+    assert f"{__name__}:_busy" in collapsed
+    stack, count = collapsed.splitlines()[0].rsplit(' ', 1)
+    assert int(count) > 0 and ';' in stack
+    assert profiler.allocations and 'size_kb' in profiler.allocations[0]
+    assert not profiler.running
+
+def test_request_session_stops_after_count():
+    """Test a request-count session samples only while matching requests run"""
+    sessions = ProfilerSessions()
+    sessions.profile_requests(2, '/api/v1/predict', interval=0.001, trace_allocations=False)
+    
+    assert not sessions.claim('/health')
+    for _ in range(2):
+        assert sessions.claim('/api/v1/predict/batch')
+        sessions.request_started()
+        assert sessions.profiler.running
+        _busy(0.02)
+        sessions.request_finished()
+    
+    assert not sessions.active
+    assert not sessions.claim('/api/v1/predict')
+    assert sessions.profiler.samples > 0
+    sessions.profile_requests(1, '/', 0.001, False)
+    with pytest.raises(RuntimeError):
+        sessions.profile_requests(1, '/', 0.001, False)
+
+def test_concurrent_requests_claim_at_most_count():
+    """Test overlapping requests beyond the count aren't profiled"""
+    sessions = ProfilerSessions()
+    sessions.profile_requests(2, '/', interval=0.001, trace_allocations=False)
+    
+    claimed = [sessions.claim('/api/v1/predict') for _ in range(3)]
+    assert claimed == [True, True, False]
+    for _ in range(2):
+        sessions.request_started()
+    sessions.request_finished()
+    assert sessions.profiler.running
+    sessions.request_finished()
+    
+    assert sessions.requests_remaining == 0
+    assert not sessions.active
+
+@pytest.fixture
+def debug_client(monkeypatch):
+    monkeypatch.setattr(settings, "profiling_token", "secret")
+    monkeypatch.setattr(debug, "profiler_sessions", ProfilerSessions())
+    app = FastAPI()
+    app.include_router(debug.router)
+    return TestClient(app)
+
+def test_debug_routes_require_token(debug_client, monkeypatch):
+    """Test profiling refuses missing or wrong tokens"""
+    assert debug_client.get("/debug/profile").status_code == 401
+    assert debug_client.get("/debug/profile", headers={"X-Debug-Token": "wrong"}).status_code == 401
+    
+    monkeypatch.setattr(settings, "profiling_token", None)
+    response = debug_client.get("/debug/profile", headers={"X-Debug-Token": "secret"})
+    assert response.status_code == 403
+
+def test_timed_profile_endpoint(debug_client):
+    """Test a timed session returns a summary and a collapsed-stack file"""
+    headers = {"X-Debug-Token": "secret"}
+    assert debug_client.get("/debug/profile/collapsed", headers=headers).status_code == 404
+    
+    response = debug_client.post("/debug/profile", json={"seconds": 0.1}, headers=headers)
+    
+    assert response.status_code == 200
+    assert response.json()['samples'] > 0
+    collapsed = debug_client.get("/debug/profile/collapsed", headers=headers)
+    assert collapsed.status_code == 200
+    assert "attachment" in collapsed.headers["content-disposition"]
+    
+    bad = debug_client.post("/debug/profile", json={"seconds": 1, "requests": 2}, headers=headers)
+    assert bad.status_code == 400
\ No newline at end of file
@@ -0,0 +1,113 @@
+import pytest
+from datetime import date
+import pandas as pd
+import app.data.ratings as ratings_module
+from app.core.config import settings
+from app.data.ratings import EloRatings
+
+def _history():
+    return pd.DataFrame({
+        'date': pd.to_datetime(['2024-08-10', '2024-08-17', '2024-08-03']),
+        'home_team': ['Arsenal', 'Chelsea', 'Arsenal'],
+        'away_team': ['Chelsea', 'Arsenal', 'Everton'],
+        'home_score': [3, 1, 0],
+        'away_score': [0, 1, 0],
+    })
+
+def test_update_moves_ratings_symmetrically():
+    """Test a home win transfers rating points from away to home"""
+    ratings = EloRatings(k_factor=20, home_advantage=0, initial_rating=1500)
+    ratings.update("Arsenal", "Chelsea", 1, 0)
+    
+    assert ratings.get_rating("Arsenal") == pytest.approx(1510)
+    assert ratings.get_rating("Chelsea") == pytest.approx(1490)
+
+def test_goal_difference_scales_update():
+    """Test a three-goal win moves ratings further than a one-goal win"""
+    narrow = EloRatings()
+    narrow.update("Arsenal", "Chelsea", 1, 0)
+    heavy = EloRatings()
+    heavy.update("Arsenal", "Chelsea", 4, 1)
+    
+    assert heavy.get_rating("Arsenal") > narrow.get_rating("Arsenal")
+
+def test_replay_matches_sequential_updates():
+    """Test replay equals applying results one at a time in date order"""
+    history = _history()
+    replayed = EloRatings()
+    before = replayed.replay(history)
+    
+    sequential = EloRatings()
+    for _, match in history.sort_values('date').iterrows():
+        sequential.update(
+            match['home_team'], match['away_team'], match['home_score'], match['away_score']
+        )
+    
+    for team in ['Arsenal', 'Chelsea', 'Everton']:
+        assert replayed.get_rating(team) == pytest.approx(sequential.get_rating(team))
+    # Pre-match ratings: Arsenal's first match (Aug 3) is at the initial rating
+    assert before.loc[2, 'home_elo'] == 1500
+    assert before.loc[0, 'home_elo'] != 1500
+
+def test_snapshot_round_trip(tmp_path):
+    """Test ratings are restored from the latest snapshot"""
+    ratings = EloRatings()
+    ratings.replay(_history())
+    ratings.save_snapshot(str(tmp_path))
+    
+    restored = EloRatings.load_latest(str(tmp_path))
+    assert restored.ratings == ratings.ratings
+    assert restored.matches_processed == 3
+    assert not restored.has_unsaved_updates
+
+
+def test_update_skips_already_applied_results():
+    """Test a result re-sent with the same id only moves ratings once"""
+    ratings = EloRatings()
+    
+    assert ratings.update('Arsenal', 'Chelsea', 2, 0, match_id=1) is True
+    after_first = dict(ratings.ratings)
+    assert ratings.update('Arsenal', 'Chelsea', 2, 0, match_id=1) is False
+    
+    assert ratings.ratings == after_first
+    assert ratings.matches_processed == 1
+
+
+def test_processed_ids_are_kept_for_a_window(monkeypatch):
+    """Test ids older than the dedupe window are dropped and their results skipped"""
+    monkeypatch.setattr(settings, 'ratings_dedupe_days', 30)
+    ratings = EloRatings()
+    
+    ratings.update('Arsenal', 'Chelsea', 1, 0, match_id=1, match_date=date(2024, 8, 1))
+    ratings.update('Everton', 'Fulham', 1, 0, match_id=2, match_date=date(2024, 8, 20))
+    ratings.update('Leeds', 'Burnley', 1, 0, match_id=3, match_date=date(2024, 9, 15))
+    
+    assert set(ratings.processed_ids) == {2, 3}
+    resent = ratings.update('Arsenal', 'Chelsea', 1, 0, match_id=1, match_date=date(2024, 8, 1))
+    assert resent is False
+    assert ratings.matches_processed == 3
+
+
+def test_shared_updates_start_from_other_workers_snapshots(tmp_path, monkeypatch):
+    """Test a worker picks up another worker's snapshot before applying its own results"""
+    monkeypatch.setattr(settings, 'ratings_path', str(tmp_path))
+    monkeypatch.setattr(settings, 'ratings_check_seconds', 0)
+    monkeypatch.setattr(ratings_module, 'shared_snapshots', True)
+    monkeypatch.setattr(ratings_module, '_team_ratings', None)
+    monkeypatch.setattr(ratings_module, '_loaded_snapshot', None)
+    local = ratings_module.get_team_ratings()
+    
+    other_worker = EloRatings()
+    other_worker.update('Arsenal', 'Chelsea', 2, 0, match_id=1)
+    other_worker.save_snapshot(str(tmp_path))
+    with ratings_module.ratings_update() as ratings:
+        assert ratings.update('Arsenal', 'Chelsea', 2, 0, match_id=1) is False
+        assert ratings.update('Everton', 'Fulham', 1, 1, match_id=2) is True
+    
+    assert ratings is local
+    assert ratings.matches_processed == 2
+    assert EloRatings.load_latest(str(tmp_path)).matches_processed == 2
+    
+    other_worker.update('Leeds', 'Burnley', 0, 1, match_id=3)
+    other_worker.save_snapshot(str(tmp_path))
+    assert ratings_module.get_team_ratings().get_rating('Leeds') < 1500
\ No newline at end of file
@@ -0,0 +1,34 @@
+import numpy as np
+from app.ml.scoreline import scoreline_matrix, scoreline_probabilities
+
+def test_scoreline_matrix_is_normalised():
+    """Test each fixture's scoreline matrix sums to one"""
+    matrix = scoreline_matrix(np.array([1.5, 0.3]), np.array([1.1, 2.8]), max_goals=8)
+    
+    assert matrix.shape == (2, 9, 9)
+    assert np.allclose(matrix.sum(axis=(1, 2)), 1.0)
+
+def test_outcome_probabilities_follow_expected_goals():
+    """Test the stronger side is favoured and probabilities sum to one"""
+    probs = scoreline_probabilities(np.array([2.5, 0.5]), np.array([0.5, 2.5]))
+    total = probs['home_win'] + probs['draw'] + probs['away_win']
+    
+    assert np.allclose(total, 1.0)
+    assert probs['home_win'][0] > probs['away_win'][0]
+    assert probs['away_win'][1] > probs['home_win'][1]
+    assert (probs['most_likely_home'][0], probs['most_likely_away'][0]) == (2, 0)
+
+def test_dixon_coles_raises_low_score_draws():
+    """Test a negative rho moves probability onto 0-0 and 1-1"""
+    plain = scoreline_matrix(np.array([1.2]), np.array([1.0]))
+    adjusted = scoreline_matrix(np.array([1.2]), np.array([1.0]), rho=-0.13)
+    
+    assert adjusted[0, 0, 0] > plain[0, 0, 0]
+    assert adjusted[0, 1, 1] > plain[0, 1, 1]
+    assert adjusted[0, 1, 0] < plain[0, 1, 0]
+
+def test_confidence_reflects_certainty():
+    """Test a lopsided fixture is more confident than an even one"""
+    probs = scoreline_probabilities(np.array([4.0, 1.3]), np.array([0.2, 1.3]))
+    
+    assert 0 <= probs['confidence'][1] < probs['confidence'][0] <= 1
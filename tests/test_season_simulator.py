@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+from app.core.config import settings
+from app.ml.simulation import simulate_season
+from app.services.prediction_service import PredictionService
+from app.services.season_simulator import SeasonSimulator
+
+TEAMS = [
+    {'id': 1, 'name': 'Arsenal'},
+    {'id': 2, 'name': 'Chelsea'},
+    {'id': 3, 'name': 'Liverpool'},
+    {'id': 4, 'name': 'Everton'},
+]
+
+def _standings(points):
+    return {'standings': [{'type': 'TOTAL', 'table': [
+        {'team': team, 'playedGames': 10, 'points': p, 'goalDifference': 0, 'goalsFor': 10}
+        for team, p in zip(TEAMS, points)
+    ]}]}
+
+def _fixtures():
+    return [
+        {'homeTeam': home, 'awayTeam': away}
+        for home in TEAMS for away in TEAMS if home['id'] != away['id']
+    ]
+
+def test_simulation_is_reproducible_across_workers():
+    """Test results depend on the seed, not on the number of worker processes"""
+    args = (np.array([0, 1, 2]), np.array([1, 2, 0]), np.array([1.5, 1.2, 2.0]),
+            np.array([1.0, 0.8, 0.5]), np.zeros(3), np.zeros(3), np.zeros(3))
+    
+    serial = simulate_season(*args, n_simulations=3000, seed=7, chunk_size=1000)
+    parallel = simulate_season(*args, n_simulations=3000, seed=7, chunk_size=1000, max_workers=2)
+    
+    assert np.array_equal(serial['position_counts'], parallel['position_counts'])
+    assert (serial['position_counts'].sum(axis=1) == 3000).all()
+
+def test_unassailable_leader_wins_title():
+    """Test a team too far ahead to be caught always finishes first"""
+    result = simulate_season(
+        np.array([1]), np.array([2]), np.array([1.5]), np.array([1.0]),
+        np.array([50, 10, 10]), np.zeros(3), np.zeros(3),
+        n_simulations=500
+    )
+    
+    assert result['position_counts'][0, 0] == 500
+
+@pytest.mark.asyncio
+async def test_simulate_league_odds_and_cache():
+    """Test title and relegation odds are probabilities and results are cached"""
+    simulator = SeasonSimulator(PredictionService())
+    
+    result = await simulator.simulate(_standings([30, 20, 20, 5]), _fixtures(), n_simulations=2000)
+    
+    assert result['remaining_fixtures'] == 12
+    assert sum(t['title_probability'] for t in result['teams']) == pytest.approx(1.0)
+    # With four teams every relegation spot is filled by someone
+    assert sum(t['relegation_probability'] for t in result['teams']) == pytest.approx(3.0)
+    assert result['teams'][0]['team'] == 'Arsenal'
+    
+    again = await simulator.simulate(_standings([30, 20, 20, 5]), _fixtures(), n_simulations=2000)
+    assert again is result
+    
+    # New results change team form, so the simulation is re-run
+    await simulator.prediction_service.team_stats.clear_cache()
+    rerun = await simulator.simulate(_standings([30, 20, 20, 5]), _fixtures(), n_simulations=2000)
+    assert rerun is not result
+
+
+@pytest.mark.asyncio
+async def test_simulation_cache_is_bounded(monkeypatch):
+    """Test the least recently used simulations are evicted past the cache size"""
+    monkeypatch.setattr(settings, "simulation_cache_size", 2)
+    simulator = SeasonSimulator(PredictionService())
+    
+    for seed in (1, 2, 1, 3):
+        await simulator.simulate(
+            _standings([30, 20, 20, 5]), _fixtures(), n_simulations=100, seed=seed
+        )
+    
+    assert [key[-1] for key in simulator.cache] == [1, 3]
\ No newline at end of file
@@ -0,0 +1,55 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import httpx
+import pytest
+from app.core.memory import memory_breakdown_mb
+
+def test_memory_breakdown():
+    """Test RSS is split into shared and private pages"""
+    memory = memory_breakdown_mb()
+    
+    assert memory['rss'] > 0
+    if 'pss' in memory:
+        assert memory['shared'] + memory['private'] == pytest.approx(memory['rss'], rel=0.01)
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="prefork needs fork()")
+def test_prefork_server_serves_and_reports_memory():
+    """Test preforked workers share a socket, serve requests and report memory"""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "app.server",
+            "--workers", "2", "--port", "0", "--memory-report-seconds", "0.5"
+        ],
+        stdout=subprocess.PIPE, text=True
+    )
+    try:
+        preloaded = json.loads(process.stdout.readline())
+        assert preloaded['event'] == 'preloaded' and preloaded['workers'] == 2
+        base_url = f"http://127.0.0.1:{preloaded['port']}"
+        
+        deadline = time.time() + 30
+        while True:
+            try:
+                if httpx.get(f"{base_url}/ready").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            assert time.time() < deadline, "workers never became ready"
+            time.sleep(0.1)
+        
+        response = httpx.post(f"{base_url}/api/v1/predict", json={
+            "home_team": "Arsenal", "away_team": "Chelsea", "match_date": "2024-03-15T15:00:00"
+        })
+        assert response.status_code == 200
+        
+        report = json.loads(process.stdout.readline())
+        assert report['event'] == 'memory'
+        assert len(report['workers']) == 2
+        assert all(worker['rss'] > 0 for worker in report['workers'])
+    finally:
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=30) == 0
\ No newline at end of file
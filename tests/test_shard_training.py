@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+pytest.importorskip("pyarrow")
+
+from app.ml.model_manager import ModelManager
+from app.ml.shard_training import train_from_shards
+
+def _write_shards(directory, n_shards=3, rows_per_shard=200):
+    """Write synthetic feature shards and return their paths"""
+    rng = np.random.default_rng(1)
+    paths = []
+    for i in range(n_shards):
+        shard = pd.DataFrame({
+            'home_team_avg_goals': rng.random(rows_per_shard) * 3,
+            'away_team_avg_goals': rng.random(rows_per_shard) * 3,
+            'recent_form_home': rng.random(rows_per_shard),
+            'home_score': rng.poisson(1.5, rows_per_shard),
+            'away_score': rng.poisson(1.2, rows_per_shard),
+        })
+        path = directory / f"shard_{i}.parquet"
+        shard.to_parquet(path)
+        paths.append(str(path))
+    return paths
+
+def test_train_from_shards(tmp_path):
+    """Test streaming training over Parquet shards"""
+    paths = _write_shards(tmp_path)
+    model, report = train_from_shards(paths, num_boost_round=10)
+    
+    assert report['total_rows'] == 600
+    assert {s['path'] for s in report['shards']} == set(paths)
+    assert all(s['rss_mb'] > 0 for s in report['shards'])
+    assert model.predict(np.random.random((4, 10))).shape == (4, 2)
+
+def test_train_from_shards_external_memory(tmp_path):
+    """Test the external-memory variant trains the same model shape"""
+    paths = _write_shards(tmp_path, n_shards=2)
+    model, report = train_from_shards(
+        paths, num_boost_round=5, external_memory=True, cache_dir=str(tmp_path)
+    )
+    
+    assert report['external_memory'] is True
+    assert report['total_rows'] == 400
+    assert model.predict(np.random.random((1, 10))).shape == (1, 2)
+
+def test_model_manager_registers_shard_model(tmp_path):
+    """Test the manager activates and saves the shard-trained model"""
+    manager = ModelManager()
+    manager.model_path = str(tmp_path)
+    
+    model, report = manager.train_from_shards(_write_shards(tmp_path, n_shards=2))
+    
+    assert manager.current_model is model
+    assert report['total_rows'] == 400
+    assert any(p.name.endswith('.joblib') for p in tmp_path.iterdir())
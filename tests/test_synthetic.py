@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+import pandas as pd
+from app.data.synthetic import (
+    double_round_robin, generate_matches, synthetic_matches, team_recent_matches, training_arrays
+)
+from app.data.team_stats import TeamStatsService
+
+def test_double_round_robin():
+    """Test every ordered pairing is played once and nobody plays twice a matchday"""
+    matchday, home, away = double_round_robin(6)
+    
+    assert len(matchday) == 30
+    assert len(set(zip(home, away))) == 30
+    assert not np.any(home == away)
+    for day in np.unique(matchday):
+        teams = np.concatenate([home[matchday == day], away[matchday == day]])
+        assert len(np.unique(teams)) == 6
+    with pytest.raises(ValueError):
+        double_round_robin(5)
+
+def test_generate_matches_is_seeded():
+    """Test the same seed gives the same frame and another seed does not"""
+    size = dict(n_leagues=2, n_seasons=2, teams_per_league=6)
+    first = generate_matches(**size, seed=7)
+    
+    pd.testing.assert_frame_equal(first, generate_matches(**size, seed=7))
+    assert not first['home_score'].equals(generate_matches(**size, seed=8)['home_score'])
+
+def test_generate_matches_shape():
+    """Test leagues, seasons and home advantage look like real football"""
+    matches = generate_matches(n_leagues=3, n_seasons=4, teams_per_league=20, seed=0)
+    
+    assert len(matches) == 3 * 4 * 380
+    assert matches['date'].is_monotonic_increasing
+    assert (matches.groupby(['competition', 'season']).size() == 380).all()
+    assert matches['home_team_id'].nunique() == 60
+    assert matches['home_score'].mean() > matches['away_score'].mean()
+    assert 2.0 < (matches['home_score'] + matches['away_score']).mean() < 3.5
+
+def test_synthetic_matches_size():
+    """Test the requested number of matches comes back, inside Timestamp range"""
+    matches = synthetic_matches(50_000)
+    
+    assert len(matches) == 50_000
+    assert matches['date'].max().year < 2100
+
+def test_team_recent_matches_are_reproducible():
+    """Test recent results depend only on the team"""
+    first = team_recent_matches("Arsenal", limit=10)
+    second = team_recent_matches("Arsenal", limit=10)
+    
+    assert len(first) == 10
+    assert first[['home_score', 'away_score']].equals(second[['home_score', 'away_score']])
+    assert (first['home_team'].iloc[::2] == "Arsenal").all()
+
+@pytest.mark.asyncio
+async def test_team_features_are_deterministic():
+    """Test two services compute the same features for a team"""
+    first = await TeamStatsService().get_team_features("Chelsea")
+    second = await TeamStatsService().get_team_features("Chelsea")
+    
+    assert first == second
+
+def test_training_arrays():
+    """Test placeholder training data is seeded"""
+    X, y = training_arrays(100, 10, seed=1)
+    
+    assert X.shape == (100, 10) and y.shape == (100, 2)
+    assert np.array_equal(X, training_arrays(100, 10, seed=1)[0])
\ No newline at end of file
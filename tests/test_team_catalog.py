@@ -0,0 +1,102 @@
+import pytest
+from app.core.config import settings
+from app.data.team_catalog import TeamCatalog, normalize_name
+from app.data.team_stats import TeamStatsService
+
+TEAMS = [
+    {'id': 57, 'name': 'Arsenal FC', 'shortName': 'Arsenal', 'tla': 'ARS'},
+    {'id': 64, 'name': 'Liverpool FC', 'shortName': 'Liverpool', 'tla': 'LIV'},
+    {'id': 73, 'name': 'Tottenham Hotspur FC', 'shortName': 'Tottenham', 'tla': 'TOT'},
+    {'id': 86, 'name': 'Real Madrid CF', 'shortName': 'Real Madrid', 'tla': 'RMA'},
+    {'id': 5, 'name': 'FC Bayern München', 'shortName': 'Bayern', 'tla': 'FCB'},
+]
+
+def _catalog():
+    catalog = TeamCatalog(fuzzy_threshold=0.5)
+    catalog.add_teams(TEAMS)
+    return catalog
+
+def test_normalize_name():
+    """Test accents, case, punctuation and club suffixes are ignored"""
+    assert normalize_name('FC Bayern München') == 'bayern munchen'
+    assert normalize_name('Tottenham Hotspur F.C.') == 'tottenham hotspur'
+    assert normalize_name('FC') == 'fc'
+
+def test_resolve_exact_aliases():
+    """Test full names, short names and TLAs all resolve to the same id"""
+    catalog = _catalog()
+    
+    assert catalog.resolve('Arsenal FC') == 57
+    assert catalog.resolve('arsenal') == 57
+    assert catalog.resolve('ARS') == 57
+    assert catalog.resolve('Bayern Munchen') == 5
+
+def test_resolve_typos():
+    """Test misspelt names resolve through the trigram index"""
+    catalog = _catalog()
+    
+    assert catalog.resolve('Liverpol') == 64
+    assert catalog.resolve('Totenham Hotspur') == 73
+    assert catalog.resolve('Manchester City') is None
+    assert 'liverpol' in catalog.fuzzy_cache
+
+def test_fuzzy_cache_is_bounded(monkeypatch):
+    """Test arbitrary unknown names can't grow the fuzzy match cache without limit"""
+    monkeypatch.setattr(settings, "team_fuzzy_cache_size", 2)
+    catalog = _catalog()
+    
+    for name in ('Liverpol', 'Totenham', 'Unknown United', 'Liverpol'):
+        catalog.resolve(name)
+    
+    assert list(catalog.fuzzy_cache) == ['unknown united', 'liverpol']
+
+
+def test_ambiguous_alias_does_not_resolve():
+    """Test a key shared by two teams resolves to nothing"""
+    catalog = _catalog()
+    catalog.add_teams([
+        {'id': 999, 'name': 'Arsenal de Sarandí', 'shortName': 'Arsenal', 'tla': 'ARS'}
+    ])
+    
+    assert catalog.resolve('Arsenal') is None
+    assert catalog.resolve('ARS') is None
+    assert catalog.resolve('Arsenal de Sarandi') == 999
+
+def test_key_falls_back_to_name():
+    """Test cache keys are ids for known teams and names otherwise"""
+    catalog = _catalog()
+    
+    assert catalog.key('Real Madrid') == 86
+    assert catalog.key('Unknown United') == 'Unknown United'
+
+@pytest.mark.asyncio
+async def test_load_skips_loaded_competitions():
+    """Test each competition's team list is fetched once"""
+    class FakeClient:
+        calls = 0
+        async def get_teams(self, competition_id):
+            FakeClient.calls += 1
+            return TEAMS
+    
+    catalog = TeamCatalog()
+    await catalog.load(FakeClient(), [2021])
+    await catalog.load(FakeClient(), [2021])
+    
+    assert FakeClient.calls == 1
+    assert len(catalog) == len(TEAMS)
+
+@pytest.mark.asyncio
+async def test_team_stats_cache_keyed_by_id():
+    """Test different spellings of a team share one cache entry"""
+    service = TeamStatsService()
+    service.catalog = _catalog()
+    
+    features = await service.get_team_features('Arsenal FC')
+    
+    shared = await service.get_team_features('ARS')
+    assert shared == {**features, 'team': 'ARS'}
+    assert list(service.cache) == [57]
+    
+    # Each spelling keeps its own name, in one batch as well as from the cache
+    batch = await service.get_many_team_features(['Liverpool', 'LIV', 'Arsenal'])
+    assert [f['team'] for f in batch] == ['Liverpool', 'LIV', 'Arsenal']
\ No newline at end of file
@@ -0,0 +1,104 @@
+import time
+import pytest
+from fastapi.testclient import TestClient
+from app.core.config import settings
+import app.main as main
+from app.main import app
+from app.services.prediction_service import PredictionService
+from app.services.warmup import Readiness, warm_up
+
+TEAMS = [
+    {'id': 57, 'name': 'Arsenal FC', 'shortName': 'Arsenal', 'tla': 'ARS'},
+    {'id': 61, 'name': 'Chelsea FC', 'shortName': 'Chelsea', 'tla': 'CHE'},
+]
+
+class FakeClient:
+    async def get_teams(self, competition_id):
+        return TEAMS
+
+class FailingClient:
+    async def get_teams(self, competition_id):
+        raise ConnectionError("football API unreachable")
+
+@pytest.mark.asyncio
+async def test_warm_up_loads_model_and_team_features(monkeypatch):
+    """Test warm-up loads the model, preloads team features and marks ready"""
+    monkeypatch.setattr(settings, "warmup_competitions", [2021])
+    service = PredictionService()
+    service.team_stats.api_client = FakeClient()
+    service.team_stats.catalog = type(service.team_stats.catalog)()
+    state = Readiness()
+    
+    await warm_up(service, state)
+    
+    assert state.ready and state.error is None
+    assert service.model_manager.current_model is not None
+    assert state.report['teams'] == 2
+    assert set(service.team_stats.cache) == {57, 61}
+
+@pytest.mark.asyncio
+async def test_warm_up_survives_api_failure(monkeypatch):
+    """Test the pod still becomes ready when team features can't be preloaded"""
+    monkeypatch.setattr(settings, "warmup_competitions", [2021])
+    service = PredictionService()
+    service.team_stats.api_client = FailingClient()
+    service.team_stats.catalog = type(service.team_stats.catalog)()
+    state = Readiness()
+    
+    await warm_up(service, state)
+    
+    assert state.ready
+    assert "unreachable" in state.error
+
+@pytest.mark.asyncio
+async def test_warm_up_reports_model_failure(monkeypatch):
+    """Test a model that fails to load keeps the pod unready with the reason"""
+    service = PredictionService()
+    
+    def broken_model():
+        raise OSError("model file is corrupt")
+    
+    monkeypatch.setattr(service.model_manager, "get_current_model", broken_model)
+    state = Readiness()
+    
+    await warm_up(service, state)
+    
+    assert not state.ready
+    assert state.status()['status'] == 'failed'
+    assert "corrupt" in state.error
+
+
+def test_ready_endpoint_after_startup():
+    """Test /ready turns 200 once the startup warm-up finishes, /health is unchanged"""
+    with TestClient(app) as client:
+        assert client.get("/health").json() == {"status": "healthy"}
+        deadline = time.time() + 30
+        response = client.get("/ready")
+        while response.status_code == 503 and time.time() < deadline:
+            assert response.json()['status'] == 'warming_up'
+            time.sleep(0.05)
+            response = client.get("/ready")
+        
+        assert response.status_code == 200
+        assert response.json()['warmup']['model_version']
+
+
+def test_prefork_workers_skip_parent_startup_jobs(monkeypatch):
+    """Test forked workers don't repeat the parent's warm-up but keep pre-scoring"""
+    warmed, started = [], []
+    
+    async def record_warm_up(service):
+        warmed.append(service)
+    
+    async def record_prescoring(service, skip_first=False):
+        started.append(skip_first)
+    
+    monkeypatch.setattr(main, 'warm_up', record_warm_up)
+    monkeypatch.setattr(main, 'prescore_periodically', record_prescoring)
+    monkeypatch.setattr(settings, 'prescore_competitions', [2021])
+    monkeypatch.setattr(app.state, 'prefork_role', 'worker', raising=False)
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+    
+    assert warmed == []
+    assert started == [True]
\ No newline at end of file